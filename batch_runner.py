@@ -0,0 +1,351 @@
+"""
+Arayüz olmadan tarama ve yükleme işlerini çalıştıran toplu iş yürütücü.
+
+İş dosyasındaki her mağaza için isteğe bağlı site analizi, ürün taraması ve
+WordPress'e yükleme yapılır. Farklı alan adlarındaki işler ayrı süreçlerde
+paralel çalışır; aynı alan adına ait işler aynı süreçte sırayla yürütülür.
+Aynı WordPress sitesine yapılan yüklemeler, yerel günlük ve önbellekler
+karışmasın diye süreçler arası bir kilitle sıraya alınır.
+
+Kullanım (proje kök dizininden):
+    python batch_runner.py jobs.json --workers 4 --report-dir reports
+
+İş dosyası örneği:
+    {
+        "defaults": {
+            "max_pages": 10,
+            "upload": {"wp_url": "https://magaza.example.com", "username": "admin",
+                       "password_env": "WP_PASSWORD", "category_id": 9, "upsert": true}
+        },
+        "jobs": [
+            {"name": "ayakkabi", "url": "https://shop.example.com/kategori/ayakkabi",
+             "max_pages": 20, "selectors": "shop.example.com_selectors.json",
+             "upload": {"category_map": "source"}},
+            {"name": "canta", "url": "https://other.example.com/canta",
+             "selectors": {"titles": ["h2.product-name"]},
+             "upload": {"category_map": {"https://other.example.com/canta": 15}}}
+        ]
+    }
+
+`selectors` seçici oluşturucunun kaydettiği JSON dosyası ya da doğrudan
+seçici sözlüğüdür. `category_map` için "source" kaynak kategorilerini site
+analiziyle WooCommerce kategorilerine eşler (gerekirse oluşturur); sözlük
+verilirse kaynak kategori URL'si -> kategori ID'si eşlemesi kullanılır.
+Eşleşmeyen ürünler `category_id` kategorisine gider. `upload` verilmeyen
+işlerde yalnızca tarama yapılır.
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.managers import SyncManager
+from urllib.parse import urlparse
+
+from cancellation import CancellationToken
+
+
+def load_jobs(path):
+    """İş dosyasını okur; varsayılanları her işe uygular ve iş listesini döndürür."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    defaults = data.get("defaults", {})
+    jobs = []
+    used_names = set()
+    for index, job in enumerate(data.get("jobs", [])):
+        merged = dict(defaults)
+        merged.update(job)
+        if job.get("upload") is False:
+            # Varsayılan yükleme hedefi bu iş için kapatılır
+            merged.pop("upload")
+        elif "upload" in defaults and "upload" in job:
+            merged["upload"] = dict(defaults["upload"], **job["upload"])
+
+        if not merged.get("url"):
+            raise ValueError(f"{index + 1}. işte 'url' eksik")
+        name = re.sub(r'[^\w.-]', '_', merged.get("name") or urlparse(merged["url"]).netloc)
+        if name in used_names:
+            name = f"{name}_{index + 1}"
+        used_names.add(name)
+        merged["name"] = name
+        jobs.append(merged)
+    return jobs
+
+
+def group_by_domain(jobs):
+    """İşleri kaynak alan adına göre gruplar; aynı siteye eşzamanlı tarama yapılmaz."""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(urlparse(job["url"]).netloc, []).append(job)
+    return list(groups.values())
+
+
+def upload_target(job):
+    """İşin yükleme yapacağı WordPress sitesini döndürür; yükleme yoksa None."""
+    upload = job.get("upload")
+    if not upload or not upload.get("wp_url"):
+        return None
+    return urlparse(upload["wp_url"]).netloc
+
+
+def make_logger(name, interval=2.0):
+    """İş adıyla ön eklenmiş, sık gelen ilerleme mesajlarını seyrelten bir callback döndürür."""
+    last = {"message": None, "time": 0.0}
+
+    def log(message, current=0, total=0):
+        now = time.time()
+        finished = total and current >= total
+        if message == last["message"] or (now - last["time"] < interval and not finished):
+            return
+        last["message"] = message
+        last["time"] = now
+        print(f"[{name}] {message}", flush=True)
+
+    return log
+
+
+def load_selectors(job):
+    """İşin seçici setini yükler; yoksa None döndürür."""
+    selectors = job.get("selectors")
+    if isinstance(selectors, str):
+        with open(selectors, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return selectors
+
+
+def run_job(job, run_dir, upload_lock=None, cancel_token=None):
+    """Tek bir işi (analiz, tarama, yükleme) çalıştırır ve sonuç raporunu döndürür."""
+    name = job["name"]
+    log = make_logger(name)
+    job_dir = os.path.join(run_dir, name)
+    os.makedirs(job_dir, exist_ok=True)
+    started = time.time()
+    result = {
+        "name": name,
+        "url": job["url"],
+        "status": "ok",
+        "error": None,
+        "timings": {},
+        "products": 0,
+        "uploaded": 0,
+        "upload_errors": [],
+    }
+
+    try:
+        from config import SITE_SPECIFIC_SELECTORS
+        from scrapers.product_scraper import ProductScraper
+        from scrapers.site_analyzer import SiteAnalyzer
+
+        domain = urlparse(job["url"]).netloc
+        selectors = load_selectors(job)
+        if selectors:
+            # İş kendi sürecinde çalıştığından genel seçici tablosu güvenle değiştirilebilir
+            SITE_SPECIFIC_SELECTORS[domain] = selectors
+
+        upload = job.get("upload")
+        category_map = upload.get("category_map") if upload else None
+
+        analyzer = None
+        if job.get("analyze") or category_map == "source":
+            step = time.time()
+            analyzer = SiteAnalyzer(verify_ssl=job.get("verify_ssl", True))
+            analyzer.set_progress_callback(log)
+            analyzer.analyze_site(job["url"], cancel_token=cancel_token)
+            result["categories"] = len(analyzer.categories)
+            result["timings"]["analyze"] = round(time.time() - step, 2)
+
+        step = time.time()
+        scraper = ProductScraper()
+        scraper.set_progress_callback(log)
+        if "verify_ssl" in job:
+            scraper.verify_ssl = job["verify_ssl"]
+        products = scraper.scrape_products(job["url"], job.get("max_pages", 10), cancel_token=cancel_token)
+        scraper.save_products_to_json(os.path.join(job_dir, "products.json"))
+        result["products"] = len(products)
+        result["scrape_stats"] = {
+            key: scraper.stats[key]
+            for key in ("total_pages_scanned", "unique_products", "duplicate_products", "scan_duration", "site_type")
+        }
+        result["timings"]["scrape"] = round(time.time() - step, 2)
+
+        if upload and products and not (cancel_token and cancel_token.cancelled):
+            step = time.time()
+            if upload_lock is not None:
+                log(f"{upload_target(job)} için yükleme sırası bekleniyor...")
+                upload_lock.acquire()
+            try:
+                result["timings"]["upload_wait"] = round(time.time() - step, 2)
+                upload_products(job, products, analyzer, result, log, cancel_token)
+            finally:
+                if upload_lock is not None:
+                    upload_lock.release()
+            result["timings"]["upload"] = round(time.time() - step - result["timings"]["upload_wait"], 2)
+
+        if cancel_token and cancel_token.cancelled:
+            result["status"] = "cancelled"
+        elif result["upload_errors"]:
+            result["status"] = "partial"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+        print(f"[{name}] İş başarısız oldu: {e}", flush=True)
+
+    result["timings"]["total"] = round(time.time() - started, 2)
+    with open(os.path.join(job_dir, "result.json"), 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[{name}] İş tamamlandı ({result['status']}): {result['products']} ürün, "
+          f"{result['uploaded']} yüklendi, {result['timings']['total']} sn", flush=True)
+    return result
+
+
+def upload_products(job, products, analyzer, result, log, cancel_token):
+    """Taranan ürünleri işin WordPress hedefine yükleme hattıyla gönderir."""
+    from uploaders.wordpress_uploader import create_uploader, canonical_product_url
+    from uploaders.upload_pipeline import UploadPipeline
+    from uploaders.upload_journal import UploadJournal
+    from uploaders.category_mapper import CategoryMapper
+
+    upload = job["upload"]
+    password = upload.get("password") or os.environ.get(upload.get("password_env", ""), "")
+    if not upload.get("wp_url") or not upload.get("username") or not password:
+        raise ValueError("Yükleme için wp_url, username ve password (ya da password_env) gerekli")
+
+    uploader = create_uploader(upload["wp_url"], upload["username"], password, upload.get("backend"))
+    uploader.set_progress_callback(log)
+
+    category_map = upload.get("category_map")
+    if category_map == "source" and analyzer and analyzer.categories:
+        uploader.category_mapper = CategoryMapper(uploader)
+        uploader.category_mapper.resolve(analyzer.categories)
+    elif isinstance(category_map, dict):
+        uploader.category_mapper = CategoryMapper(uploader)
+        uploader.category_mapper.mapping.update({
+            canonical_product_url(url): int(category_id) for url, category_id in category_map.items()
+        })
+
+    journal = UploadJournal(uploader.wp_url)
+    pipeline = UploadPipeline(
+        uploader, upload.get("category_id", 9),
+        upsert=upload.get("upsert", False), journal=journal, resume=upload.get("resume", False)
+    )
+    results = pipeline.run(products, cancel_token)
+
+    # Günlükten atlanan ürünler upload_stats["resumed"] altında ayrıca sayılır
+    result["uploaded"] = sum(1 for item in results if item["response"] and not item["error"])
+    result["upload_errors"] = [
+        {"title": item["product"].get("title", ""), "error": item["error"]}
+        for item in results if item["error"]
+    ]
+    result["upload_stats"] = pipeline.get_stage_stats()
+
+
+def ignore_interrupt():
+    """Alt süreçlerin Ctrl+C ile iş başlamadan kapanmasını önler."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_group(jobs, run_dir, upload_locks):
+    """Aynı alan adına ait işleri bir süreçte sırayla çalıştırır."""
+    cancel_token = CancellationToken()
+
+    def cancel(signum, frame):
+        cancel_token.cancel()
+
+    # Ctrl+C ya da SIGTERM işi yarıda kesmez; kısmi sonuçlar raporlanır
+    signal.signal(signal.SIGINT, cancel)
+    signal.signal(signal.SIGTERM, cancel)
+
+    results = []
+    for job in jobs:
+        if cancel_token.cancelled:
+            break
+        results.append(run_job(job, run_dir, upload_locks.get(upload_target(job)), cancel_token))
+    return results
+
+
+def failed_result(job, error):
+    """Süreci çalıştırılamayan iş için başarısız sonuç kaydı üretir."""
+    return {"name": job["name"], "url": job["url"], "status": "failed", "error": str(error),
+            "timings": {}, "products": 0, "uploaded": 0, "upload_errors": []}
+
+
+def write_report(results, run_dir, elapsed):
+    """Tüm işlerin özetini JSON ve metin olarak yazar; metni döndürür."""
+    with open(os.path.join(run_dir, "report.json"), 'w', encoding='utf-8') as f:
+        json.dump({"elapsed": round(elapsed, 2), "jobs": results}, f, ensure_ascii=False, indent=2)
+
+    lines = [f"Toplu çalıştırma raporu ({len(results)} iş, {elapsed:.1f} sn)", ""]
+    lines.append(f"{'İş':24s} {'Durum':10s} {'Ürün':>7s} {'Yüklenen':>9s} {'Analiz':>8s} {'Tarama':>8s} {'Yükleme':>8s}")
+    for result in results:
+        timings = result["timings"]
+        lines.append(
+            f"{result['name'][:24]:24s} {result['status']:10s} {result['products']:7d} {result['uploaded']:9d} "
+            f"{timings.get('analyze', 0):8.1f} {timings.get('scrape', 0):8.1f} {timings.get('upload', 0):8.1f}"
+        )
+        if result["error"]:
+            lines.append(f"    Hata: {result['error']}")
+    text = "\n".join(lines)
+    with open(os.path.join(run_dir, "report.txt"), 'w', encoding='utf-8') as f:
+        f.write(text + "\n")
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arayüzsüz toplu tarama ve yükleme")
+    parser.add_argument("job_file", help="iş dosyası (JSON)")
+    parser.add_argument("--workers", type=int, default=None, help="paralel süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--report-dir", default="reports", help="sonuçların yazılacağı dizin")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.job_file)
+    if not jobs:
+        print("İş dosyasında iş bulunamadı.")
+        return 1
+
+    run_dir = os.path.join(args.report_dir, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(run_dir, exist_ok=True)
+    groups = group_by_domain(jobs)
+    workers = min(args.workers or os.cpu_count() or 1, len(groups))
+    print(f"{len(jobs)} iş, {len(groups)} alan adı, {workers} süreç. Sonuçlar: {run_dir}")
+
+    started = time.time()
+    results = []
+    # Kilitleri tutan süreç Ctrl+C ile kapanırsa yüklemeler yarıda kalır
+    manager = SyncManager()
+    manager.start(ignore_interrupt)
+    try:
+        upload_locks = {target: manager.Lock() for target in {upload_target(job) for job in jobs} if target}
+        with ProcessPoolExecutor(max_workers=workers, initializer=ignore_interrupt) as executor:
+            futures = {executor.submit(run_group, group, run_dir, upload_locks): group for group in groups}
+            pending = set(futures)
+            while pending:
+                try:
+                    for future in as_completed(pending):
+                        pending.discard(future)
+                        try:
+                            results.extend(future.result())
+                        except Exception as e:
+                            print(f"İş grubu çalıştırılamadı: {e}")
+                            results.extend(failed_result(job, e) for job in futures[future])
+                except KeyboardInterrupt:
+                    # Başlamamış gruplar iptal edilir; çalışanlar sinyali alıp kısmi sonuçlarla biter
+                    print("İptal ediliyor, çalışan işlerin bitmesi bekleniyor...")
+                    for future in list(pending):
+                        if future.cancel():
+                            pending.discard(future)
+    finally:
+        manager.shutdown()
+
+    order = {job["name"]: index for index, job in enumerate(jobs)}
+    results.sort(key=lambda result: order[result["name"]])
+    print(write_report(results, run_dir, time.time() - started))
+    return 0 if all(result["status"] == "ok" for result in results) and len(results) == len(jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
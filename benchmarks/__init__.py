@@ -0,0 +1 @@
+# Bu dosya benchmarks paketini tanımlar
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Uygulama açılışındaki modül yükleme süresi için kıyaslama betiği.
+
+Hedef modülü her seferinde yeni bir Python sürecinde `-X importtime` ile
+içe aktarır; toplam süreyi, en pahalı paketleri ve açılışta yüklenmemesi
+gereken ağır modüllerin (pywebview, Pillow, BeautifulSoup) durumunu raporlar.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_startup --runs 5 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# İlk kullanıma ertelenen paketler ve yükleme maliyetini ölçmek için içe aktarılan modülleri
+DEFERRED_MODULES = {"webview": "webview", "PIL": "PIL.Image", "bs4": "bs4"}
+
+
+def run_import(target, extra_code=""):
+    """Hedefi yeni bir süreçte içe aktarır; (duvar süresi, importtime çıktısı, stdout) döndürür."""
+    command = [sys.executable, "-X", "importtime", "-c", f"import {target}\n{extra_code}"]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-5:]))
+    return elapsed, result.stderr, result.stdout
+
+
+def parse_importtime(output):
+    """`-X importtime` çıktısını (modül, kendi süresi µs, toplam süre µs, derinlik) listesine çevirir."""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def summarize_packages(entries):
+    """Kendi sürelerini üst düzey paket adına göre toplar."""
+    totals = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış modül yükleme kıyaslaması")
+    parser.add_argument("--target", default="ui.app", help="içe aktarılacak modül")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    check = (
+        "import sys\n"
+        f"print(' '.join(name for name in {tuple(DEFERRED_MODULES)!r} if name in sys.modules))"
+    )
+
+    timings = []
+    entries = []
+    loaded = []
+    for _ in range(args.runs):
+        try:
+            elapsed, stderr, stdout = run_import(args.target, check)
+        except RuntimeError as e:
+            print(f"{args.target} içe aktarılamadı:\n{e}")
+            return 1
+        timings.append(elapsed)
+        entries = parse_importtime(stderr)
+        loaded = stdout.split()
+
+    target_entry = next((entry for entry in entries if entry[0] == args.target), None)
+    print(f"Hedef: {args.target} ({args.runs} çalıştırma)")
+    print(f"Süreç süresi (medyan): {statistics.median(timings) * 1000:.1f} ms "
+          f"(en iyi {min(timings) * 1000:.1f} ms)")
+    if target_entry:
+        print(f"İçe aktarma süresi: {target_entry[2] / 1000:.1f} ms, {len(entries)} modül")
+
+    print(f"\nEn pahalı {args.top} paket (kendi süreleri toplamı):")
+    for package, self_us in summarize_packages(entries)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    print(f"\nEn pahalı {args.top} modül (toplam süre):")
+    for name, _, cumulative_us, depth in sorted(entries, key=lambda entry: entry[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    print("\nErtelenen modüller:")
+    for name, probe in DEFERRED_MODULES.items():
+        state = "AÇILIŞTA YÜKLENDİ" if name in loaded else "yüklenmedi"
+        try:
+            _, stderr, _ = run_import(probe)
+        except RuntimeError:
+            print(f"  {name:8s} {state} (kurulu değil)")
+            continue
+        # Paketin en üst düzeydeki tüm içe aktarmaları toplanır
+        cost = sum(entry[2] for entry in parse_importtime(stderr)
+                   if entry[3] == 0 and entry[0].split(".")[0] == name)
+        print(f"  {name:8s} {state} (yükleme süresi {cost / 1000:.1f} ms)")
+
+    return 1 if loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Tarama, site analizi ve yükleme için uçtan uca kıyaslama paketi.
+
+Yerel sentetik mağazalara (benchmarks.shop_fixture) karşı `scrape_products`,
+`scrape_sites` ve `analyze_site`; sahte WordPress sunucusuna
+(benchmarks.wp_standin) karşı REST ve XML-RPC yükleme hattı çalıştırılır.
+Her senaryo ayrı bir süreçte yürütülür; böylece tepe bellek kullanımı (RSS)
+yalnızca o senaryoya aittir ve senaryolar birbirinin önbelleğini ısıtmaz.
+Sunucular ana süreçte çalışır; sayfa sayıları sunucu tarafında sayılır.
+
+Ölçülen değerler: sayfa/sn, ürün/sn, yükleme/sn ve tepe RSS (MB). Sonuçlar
+JSON olarak kaydedilir; `--save-baseline` ile temel çizgi olarak saklanır ve
+sonraki çalıştırmalar bu temel çizgiyle karşılaştırılır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_suite --save-baseline
+    python -m benchmarks.bench_suite --latency 0.01 --error-rate 0.02 --max-regression 15
+    python -m benchmarks.bench_suite --scenarios scrape-shopify upload-rest --repeat 3
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks.shop_fixture import PLATFORMS, SyntheticShop
+from benchmarks.wp_standin import WordPressStandIn
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+LATEST_PATH = os.path.join(RESULTS_DIR, "latest.json")
+
+SCENARIOS = (
+    [f"scrape-{name}" for name in PLATFORMS] + ["scrape-multi"]
+    + [f"analyze-{name}" for name in PLATFORMS] + ["upload-rest", "upload-xmlrpc"]
+)
+
+# Karşılaştırılan ölçümler ve yönleri (True: yüksek değer daha iyi)
+METRICS = {
+    "pages_per_sec": True,
+    "products_per_sec": True,
+    "uploads_per_sec": True,
+    "peak_rss_mb": False
+}
+
+
+def peak_rss_mb():
+    """Sürecin tepe bellek kullanımını MB olarak döndürür; ölçülemiyorsa None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kilobayt, macOS bayt cinsinden bildirir
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def isolate_caches():
+    """Önbellek dizinlerini geçici bir dizine yönlendirir; proje önbelleği kirlenmez."""
+    from config import DEFAULT_CONFIG
+    root = tempfile.mkdtemp(prefix="bench-cache-")
+    for key in DEFAULT_CONFIG:
+        if key.endswith("_dir"):
+            DEFAULT_CONFIG[key] = os.path.join(root, key)
+
+
+def run_scenario(name, spec):
+    """Senaryoyu alt süreçte çalıştırır; süreyi, sayıları ve tepe RSS'i döndürür."""
+    isolate_caches()
+    kind, target = name.split("-", 1)
+    result = {"products": 0, "uploads": 0, "failed": 0}
+
+    # Tarayıcıların ayrıntılı çıktıları ölçümü gölgelemesin
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        if kind == "scrape":
+            from scrapers.product_scraper import ProductScraper
+            scraper = ProductScraper()
+            scraper.set_progress_callback(lambda *args: None)
+            scraper.request_delay = spec["request_delay"]
+            start = time.perf_counter()
+            if target == "multi":
+                contexts = scraper.scrape_sites(spec["sites"], max_workers=spec["workers"])
+                result["products"] = sum(len(context.products) for context in contexts)
+            else:
+                url, max_pages = spec["sites"][0]
+                result["products"] = len(scraper.scrape_products(url, max_pages))
+            result["elapsed"] = time.perf_counter() - start
+
+        elif kind == "analyze":
+            from scrapers.site_analyzer import SiteAnalyzer
+            analyzer = SiteAnalyzer()
+            analyzer.set_progress_callback(lambda *args: None)
+            analyzer.request_delay = spec["request_delay"]
+            url, max_pages = spec["sites"][0]
+            start = time.perf_counter()
+            categories = analyzer.analyze_site(url, max_urls=max_pages, use_cache=False)
+            result["elapsed"] = time.perf_counter() - start
+            result["categories"] = len(categories)
+
+        else:
+            from benchmarks.bench_upload_backends import build_products
+            from uploaders.upload_pipeline import UploadPipeline
+            from uploaders.wordpress_uploader import create_uploader
+            uploader = create_uploader(spec["wp_url"], "bench", "bench", backend=target)
+            uploader.set_progress_callback(lambda *args: None)
+            # Yalnızca aktarım yolu ölçülür; resim işleme Pillow'a bağlıdır
+            uploader.media_cache = None
+            uploader.image_processor = None
+            if target == "xmlrpc":
+                # Fiyat/SKU alanlarını işleyen eklentinin sunucuda kurulu olduğu varsayılır
+                uploader.product_fields = True
+            products = build_products(spec["uploads"], spec["wp_url"])
+            start = time.perf_counter()
+            results = UploadPipeline(uploader).run(products)
+            result["elapsed"] = time.perf_counter() - start
+            result["failed"] = sum(1 for item in results if not item["id"])
+            result["uploads"] = len(results) - result["failed"]
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def scenario_spec(name, shops, standin, args):
+    """Senaryonun alt sürece gönderilecek parametrelerini hazırlar."""
+    kind, target = name.split("-", 1)
+    spec = {"request_delay": args.request_delay, "workers": args.workers}
+    if kind == "upload":
+        spec.update(wp_url=standin.url, uploads=args.uploads)
+        return spec, []
+    used = list(shops.values()) if target == "multi" else [shops[target]]
+    spec["sites"] = [(shop.url, shop.listing_pages) for shop in used]
+    return spec, used
+
+
+def measure(name, shops, standin, args):
+    """Senaryoyu bir kez çalıştırır ve ölçümleri hesaplar."""
+    spec, used = scenario_spec(name, shops, standin, args)
+    before = [dict(shop.requests) for shop in used]
+    wp_before = dict(standin.requests)
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        result = executor.submit(run_scenario, name, spec).result()
+
+    # Sayfa sayısı sunucu tarafında sayılır: liste, ürün ve hatalı yanıtlar
+    pages = sum(
+        sum(shop.requests[key] - counts[key] for key in ("page", "product", "error"))
+        for shop, counts in zip(used, before)
+    )
+    errors = sum(shop.requests["error"] - counts["error"] for shop, counts in zip(used, before))
+    # Yükleme senaryolarında medya yolu ve kısıtlı REST API kullanımı da kaydedilir
+    uploading = name.startswith("upload-")
+    elapsed = max(result["elapsed"], 1e-9)
+    return {
+        "elapsed": round(elapsed, 3),
+        "pages": pages,
+        "products": result["products"],
+        "uploads": result["uploads"],
+        "errors": errors + result["failed"],
+        "pages_per_sec": round(pages / elapsed, 1) if used else None,
+        "products_per_sec": round(result["products"] / elapsed, 1) if result["products"] else None,
+        "uploads_per_sec": round(result["uploads"] / elapsed, 1) if result["uploads"] else None,
+        "media_uploads": standin.requests["media_items"] - wp_before["media_items"] if uploading else None,
+        "rest_requests": standin.requests["rest"] - wp_before["rest"] if uploading else None,
+        "peak_rss_mb": result["peak_rss_mb"]
+    }
+
+
+def combine(runs):
+    """Tekrarlanan çalıştırmaları birleştirir: hızlar için medyan, bellek için en yüksek değer."""
+    combined = dict(runs[0])
+    for key in ("elapsed", "pages_per_sec", "products_per_sec", "uploads_per_sec"):
+        values = [run[key] for run in runs if run[key] is not None]
+        combined[key] = round(statistics.median(values), 3 if key == "elapsed" else 1) if values else None
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    combined["peak_rss_mb"] = max(rss) if rss else None
+    return combined
+
+
+def compare(results, baseline, max_regression):
+    """Sonuçları temel çizgiyle karşılaştırır; eşiği aşan gerilemelerin listesini döndürür."""
+    if baseline.get("parameters") != results["parameters"]:
+        print("Uyarı: temel çizgi farklı parametrelerle alınmış; karşılaştırma yanıltıcı olabilir.")
+
+    regressions = []
+    print(f"\n{'senaryo':<22} {'ölçüm':<17} {'temel':>10} {'şimdi':>10} {'değişim':>9}")
+    for name, metrics in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            # Gerileme: hız düştüyse ya da bellek arttıysa
+            regression = -change if higher_is_better else change
+            flag = ""
+            if max_regression is not None and regression > max_regression:
+                regressions.append((name, metric, change))
+                flag = "  GERİLEME"
+            print(f"{name:<22} {metric:<17} {old:>10} {new:>10} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def save_json(path, data):
+    """Sonuçları JSON dosyasına yazar."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tarama / analiz / yükleme kıyaslama paketi")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--categories", type=int, default=4, help="Mağaza başına üst kategori sayısı")
+    parser.add_argument("--subcategories", type=int, default=3, help="Üst kategori başına alt kategori sayısı")
+    parser.add_argument("--products", type=int, default=24, help="Yaprak kategori başına ürün sayısı")
+    parser.add_argument("--per-page", type=int, default=12, help="Liste sayfası başına ürün sayısı")
+    parser.add_argument("--latency", type=float, default=0.005, help="Mağaza isteği başına gecikme (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500/503 döndürülecek istek oranı")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--request-delay", type=float, default=0.0,
+                        help="Tarayıcıların istekler arası beklemesi; varsayılan 0 ile ham hız ölçülür")
+    parser.add_argument("--workers", type=int, default=None, help="Çoklu mağaza taramasında iş parçacığı sayısı")
+    parser.add_argument("--uploads", type=int, default=200, help="Yükleme senaryolarındaki ürün sayısı")
+    parser.add_argument("--wp-latency", type=float, default=0.02, help="Sahte WordPress isteği başına gecikme")
+    parser.add_argument("--wp-concurrency", type=int, default=4, help="Sahte WordPress'in eşzamanlı istek sınırı")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default=LATEST_PATH, help="Sonuçların yazılacağı dosya")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Karşılaştırılacak temel çizgi dosyası")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları temel çizgi olarak da kaydet")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Bu yüzdeden fazla gerileme varsa 1 ile çık")
+    args = parser.parse_args()
+
+    parameters = {
+        key: getattr(args, key)
+        for key in ("categories", "subcategories", "products", "per_page", "latency", "error_rate",
+                    "seed", "request_delay", "workers", "uploads", "wp_latency", "wp_concurrency")
+    }
+    shops = {
+        name: SyntheticShop(name, args.categories, args.subcategories, args.products, args.per_page,
+                            args.latency, args.error_rate, args.seed).start()
+        for name in PLATFORMS
+    }
+    standin = WordPressStandIn(latency=args.wp_latency, concurrency=args.wp_concurrency).start()
+
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "scenarios": {}
+    }
+
+    print(f"{'senaryo':<22} {'süre':>7} {'sayfa':>6} {'ürün':>6} {'hata':>5} "
+          f"{'sayfa/sn':>9} {'ürün/sn':>8} {'yükleme/sn':>11} {'RSS MB':>7}")
+    try:
+        for name in args.scenarios:
+            metrics = combine([measure(name, shops, standin, args) for _ in range(args.repeat)])
+            results["scenarios"][name] = metrics
+            row = [metrics[key] if metrics[key] is not None else "-"
+                   for key in ("pages_per_sec", "products_per_sec", "uploads_per_sec", "peak_rss_mb")]
+            print(f"{name:<22} {metrics['elapsed']:>7.2f} {metrics['pages']:>6} "
+                  f"{metrics['products'] or metrics['uploads']:>6} {metrics['errors']:>5} "
+                  f"{row[0]:>9} {row[1]:>8} {row[2]:>11} {row[3]:>7}")
+    finally:
+        for shop in shops.values():
+            shop.stop()
+        standin.stop()
+
+    save_json(args.output, results)
+    print(f"\nSonuçlar kaydedildi: {args.output}")
+
+    exit_code = 0
+    if args.save_baseline:
+        save_json(args.baseline, results)
+        print(f"Temel çizgi kaydedildi: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} ölçüm %{args.max_regression} eşiğinden fazla geriledi.")
+            exit_code = 1
+    else:
+        print("Temel çizgi bulunamadı; kaydetmek için --save-baseline kullanın.")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+REST ve XML-RPC (system.multicall) yükleme arka uçları için kıyaslama betiği.
+
+Yerel sahte sunucuya (benchmarks.wp_standin) karşı resimli ürünleri yükleme
+hattıyla gönderir; istek başına gecikme ve sınırlı eşzamanlılıkla kısıtlanmış
+bir sunucu taklit edilir.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_upload_backends --products 500 --latency 0.05 --concurrency 2
+"""
+
+import argparse
+import time
+
+from benchmarks.wp_standin import WordPressStandIn
+from uploaders.upload_pipeline import UploadPipeline
+from uploaders.wordpress_uploader import create_uploader
+
+
+def build_products(count, image_base):
+    """Sahte sunucudaki resimlere işaret eden ürünler üretir."""
+    return [
+        {
+            "title": f"Ürün {i}",
+            "price": f"{10 + i % 90},99 TL",
+            "image_url": f"{image_base}/images/{i}.jpg",
+            "product_url": f"https://shop.example.com/urun/{i}",
+            "description": "Açıklama " * 20
+        }
+        for i in range(count)
+    ]
+
+
+def run_backend(backend, standin, products):
+    """Tek bir arka ucu çalıştırıp süreyi ve sunucu istek sayılarını döndürür."""
+    uploader = create_uploader(standin.url, "bench", "bench", backend=backend)
+    uploader.set_progress_callback(lambda *args: None)
+    # Yalnızca aktarım yolu ölçülür
+    uploader.media_cache = None
+    uploader.image_processor = None
+    # XML-RPC fiyat/SKU alanlarını işleyen eklentinin sunucuda kurulu olduğu varsayılır
+    uploader.product_fields = True
+
+    before = dict(standin.requests)
+    start = time.perf_counter()
+    results = UploadPipeline(uploader).run(products)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for result in results if not result["id"])
+    requests_made = {key: standin.requests[key] - before[key] for key in before}
+    return elapsed, failed, requests_made
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REST / XML-RPC yükleme kıyaslaması")
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05, help="İstek başına sunucu gecikmesi (saniye)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Sunucunun aynı anda işlediği istek sayısı")
+    parser.add_argument("--backends", nargs="+", default=["rest", "xmlrpc"])
+    args = parser.parse_args()
+
+    standin = WordPressStandIn(latency=args.latency, concurrency=args.concurrency).start()
+    products = build_products(args.products, standin.url)
+
+    print(f"{'arka uç':>8} {'süre (sn)':>10} {'ürün/sn':>8} {'hata':>5} {'REST':>5} {'medya':>6}  istekler")
+    try:
+        for backend in args.backends:
+            elapsed, failed, requests_made = run_backend(backend, standin, products)
+            writes = {key: value for key, value in requests_made.items() if value}
+            # Kısıtlanmış REST API'ye yapılan istekler ve medya yüklemeleri ayrıca gösterilir
+            media = requests_made["media_items"]
+            print(f"{backend:>8} {elapsed:>10.2f} {len(products) / elapsed:>8.1f} {failed:>5} "
+                  f"{requests_made['rest']:>5} {media:>6}  {writes}")
+    finally:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
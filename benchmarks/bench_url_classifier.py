@@ -0,0 +1,95 @@
+"""
+Alt kategori keşfi için kıyaslama betiği.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_url_classifier --links 5000 20000
+"""
+
+import argparse
+import random
+import time
+from urllib.parse import urljoin, urlparse, parse_qs
+
+from bs4 import BeautifulSoup
+
+from scrapers.site_analyzer import SiteAnalyzer
+
+DOMAIN = "https://shop.example.com"
+
+
+def build_page(link_count, seed=42):
+    """Verilen sayıda bağlantı içeren sentetik bir kategori sayfası üretir."""
+    rng = random.Random(seed)
+    kinds = [
+        "/product-category/{0}/", "/products/item-{0}", "/shop/page/{0}",
+        "/blog/post-{0}", "?cat={0}", "/about-{0}", "https://cdn.other.com/{0}.jpg",
+        "/category/{0}?page=2", "/urun/{0}", "#top"
+    ]
+    links = []
+    for i in range(link_count):
+        href = rng.choice(kinds).format(rng.randint(0, link_count // 4))
+        img = '<img src="x.jpg">' if i % 7 == 0 else ''
+        links.append(f'<a href="{href}">{img}Link {i}</a>')
+    return f"<html><body>{''.join(links)}</body></html>"
+
+
+def naive_find_subcategories(analyzer, soup, base_url):
+    """Önceki (bağlantı başına urlparse + desen taraması yapan) uygulama."""
+    patterns = analyzer.site_patterns[analyzer.site_type]["category_url_patterns"]
+    subcategories = []
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if href.startswith('?'):
+            href = urljoin(base_url, href)
+        elif not (href.startswith('http://') or href.startswith('https://')):
+            href = urljoin(analyzer.domain, href)
+        if urlparse(href).netloc != urlparse(analyzer.domain).netloc or href == base_url:
+            continue
+        parsed = urlparse(href)
+        # Host adı desenlerle eşleşmesin diye yalnızca yol ve sorgu incelenir
+        url_lower = f"{parsed.path}?{parsed.query}".lower()
+        query_params = parse_qs(parsed.query)
+        is_category = (
+            any(pattern in url_lower for pattern in patterns)
+            or 'category' in query_params or 'cat' in query_params or 'c' in query_params
+        )
+        if is_category and href not in analyzer.visited_urls and href not in subcategories:
+            subcategories.append(href)
+    return subcategories
+
+
+def measure(func, repeat):
+    """Fonksiyonu tekrar tekrar çalıştırıp en iyi süreyi ve sonucu döndürür."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alt kategori keşfi kıyaslaması")
+    parser.add_argument("--links", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    analyzer = SiteAnalyzer()
+    analyzer.extract_domain(DOMAIN)
+    analyzer.site_type = "woocommerce"
+    base_url = f"{DOMAIN}/shop/"
+
+    print(f"{'bağlantı':>10} {'önceki (ms)':>12} {'yeni (ms)':>10} {'hızlanma':>9} {'kategori':>9}")
+    for link_count in args.links:
+        soup = BeautifulSoup(build_page(link_count), 'html.parser')
+        old_time, old_result = measure(lambda: naive_find_subcategories(analyzer, soup, base_url), args.repeat)
+        new_time, new_result = measure(lambda: analyzer.find_subcategories(soup, base_url), args.repeat)
+        assert old_result == new_result, "Sonuçlar farklı"
+        count_time, _ = measure(lambda: analyzer.count_products(soup), args.repeat)
+        print(f"{link_count:>10} {old_time * 1000:>12.1f} {new_time * 1000:>10.1f} "
+              f"{old_time / new_time:>8.1f}x {len(new_result):>9}  (count_products: {count_time * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Kıyaslamalar için yerel sentetik mağaza sunucusu.
+
+WooCommerce, Shopify ve genel (platformsuz) mağazaları taklit eden HTML
+sayfalarını bellekte üretir. Ana sayfa tüm kategorilere bağlantı veren bir
+menü içerir; üst kategoriler alt kategorilere bağlantı verir, yaprak
+kategoriler sayfalanmış ürün listeleri ve ürün detay sayfaları sunar.
+Platforma özgü işaretler (eklenti yolları, CDN adresleri, sınıf adları)
+site türü tespitinin gerçek mağazalardaki gibi çalışmasını sağlar.
+
+İstek başına gecikme ve belirli oranda 500/503 yanıtı eklenebilir. Hata
+üretimi tohumlu rastgele sayı üreteciyle yapılır; ana sayfa hiçbir zaman
+hata döndürmez, böylece tarama her zaman başlayabilir.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.wp_standin import IMAGE_BYTES
+
+PLATFORMS = ("woocommerce", "shopify", "generic")
+
+# Platforma göre sayfa başlığına eklenen ve tür tespitini sağlayan işaretler
+HEAD_MARKERS = {
+    "woocommerce": "<link rel='stylesheet' href='/wp-content/plugins/woocommerce/assets/css/woocommerce.css'>",
+    "shopify": "<script src='//cdn.shopify.com/s/files/1/0001/theme.js'></script>",
+    "generic": "<link rel='stylesheet' href='/static/site.css'>"
+}
+
+BODY_CLASSES = {
+    "woocommerce": "woocommerce woocommerce-no-js",
+    "shopify": "template-collection",
+    "generic": "catalog"
+}
+
+
+class SyntheticShop:
+    """Arka planda çalışan sentetik mağaza sunucusu."""
+
+    def __init__(self, platform="woocommerce", categories=4, subcategories=3,
+                 products_per_category=24, per_page=12, latency=0.0, error_rate=0.0, seed=1):
+        if platform not in PLATFORMS:
+            raise ValueError(f"Bilinmeyen platform: {platform}")
+        self.platform = platform
+        self.categories = categories
+        self.subcategories = subcategories
+        self.products_per_category = products_per_category
+        self.per_page = max(1, per_page)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = {"page": 0, "product": 0, "image": 0, "error": 0}
+
+        # Kategori kimlikleri: üst kategoriler "3", alt kategoriler "3-2"
+        self.children = {
+            str(i): [f"{i}-{j}" for j in range(1, subcategories + 1)]
+            for i in range(1, categories + 1)
+        }
+        self.leaves = [child for top, children in self.children.items() for child in (children or [top])]
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    @property
+    def total_products(self):
+        return len(self.leaves) * self.products_per_category
+
+    @property
+    def pages_per_leaf(self):
+        return max(1, -(-self.products_per_category // self.per_page))
+
+    @property
+    def listing_pages(self):
+        """Ana sayfa dahil tüm liste sayfalarının sayısı."""
+        inner = sum(1 for children in self.children.values() if children)
+        return 1 + inner + len(self.leaves) * self.pages_per_leaf
+
+    @property
+    def category_count(self):
+        return len(self.children) + sum(len(children) for children in self.children.values())
+
+    def start(self):
+        """Sunucuyu arka plan iş parçacığında başlatır."""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Sunucuyu durdurur."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, kind):
+        with self.lock:
+            self.requests[kind] += 1
+
+    def error_status(self):
+        """Hata oranına göre bu isteğe dönecek hata kodunu, hata yoksa None döndürür."""
+        if not self.error_rate:
+            return None
+        with self.lock:
+            if self.random.random() < self.error_rate:
+                return self.random.choice((500, 503))
+        return None
+
+    # --- Platforma göre URL şemaları ---
+
+    def category_path(self, category, page=1):
+        if self.platform == "woocommerce":
+            path = f"/product-category/kategori-{category}/"
+            return path if page == 1 else f"{path}page/{page}/"
+        if self.platform == "shopify":
+            path = f"/collections/kategori-{category}"
+        else:
+            path = f"/category.php?cat={category}"
+        if page == 1:
+            return path
+        return f"{path}{'&' if '?' in path else '?'}page={page}"
+
+    def product_path(self, number):
+        if self.platform == "woocommerce":
+            return f"/product/urun-{number}/"
+        if self.platform == "shopify":
+            return f"/products/urun-{number}"
+        return f"/item.php?id={number}"
+
+    def route(self, path):
+        """İstek yolunu (tür, değer, sayfa) üçlüsüne çözer; bulunamazsa None döndürür."""
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+        parts = [part for part in parsed.path.split("/") if part]
+        page = int(query.get("page", ["1"])[0])
+
+        if not parts:
+            return "home", None, 1
+        if parts[0] == "images" and len(parts) == 2:
+            return "image", None, 1
+        if self.platform == "woocommerce":
+            if parts[0] == "product-category" and len(parts) >= 2:
+                if len(parts) == 4 and parts[2] == "page":
+                    page = int(parts[3])
+                return "category", parts[1].replace("kategori-", ""), page
+            if parts[0] == "product" and len(parts) == 2:
+                return "product", parts[1].replace("urun-", ""), 1
+        elif self.platform == "shopify":
+            if parts[0] == "collections" and len(parts) == 2:
+                return "category", parts[1].replace("kategori-", ""), page
+            if parts[0] == "products" and len(parts) == 2:
+                return "product", parts[1].replace("urun-", ""), 1
+        else:
+            if parts == ["category.php"] and "cat" in query:
+                return "category", query["cat"][0], page
+            if parts == ["item.php"] and "id" in query:
+                return "product", query["id"][0], 1
+        return None
+
+    # --- Sayfa üretimi ---
+
+    def layout(self, title, body):
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{title}</title>{HEAD_MARKERS[self.platform]}</head>"
+            f"<body class='{BODY_CLASSES[self.platform]}'>"
+            f"<nav class='menu'>{self.render_menu()}</nav>"
+            f"<main>{body}</main></body></html>"
+        ).encode("utf-8")
+
+    def render_menu(self):
+        links = []
+        for top, children in self.children.items():
+            links.append(f"<a href='{self.category_path(top)}'>Kategori {top}</a>")
+            links.extend(f"<a href='{self.category_path(child)}'>Kategori {child}</a>" for child in children)
+        return "".join(links)
+
+    def render_home(self):
+        # Gerçek mağazalardaki gibi ana sayfada öne çıkan ürünler listelenir
+        featured = self.render_listing(range(min(self.per_page, self.total_products)))
+        return self.layout("Sentetik Mağaza", f"<h1>Sentetik Mağaza</h1>{featured}")
+
+    def render_category(self, category, page):
+        children = self.children.get(category)
+        if children is None and category not in self.leaves:
+            return None
+        name = f"Kategori {category}"
+        if children:
+            links = "".join(f"<li><a href='{self.category_path(child)}'>Kategori {child}</a></li>" for child in children)
+            # Üst kategoriler alt kategorilerin yanında ilk alt kategorinin ürünlerini de gösterir
+            offset = self.leaves.index(children[0]) * self.products_per_category
+            listing = self.render_listing(range(offset, offset + min(self.per_page, self.products_per_category)))
+            return self.layout(name, f"<h1>{name}</h1><ul class='subcategories'>{links}</ul>{listing}")
+
+        if page > self.pages_per_leaf:
+            return None
+        offset = self.leaves.index(category) * self.products_per_category
+        first = (page - 1) * self.per_page
+        numbers = range(offset + first, offset + min(first + self.per_page, self.products_per_category))
+
+        pagination = ""
+        if page < self.pages_per_leaf:
+            next_url = self.category_path(category, page + 1)
+            if self.platform == "shopify":
+                pagination = f"<a rel='next' href='{next_url}'>Sonraki</a>"
+            else:
+                pagination = f"<a class='next page-numbers' href='{next_url}'>Sonraki</a>"
+
+        listing = self.render_listing(numbers)
+        return self.layout(name, f"<h1>{name}</h1>{listing}<div class='pagination'>{pagination}</div>")
+
+    def render_listing(self, numbers):
+        items = "".join(self.render_card(number) for number in numbers)
+        if self.platform == "woocommerce":
+            return f"<ul class='products columns-4'>{items}</ul>"
+        return f"<div class='product-grid'>{items}</div>"
+
+    def render_card(self, number):
+        url = self.product_path(number)
+        image = f"<img class='product-image' src='/images/{number}.jpg' alt=''>"
+        price = f"<span class='price'>{self.price_of(number)}</span>"
+        if self.platform == "woocommerce":
+            return (f"<li class='product type-product'><a href='{url}'>{image}"
+                    f"<h2 class='woocommerce-loop-product__title product-title'>Ürün {number}</h2>{price}</a></li>")
+        if self.platform == "shopify":
+            return (f"<div class='product-card'><a href='{url}'>{image}</a>"
+                    f"<a class='product-title' href='{url}'>Ürün {number}</a>{price}</div>")
+        return (f"<div class='product-item'><a href='{url}'>{image}</a>"
+                f"<span class='item-title'>Ürün {number}</span>{price}</div>")
+
+    def render_product(self, number):
+        if not number.isdigit() or int(number) >= self.total_products:
+            return None
+        number = int(number)
+        description = f"Ürün {number} için açıklama. " * 8
+        return self.layout(f"Ürün {number}", (
+            f"<h1 class='product-title'>Ürün {number}</h1>"
+            f"<img class='product-image' src='/images/{number}.jpg' alt=''>"
+            f"<p class='price'>{self.price_of(number)}</p>"
+            f"<div class='product-description'>{description}</div>"
+        ))
+
+    def price_of(self, number):
+        return f"{10 + number % 490},{number % 100:02d} TL"
+
+    def make_handler(self):
+        shop = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body, content_type="text/html; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if shop.latency:
+                    time.sleep(shop.latency)
+                route = shop.route(self.path)
+                if route is None:
+                    return self.reply(404, b"<h1>Not Found</h1>")
+
+                kind, value, page = route
+                if kind == "image":
+                    shop.count("image")
+                    return self.reply(200, IMAGE_BYTES, "image/jpeg")
+                status = shop.error_status() if kind != "home" else None
+                if status:
+                    shop.count("error")
+                    return self.reply(status, b"<h1>Server Error</h1>")
+
+                if kind == "home":
+                    body = shop.render_home()
+                elif kind == "category":
+                    body = shop.render_category(value, page)
+                else:
+                    body = shop.render_product(value)
+                if body is None:
+                    return self.reply(404, b"<h1>Not Found</h1>")
+                shop.count("product" if kind == "product" else "page")
+                self.reply(200, body)
+
+        return Handler
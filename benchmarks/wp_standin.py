@@ -0,0 +1,163 @@
+"""
+Kıyaslamalar için yerel WordPress/WooCommerce yerine geçen sunucu.
+
+WooCommerce REST toplu ürün uç noktasını, WP REST medya uç noktasını,
+xmlrpc.php (system.multicall dahil) ve kaynak resimleri taklit eder.
+Kısıtlanmış bir sunucuyu taklit etmek için her isteğe gecikme eklenir ve
+aynı anda işlenen istek sayısı sınırlanır.
+
+Her resim yolu farklı içerik döndürür; böylece içerik özetine göre
+tekilleştirme medya yüklemelerini tek bir isteğe indirmez. Fiyatı olmayan
+ürünler ve korumalı ("_") özel alanlar reddedilir; kıyaslama fiyatsız
+ürünleri başarılı saymaz.
+"""
+
+import itertools
+import json
+import threading
+import time
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xmlrpc.server import SimpleXMLRPCDispatcher
+
+# Küçük ama geçerli bir JPEG başlığıyla başlayan sahte resim içeriği
+IMAGE_BYTES = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 64
+
+
+class WordPressStandIn:
+    """Arka planda çalışan sahte WordPress sunucusu."""
+
+    def __init__(self, latency=0.02, concurrency=2, image_bytes=IMAGE_BYTES):
+        self.latency = latency
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.image_bytes = image_bytes
+        self.ids = itertools.count(1000)
+        self.lock = threading.Lock()
+        # "media_items": istek sayısından bağımsız olarak yüklenen medya öğeleri
+        self.requests = {"rest": 0, "media": 0, "xmlrpc": 0, "image": 0, "media_items": 0}
+
+        self.dispatcher = SimpleXMLRPCDispatcher(allow_none=True)
+        self.dispatcher.register_multicall_functions()
+        self.dispatcher.register_function(self.new_post, "wp.newPost")
+        self.dispatcher.register_function(self.edit_post, "wp.editPost")
+        self.dispatcher.register_function(self.delete_post, "wp.deletePost")
+        self.dispatcher.register_function(self.upload_file, "wp.uploadFile")
+        self.dispatcher.register_function(self.get_media_item, "wp.getMediaItem")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Sunucuyu arka plan iş parçacığında başlatır."""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Sunucuyu durdurur."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def next_id(self):
+        with self.lock:
+            return next(self.ids)
+
+    def count(self, kind):
+        with self.lock:
+            self.requests[kind] += 1
+
+    def check_custom_fields(self, content):
+        """WordPress gibi "_" ile başlayan korumalı meta alanlarını reddeder."""
+        for field in content.get("custom_fields") or []:
+            if field.get("key", "").startswith("_"):
+                raise xmlrpc.client.Fault(401, f"Sorry, you are not allowed to edit the {field['key']} custom field.")
+
+    def new_post(self, blog_id, username, password, content):
+        self.check_custom_fields(content)
+        # Sunucuda wpf-xmlrpc-product-fields eklentisi kurulu varsayılır; fiyat bu alanla gelir
+        if not any(field.get("key") == "wpf_regular_price" for field in content.get("custom_fields") or []):
+            raise xmlrpc.client.Fault(400, "Ürün fiyatı gönderilmedi")
+        return str(self.next_id())
+
+    def edit_post(self, blog_id, username, password, post_id, content):
+        self.check_custom_fields(content)
+        return True
+
+    def delete_post(self, blog_id, username, password, post_id):
+        return True
+
+    def upload_file(self, blog_id, username, password, data):
+        self.count("media_items")
+        media_id = self.next_id()
+        return {"id": str(media_id), "attachment_id": str(media_id), "file": data["name"]}
+
+    def get_media_item(self, blog_id, username, password, media_id):
+        return {"attachment_id": str(media_id)}
+
+    def handle_batch(self, body):
+        """WooCommerce /products/batch isteğini yanıtlar."""
+        payload = json.loads(body)
+        response = {}
+        for action, items in payload.items():
+            if action == "create":
+                response[action] = [
+                    dict(item, id=self.next_id()) if item.get("regular_price")
+                    else {"id": 0, "error": {"code": "missing_price", "message": "Ürün fiyatı gönderilmedi"}}
+                    for item in items
+                ]
+            elif action == "update":
+                response[action] = [dict(item) for item in items]
+            else:
+                response[action] = [{"id": item} for item in items]
+        return json.dumps(response).encode("utf-8")
+
+    def make_handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def read_body(self):
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_GET(self):
+                if self.path.startswith("/images/"):
+                    standin.count("image")
+                    # Her yol için farklı içerik: içerik özetleri çakışmaz
+                    return self.reply(200, standin.image_bytes + self.path.encode("utf-8"), "image/jpeg")
+                self.reply(404, b"{}")
+
+            def do_POST(self):
+                body = self.read_body()
+                # Kısıtlanmış sunucu: sınırlı eşzamanlılık ve istek başına gecikme
+                with standin.slots:
+                    time.sleep(standin.latency)
+                    if self.path.endswith("/wc/v3/products/batch"):
+                        standin.count("rest")
+                        return self.reply(200, standin.handle_batch(body))
+                    if self.path.endswith("/wp/v2/media"):
+                        standin.count("media")
+                        standin.count("media_items")
+                        return self.reply(201, json.dumps({"id": standin.next_id()}).encode("utf-8"))
+                    if self.path.endswith("/xmlrpc.php"):
+                        standin.count("xmlrpc")
+                        return self.reply(200, standin.dispatcher._marshaled_dispatch(body), "text/xml")
+                self.reply(404, b"{}")
+
+        return Handler
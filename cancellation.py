@@ -0,0 +1,58 @@
+import threading
+import time
+
+
+class CancellationToken:
+    """Uzun süren işlerin iş birliğiyle durdurulması için iptal işareti.
+
+    İşler istekler arasında `cancelled` özelliğini kontrol eder ve o ana kadar
+    topladıkları sonuçları döndürür. Bekleme gereken yerlerde `wait` kullanılır;
+    iptal edildiğinde bekleme hemen sona erer.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """İşi iptal eder ve kayıtlı geri çağrıları çalıştırır."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"İptal geri çağrısında hata: {e}")
+
+    def on_cancel(self, callback):
+        """İptal edildiğinde çağrılacak fonksiyonu kaydeder; zaten iptal edildiyse hemen çağırır."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def wait(self, timeout):
+        """En fazla `timeout` saniye bekler; iptal edildiyse True döndürür."""
+        return self._event.wait(timeout)
+
+
+def is_cancelled(token):
+    """Token verilmişse ve iptal edildiyse True döndürür."""
+    return token is not None and token.cancelled
+
+
+def wait_or_cancel(token, timeout):
+    """Token varsa iptal edilebilir şekilde, yoksa normal olarak bekler."""
+    if token is None:
+        time.sleep(timeout)
+        return False
+    return token.wait(timeout)
@@ -5,6 +5,49 @@ DEFAULT_CONFIG = {
     "default_category_id": 9,
     "request_timeout": 10,
     "request_delay": 1,  # Saniye cinsinden siteler arası bekleme süresi
+    "analysis_max_urls": 50,  # Site analizinde işlenecek maksimum URL sayısı
+    "analysis_workers": 8,  # Site analizinde paralel sayfa işleyici sayısı
+    "per_host_connections": 4,  # Aynı hosta açılabilecek eşzamanlı istek sayısı
+    "crawl_workers": 8,  # Çoklu mağaza taramasında eşzamanlı istek sayısı (alan adı başına bir istek)
+    "detail_request_delay": 0,  # Ürün detay sayfaları arasında aynı alan adı için bekleme süresi (saniye)
+    "analysis_cache_dir": "cache/site_analysis",  # Site analizi önbellek dizini
+    "analysis_cache_ttl": 7 * 24 * 3600,  # Site analizi önbelleğinin geçerlilik süresi (saniye)
+    "wc_batch_size": 100,  # WooCommerce toplu istek başına öğe sayısı (API sınırı 100)
+    "wc_batch_timeout": 120,  # Toplu istekler için zaman aşımı (saniye)
+    "media_upload_timeout": 120,  # Medya yükleme isteğinde sunucu yanıtı için zaman aşımı (saniye); bağlantı için request_timeout kullanılır
+    "upload_download_workers": 8,  # Yükleme hattında resim indirme iş parçacığı sayısı
+    "upload_media_workers": 4,  # Yükleme hattında medya yükleme iş parçacığı sayısı
+    "upload_product_workers": 2,  # Yükleme hattında toplu ürün isteği gönderen iş parçacığı sayısı
+    "upload_queue_size": 32,  # Yükleme hattı aşamaları arasındaki kuyruk sınırı
+    "upload_flush_interval": 0.5,  # Ürün aşamasının bekleyen ürünleri göndermeden önce bekleme süresi (saniye)
+    "max_image_bytes": 25 * 1024 * 1024,  # Yüklenecek kaynak resim için boyut sınırı
+    "image_chunk_size": 64 * 1024,  # Resim aktarımında parça boyutu
+    "image_spool_bytes": 1024 * 1024,  # Ara belleğe alınan resimler için bellekte tutulacak en fazla bayt (fazlası diske yazılır)
+    "media_cache_enabled": True,  # Aynı resimleri tekrar yüklememek için kalıcı medya dizini
+    "media_cache_dir": "cache/media",  # Medya dizini dosyalarının dizini
+    "media_cache_verify_after": 7 * 24 * 3600,  # Bu süreden eski medya kayıtları kullanılmadan önce doğrulanır (saniye)
+    "source_url_meta_key": "source_product_url",  # Ürünün kaynak URL'sinin saklandığı WooCommerce meta alanı
+    "store_snapshot_dir": "cache/store",  # Mağaza ürün görüntüsünün saklandığı dizin
+    "store_snapshot_ttl": 3600,  # Mağaza görüntüsünün yeniden çekilmeden kullanılacağı süre (saniye)
+    "image_processing_enabled": True,  # Resimleri yüklemeden önce küçült ve meta verilerini at
+    "image_max_dimension": 1600,  # Resmin en uzun kenarı için üst sınır (piksel)
+    "image_output_format": "keep",  # Çıktı biçimi: "keep" (kaynak biçimi), "webp" veya "jpeg"
+    "image_quality": 85,  # JPEG/WebP kodlama kalitesi
+    "image_process_workers": 2,  # Resim işleme süreç havuzundaki süreç sayısı
+    "image_process_min_bytes": 512 * 1024,  # Boyutu bilinen ve bundan küçük resimler işlenmeden akışla yüklenir ("keep" biçiminde)
+    "upload_journal_dir": "cache/journal",  # Yükleme günlüklerinin saklandığı dizin
+    "journal_fsync_every": 200,  # Günlükte kaç kayıtta bir fsync yapılacağı
+    "journal_fsync_interval": 1.0,  # Günlükte en fazla kaç saniyede bir fsync yapılacağı
+    "category_cache_dir": "cache/categories",  # Kaynak -> WooCommerce kategori eşlemelerinin saklandığı dizin
+    "upload_backend": "rest",  # Yükleme arka ucu: "rest" (WooCommerce REST) veya "xmlrpc" (system.multicall)
+    "xmlrpc_batch_size": 50,  # Tek bir multicall isteğindeki en fazla ürün sayısı
+    "xmlrpc_media_batch": 8,  # Tek bir multicall isteğinde birleştirilen en fazla medya yüklemesi
+    "xmlrpc_batch_window": 0.05,  # Medya çağrılarının birleştirilmek için beklendiği süre (saniye)
+    "xmlrpc_product_fields": False,  # Sunucuda wordpress/wpf-xmlrpc-product-fields.php kuruluysa fiyat ve SKU XML-RPC ile yazılır; kapalıyken XML-RPC ürünleri fiyatsız ve SKU'suz oluşur
+    "thumbnail_memory_bytes": 64 * 1024 * 1024,  # Bellekteki küçük resim önbelleğinin üst sınırı (bayt)
+    "thumbnail_disk_bytes": 512 * 1024 * 1024,  # Diskteki küçük resim önbelleğinin üst sınırı (bayt)
+    "thumbnail_cache_dir": "cache/thumbnails",  # Küçük resimlerin saklandığı dizin
+    "image_loader_workers": 4,  # Arayüzde resimleri arka planda yükleyen iş parçacığı sayısı
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
@@ -51,6 +94,52 @@ PRODUCT_SELECTORS = {
     ]
 }
 
+# Site türlerine göre seçiciler ve URL desenleri
+SITE_PATTERNS = {
+    "woocommerce": {
+        "category_selectors": [".product-category", ".products", ".woocommerce-loop-product"],
+        "product_selectors": [".product", ".products li", ".woocommerce-loop-product__title"],
+        "category_url_patterns": ["product-category", "shop", "products"],
+        "product_url_patterns": ["product", "item", "urun"]
+    },
+    "shopify": {
+        "category_selectors": [".collection-grid", ".collection-list", ".collection"],
+        "product_selectors": [".product-card", ".product-item", ".product-grid-item"],
+        "category_url_patterns": ["collections", "category", "collection"],
+        "product_url_patterns": ["products", "product", "item"]
+    },
+    "magento": {
+        "category_selectors": [".category-products", ".categories-list", ".catalog-category-view"],
+        "product_selectors": [".product-item", ".product-info", ".product-name"],
+        "category_url_patterns": ["category", "catalog", "categories"],
+        "product_url_patterns": ["product", "item", "detail"]
+    },
+    "opencart": {
+        "category_selectors": [".category-list", ".category-info", ".category"],
+        "product_selectors": [".product-layout", ".product-thumb", ".product-grid"],
+        "category_url_patterns": ["category", "categories", "cat"],
+        "product_url_patterns": ["product", "products", "item"]
+    },
+    "prestashop": {
+        "category_selectors": [".category", ".category-products", ".subcategories"],
+        "product_selectors": [".product-container", ".product-miniature", ".product"],
+        "category_url_patterns": ["category", "categories", "cat"],
+        "product_url_patterns": ["product", "products", "item"]
+    },
+    "generic": {
+        "category_selectors": [".category", ".categories", ".catalog", ".collection", ".department", ".products", ".items"],
+        "product_selectors": [".product", ".item", ".card", ".box", ".thumbnail", ".product-item"],
+        "category_url_patterns": ["category", "categories", "catalog", "collection", "department", "products", "items", "shop", "store"],
+        "product_url_patterns": ["product", "item", "detail", "goods", "urun"]
+    },
+    "chinese": {  # Çince siteler için özel desenler
+        "category_selectors": [".cate", ".category", ".cat-list", ".nav-item", ".menu-item"],
+        "product_selectors": [".product", ".item", ".goods", ".pro-item", ".product-item"],
+        "category_url_patterns": ["category", "cat", "list", "c=", "cid=", "id="],
+        "product_url_patterns": ["product", "item", "goods", "detail", "p=", "pid=", "id="]
+    }
+}
+
 # SSL doğrulaması yapılmayacak domainler
 SSL_DISABLED_DOMAINS = [
     'henex.cn',
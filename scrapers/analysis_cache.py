@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import re
+import time
+from config import DEFAULT_CONFIG
+
+
+def content_hash(content):
+    """Sayfa içeriğinin değişip değişmediğini anlamak için özet üretir."""
+    return hashlib.sha1(content).hexdigest()
+
+
+class SiteAnalysisCache:
+    """Site analizi sonuçlarını domain başına JSON dosyalarında, süre sınırıyla saklar."""
+
+    def __init__(self, cache_dir=None, ttl=None):
+        self.cache_dir = cache_dir or DEFAULT_CONFIG["analysis_cache_dir"]
+        self.ttl = DEFAULT_CONFIG["analysis_cache_ttl"] if ttl is None else ttl
+
+    def path_for(self, domain):
+        """Domain için önbellek dosyasının yolunu döndürür."""
+        safe_name = re.sub(r'[^\w.-]', '_', domain) or "_"
+        return os.path.join(self.cache_dir, f"{safe_name}.json")
+
+    def load(self, domain, include_stale=False):
+        """Domain için kayıtlı analizi döndürür; süresi dolmuşsa None döndürür."""
+        path = self.path_for(domain)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Analiz önbelleği okunamadı: {e}")
+            return None
+
+        if not include_stale and self.is_expired(data):
+            return None
+        return data
+
+    def is_expired(self, data):
+        """Kaydın yaşam süresinin dolup dolmadığını kontrol eder."""
+        return time.time() - data.get("saved_at", 0) > self.ttl
+
+    def save(self, domain, site_type, categories, page_hashes=None, depths=None):
+        """Analiz sonucunu atomik olarak diske yazar."""
+        data = {
+            "domain": domain,
+            "site_type": site_type,
+            "saved_at": time.time(),
+            "categories": categories,
+            "page_hashes": page_hashes or {},
+            "depths": depths or {}
+        }
+
+        path = self.path_for(domain)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            return True
+        except OSError as e:
+            print(f"Analiz önbelleği yazılamadı: {e}")
+            return False
+
+    def get_site_type(self, domain):
+        """Domain için kayıtlı ve süresi dolmamış site türünü döndürür."""
+        data = self.load(domain)
+        return data.get("site_type") if data else None
+
+    def invalidate(self, domain):
+        """Domain için kayıtlı analizi siler."""
+        path = self.path_for(domain)
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,10 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import time
 import json
 import os
-from config import DEFAULT_CONFIG, SSL_DISABLED_DOMAINS
+from config import DEFAULT_CONFIG
+from scrapers.crawl_context import ssl_verification_for
+from scrapers.page_encoding import resolve_encoding, decode_content
 
 class BaseScraper:
     """Temel web scraper sınıfı."""
@@ -24,32 +25,54 @@ class BaseScraper:
         self.domain = parsed_url.netloc
         self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
-        # SSL doğrulamasını kontrol et
-        for domain in SSL_DISABLED_DOMAINS:
-            if domain in self.domain:
-                self.verify_ssl = False
-                break
-        
-    def get_page(self, url):
-        """Belirtilen URL'den sayfa içeriğini alır."""
+    def get_page_bytes(self, url, verify_ssl=None):
+        """Belirtilen URL'den ham sayfa içeriğini ve çözülen kodlamasını alır.
+
+        (içerik, kodlama) çifti ya da hata durumunda None döndürür. SSL
+        doğrulaması verilmezse nesnenin ayarı ve alan adı istisnalarından
+        istek başına belirlenir; nesnenin ayarı değiştirilmez.
+        """
+        if verify_ssl is None:
+            verify_ssl = ssl_verification_for(urlparse(url).netloc, self.verify_ssl)
         try:
             response = requests.get(
                 url, 
                 headers={"User-Agent": self.user_agent},
-                verify=self.verify_ssl,
+                verify=verify_ssl,
                 timeout=self.request_timeout
             )
             
             if response.status_code != 200:
                 print(f"Hata: {response.status_code} - {url}")
                 return None
-                
-            return response.text
+            
+            content = response.content
+            encoding = resolve_encoding(
+                content,
+                response.headers.get("Content-Type"),
+                urlparse(url).netloc,
+                detector=lambda: response.apparent_encoding
+            )
+            return content, encoding
             
         except Exception as e:
             print(f"Sayfa alınırken hata: {e} - {url}")
             return None
     
+    def get_page(self, url):
+        """Belirtilen URL'den sayfa içeriğini metin olarak alır."""
+        page = self.get_page_bytes(url)
+        if not page:
+            return None
+        return decode_content(*page)
+    
+    def parse_page(self, page):
+        """get_page_bytes sonucunu yeniden kodlama yapmadan ayrıştırır."""
+        content, encoding = page
+        # BeautifulSoup ilk sayfa ayrıştırılırken yüklenir
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+    
     def find_element_by_selectors(self, soup, selectors, attr=None):
         """Verilen seçiciler listesini kullanarak bir element bulmaya çalışır."""
         for selector in selectors:
@@ -0,0 +1,65 @@
+import time
+from collections import deque
+from urllib.parse import urlparse
+from config import DEFAULT_CONFIG, SSL_DISABLED_DOMAINS
+
+
+def ssl_verification_for(netloc, default=True):
+    """Alan adı için SSL doğrulamasının yapılıp yapılmayacağını döndürür."""
+    if any(domain in netloc for domain in SSL_DISABLED_DOMAINS):
+        return False
+    return default
+
+
+def new_scan_stats():
+    """Boş tarama istatistikleri sözlüğü döndürür."""
+    return {
+        "total_pages_scanned": 0,
+        "total_products_found": 0,
+        "unique_products": 0,
+        "duplicate_products": 0,
+        "pages_with_products": 0,
+        "pages_without_products": 0,
+        "products_per_page": {},
+        "scan_duration": 0,
+        "site_type": None,
+        "cancelled": False
+    }
+
+
+class CrawlContext:
+    """Tek bir mağaza taramasına ait tüm durum.
+
+    Alan adı, SSL ayarı, ziyaret edilen sayfalar, bulunan ürünler ve
+    istatistikler kazıyıcı nesnesi yerine burada tutulur; böylece aynı
+    ProductScraper birden fazla mağazayı aynı anda tarayabilir. `tasks`
+    sıradaki istekleri (liste sayfası ya da ürün detayı) içerir.
+    """
+
+    def __init__(self, start_url, max_pages=10, verify_ssl=True, cancel_token=None):
+        parsed_url = urlparse(start_url)
+        self.start_url = start_url
+        self.domain = parsed_url.netloc
+        self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        self.verify_ssl = ssl_verification_for(self.domain, verify_ssl)
+        self.max_pages = max_pages
+        self.cancel_token = cancel_token
+        self.request_delay = DEFAULT_CONFIG["request_delay"]
+        self.detail_delay = DEFAULT_CONFIG["detail_request_delay"]
+
+        self.visited_urls = set()
+        self.product_urls = set()
+        self.products = []
+        self.page_categories = {}  # sayfalama URL'si -> ait olduğu kategori sayfası
+        self.site_type = None
+        self.classifier = None
+        self.selectors = None
+        self.stats = new_scan_stats()
+
+        self.tasks = deque([("page", start_url)])
+        self.queued_pages = {start_url}
+        self.page_count = 0
+        self.current_page = 0  # ilerleme bildiriminde gösterilen sayfa numarası
+        self.total_pages = min(max_pages, 1)
+        self.start_time = time.time()
+        self.reporter = None  # çoklu taramada ilerlemeyi birleştiren geri çağrı
@@ -0,0 +1,84 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import DEFAULT_CONFIG
+from cancellation import wait_or_cancel
+
+
+class CrawlScheduler:
+    """Birden fazla mağaza taramasını tek süreçte adil biçimde iç içe yürütür.
+
+    Her adım bir taramanın tek isteğidir (liste sayfası ya da ürün detayı).
+    Bağlamlar sırayla ele alınır; bir alan adına aynı anda en fazla bir
+    istek gönderilir ve istekler arasında taramanın bildirdiği bekleme
+    süresine uyulur. Böylece yavaş ya da büyük bir mağaza diğerlerini
+    bekletmez ve hiçbir siteye hızlı ardışık istek gitmez.
+    """
+
+    def __init__(self, scraper, max_workers=None):
+        self.scraper = scraper
+        self.max_workers = max_workers or DEFAULT_CONFIG["crawl_workers"]
+        self.busy_domains = set()
+        self.ready_at = {}  # alan adı -> bir sonraki isteğin gönderilebileceği an
+
+    def run(self, contexts, cancel_token=None):
+        """Tüm taramaları bitene kadar yürütür ve bağlamları döndürür."""
+        if len(contexts) > 1:
+            # İlerleme tüm taramaların toplamı olarak bildirilir
+            def report(context, message):
+                self.scraper.update_progress(
+                    f"[{context.domain}] {message}",
+                    sum(item.page_count for item in contexts),
+                    sum(item.total_pages for item in contexts)
+                )
+            for context in contexts:
+                context.reporter = report
+
+        pending = deque(contexts)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawl") as executor:
+            while pending or running:
+                self.dispatch(executor, pending, running)
+
+                now = time.monotonic()
+                waiting = [self.ready_at.get(context.domain, 0) - now for context in pending
+                           if context.domain not in self.busy_domains]
+                timeout = max(0, min(waiting)) if waiting and len(running) < self.max_workers else None
+
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.complete(future, running.pop(future), pending)
+                elif timeout is not None:
+                    wait_or_cancel(cancel_token, timeout)
+        return contexts
+
+    def dispatch(self, executor, pending, running):
+        """Sırası gelen ve beklemesi dolan bağlamların bir sonraki adımını başlatır."""
+        now = time.monotonic()
+        for _ in range(len(pending)):
+            if len(running) >= self.max_workers:
+                break
+            context = pending.popleft()
+            if context.domain in self.busy_domains or self.ready_at.get(context.domain, 0) > now:
+                pending.append(context)
+                continue
+            # Adım bitince bağlam kuyruğun sonuna eklenir; böylece sıra adil döner
+            self.busy_domains.add(context.domain)
+            running[executor.submit(self.scraper.crawl_step, context)] = context
+
+    def complete(self, future, context, pending):
+        """Biten adımın sonucunu işler; tarama bittiyse bağlamı kapatır."""
+        self.busy_domains.discard(context.domain)
+        try:
+            delay = future.result()
+        except Exception as e:
+            print(f"Tarama adımında hata ({context.domain}): {e}")
+            context.tasks.clear()
+            delay = None
+
+        if delay is None:
+            self.scraper.finish_crawl(context)
+            return
+        self.ready_at[context.domain] = time.monotonic() + delay
+        pending.append(context)
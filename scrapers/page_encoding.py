@@ -0,0 +1,114 @@
+import codecs
+import re
+import threading
+
+# <meta charset> aramasının yapılacağı bayt sayısı (HTML5 ilk 1024 baytı önerir)
+META_SNIFF_BYTES = 4096
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)',
+    re.I
+)
+
+# Daha geniş kapsamlı eşdeğerlerine yönlendirilen kodlamalar
+_ENCODING_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'iso8859-1': 'cp1252',
+    'latin-1': 'cp1252',
+    'ascii': 'utf-8',
+}
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Domain başına son çözülen kodlama
+_domain_encodings = {}
+_domain_lock = threading.Lock()
+
+
+def normalize_encoding(name):
+    """Kodlama adını Python codec adına çevirir, geçersizse None döndürür."""
+    if not name:
+        return None
+    try:
+        codec_name = codecs.lookup(name.strip().lower()).name
+    except LookupError:
+        return None
+    return _ENCODING_ALIASES.get(codec_name, codec_name)
+
+
+def encoding_from_headers(content_type):
+    """Content-Type başlığındaki charset değerini döndürür."""
+    if not content_type:
+        return None
+    match = _HEADER_CHARSET_RE.search(content_type)
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def encoding_from_meta(content):
+    """Belgenin başındaki <meta charset> etiketinden kodlamayı bulur."""
+    match = _META_CHARSET_RE.search(content[:META_SNIFF_BYTES])
+    if not match:
+        return None
+    return normalize_encoding(match.group(1).decode('ascii', 'ignore'))
+
+
+def encoding_from_bom(content):
+    """Byte order mark varsa kodlamayı döndürür."""
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+def get_cached_encoding(domain):
+    """Domain için önbellekteki kodlamayı döndürür."""
+    with _domain_lock:
+        return _domain_encodings.get(domain)
+
+
+def remember_encoding(domain, encoding):
+    """Domain için çözülen kodlamayı önbelleğe alır."""
+    if domain and encoding:
+        with _domain_lock:
+            _domain_encodings[domain] = encoding
+
+
+def resolve_encoding(content, content_type=None, domain=None, detector=None):
+    """Yanıt baytlarının kodlamasını başlık, BOM, meta etiketi ve domain önbelleğine göre çözer.
+
+    Bunların hiçbiri sonuç vermezse önce UTF-8 denenir; o da olmazsa
+    `detector` (ör. requests'in apparent_encoding'i) domain başına yalnızca
+    bir kez çalıştırılır ve sonucu önbelleğe alınır.
+    """
+    encoding = (
+        encoding_from_bom(content)
+        or encoding_from_headers(content_type)
+        or encoding_from_meta(content)
+    )
+    if encoding:
+        remember_encoding(domain, encoding)
+        return encoding
+
+    cached = get_cached_encoding(domain) if domain else None
+    if cached:
+        return cached
+
+    try:
+        content.decode('utf-8')
+        encoding = 'utf-8'
+    except UnicodeDecodeError:
+        encoding = normalize_encoding(detector() if detector else None) or 'cp1252'
+
+    remember_encoding(domain, encoding)
+    return encoding
+
+
+def decode_content(content, encoding):
+    """Baytları verilen kodlamayla metne çevirir; hatalı baytları değiştirir."""
+    return content.decode(encoding or 'utf-8', errors='replace')
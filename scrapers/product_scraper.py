@@ -1,9 +1,14 @@
 from scrapers.base_scraper import BaseScraper
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import re
 import time
-from config import PRODUCT_SELECTORS, SITE_SPECIFIC_SELECTORS
+from config import PRODUCT_SELECTORS, SITE_SPECIFIC_SELECTORS, SITE_PATTERNS
+from scrapers.analysis_cache import SiteAnalysisCache
+from scrapers.site_fingerprint import fingerprint_site
+from scrapers.url_classifier import UrlClassifier, url_path
+from scrapers.crawl_context import CrawlContext, new_scan_stats
+from scrapers.crawl_scheduler import CrawlScheduler
+from cancellation import is_cancelled
 
 class ProductScraper(BaseScraper):
     """Ürün bilgilerini çekmek için özelleştirilmiş scraper."""
@@ -13,21 +18,16 @@ class ProductScraper(BaseScraper):
         self.products = []
         self.product_selectors = PRODUCT_SELECTORS
         self.progress_callback = None
+        self.site_type = None
+        self.classifier = None
+        self.analysis_cache = SiteAnalysisCache()
         
-        # İstatistik değişkenleri
-        self.stats = {
-            "total_pages_scanned": 0,
-            "total_products_found": 0,
-            "unique_products": 0,
-            "duplicate_products": 0,
-            "pages_with_products": 0,
-            "pages_without_products": 0,
-            "products_per_page": {},
-            "scan_duration": 0
-        }
+        # İstatistik değişkenleri (son taramanın)
+        self.stats = new_scan_stats()
         
         # Ürün URL'lerini takip etmek için set
         self.product_urls = set()
+        self.page_categories = {}
         
     def set_progress_callback(self, callback):
         """İlerleme durumunu bildirmek için callback fonksiyonu ayarlar."""
@@ -40,14 +40,15 @@ class ProductScraper(BaseScraper):
         else:
             print(message)
     
-    def get_site_specific_selectors(self):
+    def get_site_specific_selectors(self, domain=None):
         """Site için özel seçicileri döndürür."""
-        if self.domain in SITE_SPECIFIC_SELECTORS:
+        domain = domain or self.domain
+        if domain in SITE_SPECIFIC_SELECTORS:
             # Varsayılan seçiciler ile site özel seçicileri birleştir
             selectors = self.product_selectors.copy()
             
             # Her bir seçici türü için site özel seçicileri ekle
-            for selector_type, selector_list in SITE_SPECIFIC_SELECTORS[self.domain].items():
+            for selector_type, selector_list in SITE_SPECIFIC_SELECTORS[domain].items():
                 if selector_type in selectors and selector_list:
                     # Site özel seçicileri listenin başına ekle (öncelik ver)
                     selectors[selector_type] = selector_list + selectors[selector_type]
@@ -58,11 +59,27 @@ class ProductScraper(BaseScraper):
         
         return self.product_selectors
     
-    def analyze_page_structure(self, soup):
-        """Sayfa yapısını analiz ederek ürün elementlerini tespit eder."""
-        # Site özel seçicileri al
-        selectors = self.get_site_specific_selectors()
+    def resolve_site_type(self, context, page, url):
+        """Site türünü önce kayıtlı site analizinden, yoksa sayfa baytlarından belirler."""
+        site_type = self.analysis_cache.get_site_type(context.domain)
+        if not site_type:
+            site_type = fingerprint_site(page[0], url, page[1])
+        return site_type
+    
+    def is_category_link(self, context, full_url, href):
+        """Bağlantının taranacak bir kategori sayfası olup olmadığını kontrol eder."""
+        if context.site_type in SITE_PATTERNS and context.site_type != "generic":
+            if context.classifier is None:
+                context.classifier = UrlClassifier(context.base_url, SITE_PATTERNS[context.site_type], chinese=context.site_type == "chinese")
+            return context.classifier.is_category_link(full_url)
         
+        # Mutlak bağlantılarda host adı anahtar kelimelerle eşleşmesin
+        path = url_path(href)
+        category_keywords = ['category', 'categories', 'catalog', 'collection', 'department', 'products']
+        return any(keyword in path for keyword in category_keywords)
+    
+    def analyze_page_structure(self, soup, selectors):
+        """Sayfa yapısını analiz ederek ürün elementlerini tespit eder."""
         # Önce seçicileri kullanarak ürünleri bulmaya çalış
         products = self.find_elements_by_selectors(soup, selectors["product_containers"])
         
@@ -90,10 +107,9 @@ class ProductScraper(BaseScraper):
                 
         return img_divs
     
-    def extract_product_info(self, element, page_url):
+    def extract_product_info(self, context, element, page_url):
         """Verilen elementten ürün bilgilerini çıkarır."""
-        # Site özel seçicileri al
-        selectors = self.get_site_specific_selectors()
+        selectors = context.selectors
         
         # Element içinde başlık ara
         title_element = self.find_element_by_selectors(element, selectors["titles"])
@@ -116,25 +132,24 @@ class ProductScraper(BaseScraper):
             "price": price,
             "image_url": image_url,
             "product_url": product_url,
+            "category_url": context.page_categories.get(page_url, page_url),
             "description": "",
             "selected": False
         }
     
-    def get_product_details(self, product_url):
+    def get_product_details(self, context, product_url):
         """Ürün sayfasından detaylı bilgileri çeker."""
-        if not product_url or product_url in self.visited_urls:
+        if not product_url or product_url in context.visited_urls:
             return {}
             
-        self.visited_urls.add(product_url)
+        context.visited_urls.add(product_url)
         
-        html = self.get_page(product_url)
-        if not html:
+        page = self.get_page_bytes(product_url, context.verify_ssl)
+        if not page:
             return {}
             
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Site özel seçicileri al
-        selectors = self.get_site_specific_selectors()
+        soup = self.parse_page(page)
+        selectors = context.selectors
         
         # Başlık
         title = self.find_element_by_selectors(soup, selectors["titles"])
@@ -159,160 +174,222 @@ class ProductScraper(BaseScraper):
             "description": description
         }
     
-    def scrape_products(self, start_url, max_pages=10):
-        """Belirtilen URL'den başlayarak ürünleri kazır."""
-        start_time = time.time()
-        self.extract_domain(start_url)
-        self.products = []
-        self.visited_urls = set()
-        self.product_urls = set()
+    def create_context(self, start_url, max_pages=10, cancel_token=None):
+        """Tek bir mağaza taraması için bağlam oluşturur."""
+        context = CrawlContext(start_url, max_pages, self.verify_ssl, cancel_token)
+        context.request_delay = self.request_delay
+        context.selectors = self.get_site_specific_selectors(context.domain)
+        return context
+    
+    def report(self, context, message):
+        """Taramanın ilerlemesini bildirir."""
+        if context.reporter:
+            context.reporter(context, message)
+        else:
+            self.update_progress(message, context.current_page, context.total_pages)
+    
+    def scrape_products(self, start_url, max_pages=10, cancel_token=None):
+        """Belirtilen URL'den başlayarak ürünleri kazır.
         
-        # İstatistikleri sıfırla
-        self.stats = {
-            "total_pages_scanned": 0,
-            "total_products_found": 0,
-            "unique_products": 0,
-            "duplicate_products": 0,
-            "pages_with_products": 0,
-            "pages_without_products": 0,
-            "products_per_page": {},
-            "scan_duration": 0
-        }
+        `cancel_token` iptal edilirse tarama istekler arasında durur ve o ana
+        kadar bulunan ürünler döndürülür.
+        """
+        context = self.create_context(start_url, max_pages, cancel_token)
+        self.update_progress(f"Taramaya başlanıyor: {start_url}", 0, context.total_pages)
+        CrawlScheduler(self, max_workers=1).run([context], cancel_token)
         
-        urls_to_visit = [start_url]
-        page_count = 0
-        total_pages = min(max_pages, len(urls_to_visit))
+        # Arayüz ve istatistik özeti son taramanın sonuçlarını kullanır
+        self.domain = context.domain
+        self.base_url = context.base_url
+        self.visited_urls = context.visited_urls
+        self.product_urls = context.product_urls
+        self.page_categories = context.page_categories
+        self.site_type = context.site_type
+        self.classifier = context.classifier
+        self.products = context.products
+        self.stats = context.stats
+        return self.products
+    
+    def scrape_sites(self, sites, cancel_token=None, max_workers=None):
+        """Birden fazla mağazayı aynı anda tarar; (başlangıç URL'si, en fazla sayfa) listesi alır.
         
-        self.update_progress(f"Taramaya başlanıyor: {start_url}", 0, total_pages)
+        Her mağazanın durumu kendi bağlamında tutulur; alan adı başına tek
+        istek ve istekler arası bekleme korunur. Bağlam listesini döndürür.
+        """
+        contexts = [self.create_context(url, max_pages, cancel_token) for url, max_pages in sites]
+        self.update_progress(f"{len(contexts)} mağaza için tarama başlatılıyor", 0, sum(c.total_pages for c in contexts))
+        return CrawlScheduler(self, max_workers).run(contexts, cancel_token)
+    
+    def crawl_step(self, context):
+        """Taramanın sıradaki isteğini yapar.
         
-        # Site özel seçicileri al
-        selectors = self.get_site_specific_selectors()
+        Aynı alan adına bir sonraki istekten önce beklenecek süreyi, tarama
+        bittiyse None döndürür.
+        """
+        while context.tasks and not is_cancelled(context.cancel_token):
+            kind, item = context.tasks.popleft()
+            if kind == "detail":
+                self.crawl_detail(context, *item)
+                return context.detail_delay
+            if item in context.visited_urls or context.page_count >= context.max_pages:
+                continue
+            self.crawl_page(context, item)
+            # Siteyi çok hızlı taramaktan kaçınmak için bekleme
+            return context.request_delay
+        return None
+    
+    def crawl_page(self, context, current_url):
+        """Bir liste sayfasını tarar; ürünleri, detay isteklerini ve sonraki sayfaları sıraya ekler."""
+        stats = context.stats
+        context.current_page = context.page_count + 1
+        self.report(context, f"Sayfa taranıyor: {current_url}")
+        context.visited_urls.add(current_url)
+        stats["total_pages_scanned"] += 1
         
-        while urls_to_visit and page_count < max_pages:
-            current_url = urls_to_visit.pop(0)
+        page = self.get_page_bytes(current_url, context.verify_ssl)
+        if not page:
+            stats["pages_without_products"] += 1
+            return
             
-            if current_url in self.visited_urls:
-                continue
+        soup = self.parse_page(page)
+        
+        if context.site_type is None:
+            context.site_type = self.resolve_site_type(context, page, current_url)
+            stats["site_type"] = context.site_type
+        
+        # Sayfa yapısını analiz et
+        product_elements = self.analyze_page_structure(soup, context.selectors)
+        
+        page_product_count = 0
+        details = []
+        
+        self.report(context, f"Sayfada {len(product_elements)} ürün elementi bulundu")
+        
+        for i, element in enumerate(product_elements):
+            try:
+                product_data = self.extract_product_info(context, element, current_url)
                 
-            self.update_progress(f"Sayfa taranıyor: {current_url}", page_count + 1, total_pages)
-            self.visited_urls.add(current_url)
-            self.stats["total_pages_scanned"] += 1
-            
-            html = self.get_page(current_url)
-            if not html:
-                self.stats["pages_without_products"] += 1
-                continue
+                # Ürün URL'si zaten var mı kontrol et
+                if product_data["product_url"] in context.product_urls:
+                    stats["duplicate_products"] += 1
+                    continue
                 
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Sayfa yapısını analiz et
-            product_elements = self.analyze_page_structure(soup)
-            
-            page_product_count = 0
-            
-            self.update_progress(f"Sayfada {len(product_elements)} ürün elementi bulundu", page_count + 1, total_pages)
-            
-            for i, element in enumerate(product_elements):
-                try:
-                    product_data = self.extract_product_info(element, current_url)
-                    
-                    # Ürün URL'si zaten var mı kontrol et
-                    if product_data["product_url"] in self.product_urls:
-                        self.stats["duplicate_products"] += 1
-                        continue
-                    
-                    if product_data["product_url"]:
-                        self.product_urls.add(product_data["product_url"])
-                    
-                    if product_data["product_url"] and product_data["product_url"] not in self.visited_urls:
-                        # Ürün detay sayfasından daha fazla bilgi al
-                        self.update_progress(f"Ürün detayları alınıyor: {product_data['title'] or 'Ürün'} ({i+1}/{len(product_elements)})", page_count + 1, total_pages)
-                        details = self.get_product_details(product_data["product_url"])
-                        
-                        # Detay sayfasından gelen bilgileri birleştir
-                        if details:
-                            if not product_data["title"] and details.get("title"):
-                                product_data["title"] = details["title"]
-                                
-                            if not product_data["price"] and details.get("price"):
-                                product_data["price"] = details["price"]
-                                
-                            if not product_data["image_url"] and details.get("image_url"):
-                                product_data["image_url"] = details["image_url"]
-                                
-                            if details.get("description"):
-                                product_data["description"] = details["description"]
-                    
-                    # Ürün başlığı veya URL'si varsa listeye ekle
-                    if product_data["title"] or product_data["product_url"]:
-                        self.products.append(product_data)
-                        self.stats["total_products_found"] += 1
-                        page_product_count += 1
-                        
-                except Exception as e:
-                    print(f"Ürün çıkarılırken hata: {e}")
-            
-            # Sayfa ürün istatistiklerini güncelle
-            if page_product_count > 0:
-                self.stats["pages_with_products"] += 1
-                self.stats["products_per_page"][current_url] = page_product_count
-            else:
-                self.stats["pages_without_products"] += 1
-            
-            # Sonraki sayfa linkini bul
-            next_page = None
-            next_element = self.find_element_by_selectors(soup, selectors["next_page"])
-            
-            if next_element and hasattr(next_element, 'get') and next_element.get('href'):
-                next_page = urljoin(current_url, next_element['href'])
-            
-            if next_page and next_page not in self.visited_urls and page_count < max_pages - 1:
-                urls_to_visit.append(next_page)
-            
-            # Kategori sayfalarını bul (sadece ilk sayfada)
-            if page_count == 0:
-                category_keywords = ['category', 'categories', 'catalog', 'collection', 'department', 'products']
-                links = soup.find_all('a', href=True)
+                if product_data["product_url"]:
+                    context.product_urls.add(product_data["product_url"])
                 
-                for link in links:
-                    href = link['href'].lower()
+                # Ürün başlığı veya URL'si varsa listeye ekle
+                if product_data["title"] or product_data["product_url"]:
+                    context.products.append(product_data)
+                    stats["total_products_found"] += 1
+                    page_product_count += 1
+                
+                if product_data["product_url"] and product_data["product_url"] not in context.visited_urls:
+                    # Detay sayfası ayrı bir istek olarak sıradaki sayfadan önce alınır
+                    details.append(("detail", (product_data, i + 1, len(product_elements))))
                     
-                    # Sadece aynı domain'deki kategori linklerini takip et
-                    full_url = urljoin(current_url, href)
-                    if self.domain in full_url and full_url not in self.visited_urls and full_url not in urls_to_visit:
-                        if any(keyword in href for keyword in category_keywords):
-                            urls_to_visit.append(full_url)
-            
-            # Toplam sayfa sayısını güncelle
-            total_pages = min(max_pages, len(urls_to_visit) + page_count + 1)
+            except Exception as e:
+                print(f"Ürün çıkarılırken hata: {e}")
+        
+        # Sayfa ürün istatistiklerini güncelle
+        if page_product_count > 0:
+            stats["pages_with_products"] += 1
+            stats["products_per_page"][current_url] = page_product_count
+        else:
+            stats["pages_without_products"] += 1
+        
+        # Sonraki sayfa linkini bul
+        next_page = None
+        next_element = self.find_element_by_selectors(soup, context.selectors["next_page"])
+        
+        if next_element and hasattr(next_element, 'get') and next_element.get('href'):
+            next_page = urljoin(current_url, next_element['href'])
+        
+        if next_page and next_page not in context.visited_urls and context.page_count < context.max_pages - 1:
+            self.queue_page(context, next_page)
+            # Sonraki sayfadaki ürünler de aynı kategoriye aittir
+            context.page_categories[next_page] = context.page_categories.get(current_url, current_url)
+        
+        # Kategori sayfalarını bul (sadece ilk sayfada)
+        if context.page_count == 0:
+            links = soup.find_all('a', href=True)
             
-            page_count += 1
-            time.sleep(self.request_delay)  # Siteyi çok hızlı taramaktan kaçınmak için bekleme
+            for link in links:
+                href = link['href'].lower()
+                
+                # Sadece aynı domain'deki kategori linklerini takip et
+                full_url = urljoin(current_url, href)
+                if context.domain in full_url and full_url not in context.visited_urls and full_url not in context.queued_pages:
+                    if self.is_category_link(context, full_url, href):
+                        self.queue_page(context, full_url)
         
-        # İstatistikleri tamamla
-        self.stats["unique_products"] = len(self.products)
-        self.stats["scan_duration"] = round(time.time() - start_time, 2)
+        context.tasks.extendleft(reversed(details))
         
-        self.update_progress(f"Tarama tamamlandı. Toplam {len(self.products)} benzersiz ürün bulundu.", max_pages, max_pages)
-        return self.products
+        # Toplam sayfa sayısını güncelle
+        queued = sum(1 for kind, _ in context.tasks if kind == "page")
+        context.total_pages = min(context.max_pages, queued + context.page_count + 1)
+        context.page_count += 1
+    
+    def queue_page(self, context, url):
+        """Liste sayfasını taramanın sonuna ekler."""
+        context.tasks.append(("page", url))
+        context.queued_pages.add(url)
+    
+    def crawl_detail(self, context, product_data, index, count):
+        """Ürün detay sayfasından eksik bilgileri tamamlar."""
+        self.report(context, f"Ürün detayları alınıyor: {product_data['title'] or 'Ürün'} ({index}/{count})")
+        try:
+            details = self.get_product_details(context, product_data["product_url"])
+        except Exception as e:
+            print(f"Ürün çıkarılırken hata: {e}")
+            return
+        
+        # Detay sayfasından gelen bilgileri birleştir
+        if details:
+            if not product_data["title"] and details.get("title"):
+                product_data["title"] = details["title"]
+                
+            if not product_data["price"] and details.get("price"):
+                product_data["price"] = details["price"]
+                
+            if not product_data["image_url"] and details.get("image_url"):
+                product_data["image_url"] = details["image_url"]
+                
+            if details.get("description"):
+                product_data["description"] = details["description"]
+    
+    def finish_crawl(self, context):
+        """Tarama istatistiklerini tamamlar ve sonucu bildirir."""
+        stats = context.stats
+        stats["unique_products"] = len(context.products)
+        stats["scan_duration"] = round(time.time() - context.start_time, 2)
+        stats["cancelled"] = is_cancelled(context.cancel_token)
+        context.current_page = context.total_pages = context.max_pages
+        
+        if stats["cancelled"]:
+            self.report(context, f"Tarama iptal edildi. {len(context.products)} ürün bulundu.")
+        else:
+            self.report(context, f"Tarama tamamlandı. Toplam {len(context.products)} benzersiz ürün bulundu.")
     
-    def get_stats_summary(self):
-        """İstatistik özetini döndürür."""
+    def get_stats_summary(self, context=None):
+        """İstatistik özetini döndürür; bağlam verilirse o taramanın özetini verir."""
+        stats = context.stats if context else self.stats
         summary = f"""
 Tarama İstatistikleri:
 ---------------------
-Taranan Toplam Sayfa: {self.stats['total_pages_scanned']}
-Bulunan Toplam Ürün: {self.stats['total_products_found']}
-Benzersiz Ürün Sayısı: {self.stats['unique_products']}
-Mükerrer Ürün Sayısı: {self.stats['duplicate_products']}
-Ürün İçeren Sayfa Sayısı: {self.stats['pages_with_products']}
-Ürün İçermeyen Sayfa Sayısı: {self.stats['pages_without_products']}
-Tarama Süresi: {self.stats['scan_duration']} saniye
+Taranan Toplam Sayfa: {stats['total_pages_scanned']}
+Bulunan Toplam Ürün: {stats['total_products_found']}
+Benzersiz Ürün Sayısı: {stats['unique_products']}
+Mükerrer Ürün Sayısı: {stats['duplicate_products']}
+Ürün İçeren Sayfa Sayısı: {stats['pages_with_products']}
+Ürün İçermeyen Sayfa Sayısı: {stats['pages_without_products']}
+Tarama Süresi: {stats['scan_duration']} saniye
+Site Türü: {stats.get('site_type') or 'bilinmiyor'}
+Durum: {'İptal edildi (kısmi sonuç)' if stats.get('cancelled') else 'Tamamlandı'}
 
 Sayfa Başına Ürün Sayıları:
 """
         # En çok ürün içeren 5 sayfayı göster
-        sorted_pages = sorted(self.stats['products_per_page'].items(), key=lambda x: x[1], reverse=True)
+        sorted_pages = sorted(stats['products_per_page'].items(), key=lambda x: x[1], reverse=True)
         for i, (url, count) in enumerate(sorted_pages[:5]):
             summary += f"  {url}: {count} ürün\n"
             
@@ -1,12 +1,11 @@
 import tkinter as tk
 from tkinter import ttk
-import webview
 import os
 import json
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import requests
 from scrapers.base_scraper import BaseScraper
+from scrapers.page_encoding import decode_content
 
 class SelectorBuilder(BaseScraper):
     """Web sayfasını görüntüleyip interaktif olarak seçici oluşturmayı sağlayan sınıf."""
@@ -45,12 +44,12 @@ class SelectorBuilder(BaseScraper):
         self.update_progress(f"Sayfa yükleniyor: {url}")
         
         # Sayfayı indir
-        html = self.get_page(url)
-        if not html:
+        page = self.get_page_bytes(url)
+        if not page:
             self.update_progress(f"Sayfa yüklenemedi: {url}")
             return False
             
-        self.current_page_html = html
+        self.current_page_html = decode_content(*page)
         
         # Geçici HTML dosyasını oluştur
         temp_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "temp")
@@ -58,7 +57,7 @@ class SelectorBuilder(BaseScraper):
         temp_file = os.path.join(temp_dir, "page_preview.html")
         
         # Seçici oluşturma JavaScript kodunu HTML'e ekle
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.parse_page(page)
         
         # Seçici oluşturma için gerekli JavaScript kodunu ekle
         script_tag = soup.new_tag("script")
@@ -224,8 +223,9 @@ class SelectorBuilder(BaseScraper):
         soup.head.append(script_tag)
         
         # Düzenlenmiş HTML'i geçici dosyaya kaydet
-        with open(temp_file, "w", encoding="utf-8") as f:
-            f.write(str(soup))
+        # encode() <meta charset> değerini de UTF-8 olarak yeniden yazar
+        with open(temp_file, "wb") as f:
+            f.write(soup.encode("utf-8"))
             
         self.update_progress("Sayfa önizlemesi hazırlanıyor...")
         
@@ -236,6 +236,9 @@ class SelectorBuilder(BaseScraper):
     
     def open_webview(self, html_file, original_url):
         """WebView penceresini açar."""
+        # pywebview yalnızca seçici oluşturucu açıldığında yüklenir
+        import webview
+        
         # WebView API'sini tanımla
         class Api:
             def __init__(self, selector_builder):
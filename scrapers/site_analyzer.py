@@ -1,10 +1,17 @@
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
 import time
+import threading
 import requests
 import re
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from config import DEFAULT_CONFIG, SITE_PATTERNS
+from scrapers.page_encoding import resolve_encoding, decode_content
+from scrapers.site_fingerprint import fingerprint_site, remember_site_type
+from scrapers.analysis_cache import SiteAnalysisCache, content_hash
+from scrapers.url_classifier import UrlClassifier
+from cancellation import is_cancelled, wait_or_cancel
 
 class SiteAnalyzer:
     """Web sitesinin yapısını analiz eden sınıf."""
@@ -18,52 +25,20 @@ class SiteAnalyzer:
         self.request_delay = 0.5  # Saniye cinsinden istekler arası bekleme süresi
         self.site_type = "unknown"  # Algılanan site türü
         self.max_retries = 3  # Başarısız istekler için yeniden deneme sayısı
+        self.max_urls = DEFAULT_CONFIG["analysis_max_urls"]  # Maksimum işlenecek URL sayısı
+        self.max_workers = DEFAULT_CONFIG["analysis_workers"]  # Paralel sayfa işleyici sayısı
+        self.per_host_limit = DEFAULT_CONFIG["per_host_connections"]  # Host başına eşzamanlı istek
+        self._host_limits = {}
+        self._classifier = None
+        self._classifier_key = None
+        self.cache = SiteAnalysisCache()
+        self.page_hashes = {}  # kategori URL'si -> içerik özeti
+        self.depths = {}  # kategori URL'si -> tarama derinliği
+        self.cancel_token = None  # Çalışan analizin iptal işareti
+        self._host_limits_lock = threading.Lock()
         
         # Farklı site türleri için seçiciler
-        self.site_patterns = {
-            "woocommerce": {
-                "category_selectors": [".product-category", ".products", ".woocommerce-loop-product"],
-                "product_selectors": [".product", ".products li", ".woocommerce-loop-product__title"],
-                "category_url_patterns": ["product-category", "shop", "products"],
-                "product_url_patterns": ["product", "item", "urun"]
-            },
-            "shopify": {
-                "category_selectors": [".collection-grid", ".collection-list", ".collection"],
-                "product_selectors": [".product-card", ".product-item", ".product-grid-item"],
-                "category_url_patterns": ["collections", "category", "collection"],
-                "product_url_patterns": ["products", "product", "item"]
-            },
-            "magento": {
-                "category_selectors": [".category-products", ".categories-list", ".catalog-category-view"],
-                "product_selectors": [".product-item", ".product-info", ".product-name"],
-                "category_url_patterns": ["category", "catalog", "categories"],
-                "product_url_patterns": ["product", "item", "detail"]
-            },
-            "opencart": {
-                "category_selectors": [".category-list", ".category-info", ".category"],
-                "product_selectors": [".product-layout", ".product-thumb", ".product-grid"],
-                "category_url_patterns": ["category", "categories", "cat"],
-                "product_url_patterns": ["product", "products", "item"]
-            },
-            "prestashop": {
-                "category_selectors": [".category", ".category-products", ".subcategories"],
-                "product_selectors": [".product-container", ".product-miniature", ".product"],
-                "category_url_patterns": ["category", "categories", "cat"],
-                "product_url_patterns": ["product", "products", "item"]
-            },
-            "generic": {
-                "category_selectors": [".category", ".categories", ".catalog", ".collection", ".department", ".products", ".items"],
-                "product_selectors": [".product", ".item", ".card", ".box", ".thumbnail", ".product-item"],
-                "category_url_patterns": ["category", "categories", "catalog", "collection", "department", "products", "items", "shop", "store"],
-                "product_url_patterns": ["product", "item", "detail", "goods", "urun"]
-            },
-            "chinese": {  # Çince siteler için özel desenler
-                "category_selectors": [".cate", ".category", ".cat-list", ".nav-item", ".menu-item"],
-                "product_selectors": [".product", ".item", ".goods", ".pro-item", ".product-item"],
-                "category_url_patterns": ["category", "cat", "list", "c=", "cid=", "id="],
-                "product_url_patterns": ["product", "item", "goods", "detail", "p=", "pid=", "id="]
-            }
-        }
+        self.site_patterns = SITE_PATTERNS
     
     def set_progress_callback(self, callback):
         """İlerleme durumunu bildirmek için callback fonksiyonu ayarlar."""
@@ -82,8 +57,32 @@ class SiteAnalyzer:
         self.domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
         return self.domain
     
-    def get_page(self, url, retry_count=0):
-        """Belirtilen URL'den sayfa içeriğini alır."""
+    def get_page(self, url):
+        """Belirtilen URL'den sayfa içeriğini metin olarak alır."""
+        page = self.get_page_bytes(url)
+        if not page:
+            return None
+        return decode_content(*page)
+    
+    def decode_response(self, response):
+        """Yanıtı (içerik, kodlama) çiftine çevirir."""
+        content = response.content
+        encoding = resolve_encoding(
+            content,
+            response.headers.get('Content-Type'),
+            urlparse(response.url or '').netloc,
+            detector=lambda: response.apparent_encoding
+        )
+        return content, encoding
+    
+    def parse_page(self, page):
+        """get_page_bytes sonucunu yeniden kodlama yapmadan ayrıştırır."""
+        content, encoding = page
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+    
+    def get_page_bytes(self, url, retry_count=0):
+        """Belirtilen URL'den ham sayfa içeriğini ve kodlamasını alır."""
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -94,7 +93,7 @@ class SiteAnalyzer:
             response = requests.get(url, headers=headers, verify=self.verify_ssl, timeout=15)
             
             if response.status_code == 200:
-                return response.text
+                return self.decode_response(response)
             elif response.status_code == 403 and retry_count < self.max_retries:
                 # 403 Forbidden hatası - farklı bir User-Agent ile yeniden dene
                 time.sleep(2)  # Biraz bekle
@@ -106,7 +105,7 @@ class SiteAnalyzer:
             print(f"İstek hatası ({url}): {e}")
             if retry_count < self.max_retries:
                 time.sleep(2)  # Biraz bekle
-                return self.get_page(url, retry_count + 1)
+                return self.get_page_bytes(url, retry_count + 1)
             return None
     
     def get_page_with_different_agent(self, url, retry_count):
@@ -128,7 +127,7 @@ class SiteAnalyzer:
             response = requests.get(url, headers=headers, verify=self.verify_ssl, timeout=15)
             
             if response.status_code == 200:
-                return response.text
+                return self.decode_response(response)
             else:
                 print(f"Farklı User-Agent ile deneme başarısız: {response.status_code}")
                 return None
@@ -136,63 +135,24 @@ class SiteAnalyzer:
             print(f"Farklı User-Agent ile istek hatası: {e}")
             return None
     
-    def detect_site_type(self, html, url):
-        """Sitenin türünü tespit eder."""
-        if not html:
-            return "generic"
-            
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # WooCommerce kontrolü
-        if soup.select('.woocommerce') or 'woocommerce' in html.lower():
-            return "woocommerce"
-            
-        # Shopify kontrolü
-        if 'shopify' in html.lower() or soup.select('[data-shopify]'):
-            return "shopify"
-            
-        # Magento kontrolü
-        if 'magento' in html.lower() or soup.select('[data-mage-init]'):
-            return "magento"
-            
-        # OpenCart kontrolü
-        if 'opencart' in html.lower() or soup.find('footer', text=re.compile('OpenCart')):
-            return "opencart"
-            
-        # PrestaShop kontrolü
-        if 'prestashop' in html.lower() or soup.find('meta', attrs={'name': 'generator', 'content': re.compile('PrestaShop')}):
-            return "prestashop"
-            
-        # Çince site kontrolü
-        chinese_chars = re.findall(r'[\u4e00-\u9fff]+', html)
-        if chinese_chars or '.cn' in url:
-            return "chinese"
-            
-        return "generic"
+    def detect_site_type(self, content, url, encoding=None):
+        """Sitenin türünü sayfa baytları üzerinde tek geçişte tespit eder."""
+        return fingerprint_site(content, url, encoding)
+    
+    def get_url_classifier(self):
+        """Geçerli domain ve site türü için derlenmiş URL sınıflandırıcısını döndürür."""
+        key = (self.domain, self.site_type)
+        classifier = self._classifier
+        if classifier is None or self._classifier_key != key:
+            patterns = self.site_patterns.get(self.site_type, self.site_patterns["generic"])
+            classifier = UrlClassifier(self.domain, patterns, chinese=self.site_type == "chinese")
+            self._classifier = classifier
+            self._classifier_key = key
+        return classifier
     
     def is_category_url(self, url):
         """URL'nin bir kategori sayfası olup olmadığını kontrol eder."""
-        url_lower = url.lower()
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
-        
-        # Site türüne göre kategori URL desenlerini kontrol et
-        patterns = self.site_patterns.get(self.site_type, self.site_patterns["generic"])["category_url_patterns"]
-        
-        # URL'de kategori anahtar kelimeleri var mı kontrol et
-        if any(pattern in url_lower for pattern in patterns):
-            return True
-            
-        # URL parametrelerinde kategori belirten bir şey var mı kontrol et
-        if 'category' in query_params or 'cat' in query_params or 'c' in query_params:
-            return True
-            
-        # Çince siteler için özel kontrol
-        if self.site_type == "chinese":
-            if 'c=' in url_lower or 'cid=' in url_lower or 'category_id=' in url_lower:
-                return True
-        
-        return False
+        return self.get_url_classifier().is_category(url)
     
     def extract_category_name(self, soup, url):
         """Sayfa içeriğinden kategori adını çıkarır."""
@@ -237,31 +197,30 @@ class SiteAnalyzer:
             if elements:
                 return len(elements)
         
-        # Ürün linklerini kontrol et
-        product_url_patterns = self.site_patterns.get(self.site_type, self.site_patterns["generic"])["product_url_patterns"]
-        product_links = []
+        # Ürün linklerini ve resim içeren linkleri tek geçişte say
+        classifier = self.get_url_classifier()
+        product_links = 0
+        img_links = 0
         
         for a in soup.find_all('a', href=True):
-            href = a['href'].lower()
-            if any(pattern in href for pattern in product_url_patterns):
-                product_links.append(a)
+            if classifier.is_product_href(a['href']):
+                product_links += 1
+            elif not product_links and a.find('img'):
+                img_links += 1
         
         if product_links:
-            return len(product_links)
+            return product_links
         
         # Resim içeren linkler de ürün olabilir
-        img_links = [a for a in soup.find_all('a', href=True) if a.find('img')]
-        if img_links:
-            return len(img_links)
-        
-        return 0
+        return img_links
     
     def find_subcategories(self, soup, base_url):
-        """Sayfadaki alt kategori linklerini bulur."""
+        """Sayfadaki alt kategori linklerini bulur (tekrarsız, sayfa sırasıyla)."""
+        classifier = self.get_url_classifier()
         subcategories = []
-        links = soup.find_all('a', href=True)
+        seen = {base_url}
         
-        for link in links:
+        for link in soup.find_all('a', href=True):
             href = link['href']
             
             # Göreceli URL'leri mutlak URL'lere dönüştür
@@ -269,96 +228,227 @@ class SiteAnalyzer:
                 href = urljoin(base_url, href)
             elif not (href.startswith('http://') or href.startswith('https://')):
                 href = urljoin(self.domain, href)
-                
-            full_url = href
             
-            # Sadece aynı domain'deki linkleri kontrol et
-            if urlparse(full_url).netloc != urlparse(self.domain).netloc or full_url == base_url:
+            if href in seen:
                 continue
-                
-            # Kategori olabilecek linkleri filtrele
-            if self.is_category_url(full_url) and full_url not in self.visited_urls:
-                subcategories.append(full_url)
+            seen.add(href)
+            
+            # Sadece aynı domain'deki kategori olabilecek linkleri al
+            if not classifier.is_same_site(href) or href in self.visited_urls:
+                continue
+            if classifier.is_category(href):
+                subcategories.append(href)
         
         return subcategories
     
-    def analyze_site(self, start_url, max_depth=2):
-        """Web sitesini analiz eder ve kategori yapısını çıkarır."""
+    def analyze_page(self, url, find_subs=True, page=None, known_hash=None):
+        """Tek bir sayfayı indirir ve kategori bilgilerini çıkarır.
+        
+        İş parçacıklarında çalışır; yalnızca sonuç sözlüğü döndürür, paylaşılan
+        durumu değiştirmez. İçerik özeti `known_hash` ile aynıysa sayfa
+        ayrıştırılmaz ve sonuçta 'unchanged' True olur.
+        """
+        if page is None:
+            page = self.fetch_with_host_limit(url)
+        if not page:
+            return None
+        
+        page_hash = content_hash(page[0])
+        if known_hash and page_hash == known_hash:
+            return {'content_hash': page_hash, 'unchanged': True}
+            
+        soup = self.parse_page(page)
+        
+        return {
+            'name': self.extract_category_name(soup, url),
+            'product_count': self.count_products(soup),
+            'subcategories': self.find_subcategories(soup, url) if find_subs else [],
+            'content_hash': page_hash,
+            'unchanged': False
+        }
+    
+    def fetch_with_host_limit(self, url):
+        """Host başına eşzamanlı istek sınırına uyarak sayfayı indirir."""
+        host = urlparse(url).netloc
+        with self._host_limits_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = limit
+        
+        with limit:
+            # İptal edildiyse sıradaki istekler gönderilmez
+            if is_cancelled(self.cancel_token):
+                return None
+            page = self.get_page_bytes(url)
+            # Siteyi çok hızlı taramaktan kaçınmak için yuvayı bekleme süresince tut
+            wait_or_cancel(self.cancel_token, self.request_delay)
+        return page
+    
+    def analyze_site(self, start_url, max_depth=2, max_urls=None, use_cache=True, refresh=False, cancel_token=None):
+        """Web sitesini analiz eder ve kategori yapısını çıkarır.
+        
+        `use_cache` açıksa süresi dolmamış kayıtlı analiz doğrudan yüklenir.
+        `refresh` ile kayıtlı kategoriler yeniden indirilir ve yalnızca içerik
+        özeti değişen sayfalar yeniden ayrıştırılır. `cancel_token` iptal
+        edilirse o ana kadar bulunan kategoriler döndürülür.
+        """
+        self.cancel_token = cancel_token
         self.extract_domain(start_url)
         self.visited_urls = set()
         self.categories = {}
+        self.page_hashes = {}
+        self.depths = {}
+        netloc = urlparse(start_url).netloc
+        
+        if max_urls is None:
+            max_urls = self.max_urls
+        
+        if use_cache:
+            cached = self.cache.load(netloc, include_stale=refresh)
+            if cached and not refresh:
+                self.load_cached_analysis(cached)
+                self.update_progress(f"Site analizi önbellekten yüklendi. {len(self.categories)} kategori.", 1, 1)
+                return self.categories
+            if cached:
+                return self.refresh_site(cached, max_depth, max_urls)
         
         print(f"Site analizi başlatılıyor: {start_url}")
         print(f"Domain: {self.domain}")
         
         # İlk sayfayı al ve site türünü tespit et
-        html = self.get_page(start_url)
-        if not html:
+        page = self.get_page_bytes(start_url)
+        if not page:
             self.update_progress("Site analizi başarısız oldu: Sayfa yüklenemedi.", 0, 0)
             return {}
             
-        self.site_type = self.detect_site_type(html, start_url)
+        self.site_type = self.detect_site_type(page[0], start_url, page[1])
         print(f"Algılanan site türü: {self.site_type}")
         
-        urls_to_visit = [(start_url, 0)]  # (url, depth)
-        total_urls = 1
-        processed_urls = 0
+        self.update_progress(f"Site analizi başlatılıyor: {start_url} (Tür: {self.site_type})", 0, 1)
         
-        self.update_progress(f"Site analizi başlatılıyor: {start_url} (Tür: {self.site_type})", 0, total_urls)
+        # Başlangıç sayfası yeniden indirilmez
+        self.visited_urls.add(start_url)
+        self.crawl_levels([(start_url, 0)], max_depth, max_urls, prefetched={start_url: page})
         
-        max_urls = 50  # Maksimum işlenecek URL sayısı
+        return self.finish_analysis(netloc)
+    
+    def crawl_levels(self, level, max_depth, max_urls, prefetched=None, known_hashes=None):
+        """Seviye seviye genişlik öncelikli tarama yapar.
+        
+        `level` (url, derinlik) çiftlerinden oluşur; aynı seviyedeki tüm URL'ler
+        birlikte işlenir. İşlenen URL sayısını döndürür.
+        """
+        prefetched = prefetched or {}
+        known_hashes = known_hashes or {}
+        total_urls = min(len(level), max_urls)
+        processed_urls = 0
         
-        while urls_to_visit and processed_urls < max_urls:
-            current_url, depth = urls_to_visit.pop(0)
-            
-            if current_url in self.visited_urls:
-                continue
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level and processed_urls < max_urls and not is_cancelled(self.cancel_token):
+                level = level[:max_urls - processed_urls]
+                futures = [
+                    executor.submit(
+                        self.analyze_page, url, depth < max_depth,
+                        prefetched.pop(url, None), known_hashes.get(url)
+                    )
+                    for url, depth in level
+                ]
                 
-            print(f"Sayfa analiz ediliyor ({processed_urls+1}/{max_urls}): {current_url}")
-            self.update_progress(f"Sayfa analiz ediliyor: {current_url}", processed_urls, total_urls)
-            self.visited_urls.add(current_url)
-            processed_urls += 1
-            
-            html = self.get_page(current_url)
-            if not html:
-                continue
+                next_level = []
+                queued = set()
                 
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Kategori bilgilerini çıkar
-            category_name = self.extract_category_name(soup, current_url)
-            product_count = self.count_products(soup)
-            
-            print(f"Kategori: {category_name}, Ürün sayısı: {product_count}")
-            
-            # Kategori bilgilerini kaydet
-            self.categories[current_url] = {
-                'name': category_name,
-                'product_count': product_count,
-                'subcategories': []
-            }
-            
-            # Derinlik sınırına ulaşmadıysak alt kategorileri bul
-            if depth < max_depth:
-                subcategories = self.find_subcategories(soup, current_url)
-                print(f"Alt kategoriler bulundu: {len(subcategories)}")
+                # Sonuçları gönderim sırasıyla birleştir (deterministik çıktı)
+                for (current_url, depth), future in zip(level, futures):
+                    if is_cancelled(self.cancel_token):
+                        # Henüz başlamamış işler iptal edilir, çalışanlar beklenmez
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    result = future.result()
+                    processed_urls += 1
+                    self.update_progress(f"Analiz ediliyor... {processed_urls}/{total_urls}", processed_urls, total_urls)
+                    
+                    if not result:
+                        continue
+                    
+                    self.page_hashes[current_url] = result['content_hash']
+                    self.depths[current_url] = depth
+                    
+                    if result['unchanged']:
+                        continue
+                    
+                    print(f"Kategori: {result['name']}, Ürün sayısı: {result['product_count']}")
+                    
+                    # Kategori bilgilerini kaydet
+                    self.categories[current_url] = {
+                        'name': result['name'],
+                        'product_count': result['product_count'],
+                        'subcategories': []
+                    }
+                    
+                    for subcat_url in result['subcategories']:
+                        if subcat_url not in self.visited_urls and subcat_url not in queued:
+                            queued.add(subcat_url)
+                            next_level.append((subcat_url, depth + 1))
+                            self.categories[current_url]['subcategories'].append(subcat_url)
+                        elif subcat_url in self.categories:
+                            # Önceki analizden bilinen alt kategori bağlantısını koru
+                            self.categories[current_url]['subcategories'].append(subcat_url)
                 
-                for subcat_url in subcategories:
-                    if subcat_url not in self.visited_urls and subcat_url not in [u for u, _ in urls_to_visit]:
-                        urls_to_visit.append((subcat_url, depth + 1))
-                        self.categories[current_url]['subcategories'].append(subcat_url)
+                # Sonraki seviyeyi gönderilmeden önce ziyaret edildi olarak işaretle
+                self.visited_urls.update(url for url, _ in next_level)
+                level = next_level
                 
                 # Toplam URL sayısını güncelle
-                total_urls = min(len(urls_to_visit) + processed_urls, max_urls)
-                self.update_progress(f"Analiz ediliyor... {processed_urls}/{total_urls}", processed_urls, total_urls)
-            
-            time.sleep(self.request_delay)
+                total_urls = min(len(level) + processed_urls, max_urls)
         
+        return processed_urls
+    
+    def refresh_site(self, cached, max_depth, max_urls):
+        """Kayıtlı analizi yeniler; yalnızca içeriği değişen kategorileri yeniden ayrıştırır."""
+        self.load_cached_analysis(cached)
+        netloc = urlparse(self.domain).netloc
+        known_hashes = cached.get("page_hashes", {})
+        depths = cached.get("depths", {})
+        
+        level = [(url, depths.get(url, 0)) for url in self.categories]
+        self.visited_urls.update(url for url, _ in level)
+        self.update_progress(f"Site analizi yenileniyor: {len(level)} kategori kontrol ediliyor", 0, len(level))
+        
+        # Kayıtlı kategorileri tek seviye olarak işle; yeni bulunan alt kategoriler
+        # crawl_levels tarafından sonraki seviyelerde taranır
+        self.crawl_levels(level, max_depth, max(max_urls, len(level)), known_hashes=known_hashes)
+        
+        # İndirilemeyen kategoriler korunur; bir sonraki yenilemede yeniden denenir
+        for url in self.categories:
+            if url not in self.page_hashes and url in known_hashes:
+                self.page_hashes[url] = known_hashes[url]
+                self.depths[url] = depths.get(url, 0)
+        
+        return self.finish_analysis(netloc)
+    
+    def load_cached_analysis(self, cached):
+        """Kayıtlı analizi nesne durumuna yükler."""
+        self.site_type = cached.get("site_type", "generic")
+        self.categories = cached.get("categories", {})
+        remember_site_type(urlparse(self.domain).netloc, self.site_type)
+    
+    def finish_analysis(self, netloc):
+        """Analizi özetler ve önbelleğe kaydeder."""
         print(f"Site analizi tamamlandı. {len(self.categories)} kategori bulundu.")
         for url, info in self.categories.items():
             print(f"Kategori: {info['name']}, Ürün sayısı: {info['product_count']}, Alt kategori sayısı: {len(info['subcategories'])}")
+        
+        if is_cancelled(self.cancel_token):
+            # Yarım analiz önbelleğe yazılmaz; bir sonraki analiz tam yapılır
+            self.update_progress(f"Site analizi iptal edildi. {len(self.categories)} kategori bulundu.", 1, 1)
+            return self.categories
+        
+        if self.categories:
+            self.cache.save(netloc, self.site_type, self.categories, self.page_hashes, self.depths)
             
-        self.update_progress(f"Site analizi tamamlandı. {len(self.categories)} kategori bulundu.", total_urls, total_urls)
+        self.update_progress(f"Site analizi tamamlandı. {len(self.categories)} kategori bulundu.", 1, 1)
         return self.categories
     
     def get_category_tree(self):
@@ -0,0 +1,150 @@
+import re
+import threading
+from urllib.parse import urlparse
+
+# Öncelik sırasına göre platformlar (zayıf eşleşmelerde ilk bulunan kazanır)
+PLATFORMS = ("woocommerce", "shopify", "magento", "opencart", "prestashop")
+
+# Tek başına platformu kesinleştiren imzalar; bulunduğunda tarama erken biter
+STRONG_SIGNATURES = {
+    "woocommerce": [rb"/wp-content/plugins/woocommerce/", rb"woocommerce-no-js", rb"wc-add-to-cart"],
+    "shopify": [rb"cdn\.shopify\.com", rb"shopify\.theme", rb"\.myshopify\.com"],
+    "magento": [rb"data-mage-init", rb"mage/cookies", rb"magento_[a-z]+/"],
+    "opencart": [rb"catalog/view/theme/", rb"index\.php\?route=(?:product|common)/"],
+    "prestashop": [rb"var prestashop\s*=", rb"/modules/ps_[a-z_]+/"],
+}
+
+# <meta name="generator"> içeriği
+_GENERATOR = rb"<meta[^>]{0,64}?name=[\"']generator[\"'][^>]{0,64}?content=[\"'](?P<generator>[^\"']{1,80})"
+
+# UTF-8 kodlanmış CJK birleşik ideogramları (U+4E00-U+9FFF civarı)
+_CJK = rb"(?:\xe4[\xb8-\xbf]|[\xe5-\xe9][\x80-\xbf])[\x80-\xbf]"
+
+# Bu kodlamalarla gelen sayfalar doğrudan Çince kabul edilir
+CHINESE_ENCODINGS = ("gb18030", "gb2312", "gbk", "big5", "big5hkscs", "hz", "cp936", "cp950")
+
+# Japonca/Korece kodlamalar; bu sayfalarda Han karakterleri Çince sayılmaz
+OTHER_CJK_ENCODINGS = ("euc_jp", "shift_jis", "cp932", "iso2022_jp", "euc_kr", "cp949", "iso2022_kr")
+
+# UTF-8 kodlanmış kana (Japonca) ve Hangul (Korece) karakterleri
+_KANA_HANGUL = rb"\xe3[\x81-\x83][\x80-\xbf]|(?:\xea[\xb0-\xbf]|[\xeb\xec][\x80-\xbf]|\xed[\x80-\x9e])[\x80-\xbf]"
+
+CHUNK_SIZE = 64 * 1024
+# Parça sınırına denk gelen imzaları kaçırmamak için örtüşme payı
+CHUNK_OVERLAP = 256
+
+
+def _build_pattern(include_cjk, include_kana):
+    parts = [_GENERATOR]
+    for platform in PLATFORMS:
+        parts.append(b"(?P<s_%s>%s)" % (platform.encode(), b"|".join(STRONG_SIGNATURES[platform])))
+    for platform in PLATFORMS:
+        parts.append(b"(?P<w_%s>%s)" % (platform.encode(), platform.encode()))
+    if include_cjk:
+        parts.append(b"(?P<cjk>" + _CJK + b")")
+    if include_kana:
+        parts.append(b"(?P<kana>" + _KANA_HANGUL + b")")
+    return re.compile(b"|".join(parts), re.I)
+
+
+_PATTERN_WITH_CJK = _build_pattern(True, True)
+_PATTERN_WITH_KANA = _build_pattern(False, True)
+_PATTERN = _build_pattern(False, False)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _platform_from_generator(generator):
+    generator = generator.lower()
+    for platform in PLATFORMS:
+        if platform.encode() in generator:
+            return platform
+    return None
+
+
+def scan_signatures(content, encoding=None):
+    """İçeriği tek geçişte tarar ve (kesin platform, zayıf platformlar, çince) döndürür.
+
+    Han karakterleri Japonca ve Korece sayfalarda da bulunur; aynı geçişte
+    kana/Hangul görülürse sayfa Çince sayılmaz.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8", errors="ignore")
+
+    weak = set()
+    encoding = (encoding or "").lower().replace("-", "_")
+    cjk = encoding in CHINESE_ENCODINGS
+    # Han karakterleri yalnızca UTF-8 gibi kodlamalarda aranır; Japonca/Korece kodlamalar Çince değildir
+    pattern = _PATTERN if cjk or encoding in OTHER_CJK_ENCODINGS else _PATTERN_WITH_CJK
+
+    for start in range(0, len(content), CHUNK_SIZE):
+        chunk = content[max(0, start - CHUNK_OVERLAP):start + CHUNK_SIZE]
+        match = pattern.search(chunk)
+        while match:
+            group = match.lastgroup
+            if group == "generator":
+                platform = _platform_from_generator(match.group("generator"))
+                if platform:
+                    return platform, weak, cjk
+            elif group.startswith("s_"):
+                return group[2:], weak, cjk
+            elif group == "cjk":
+                # Han görüldükten sonra yalnızca platform imzaları ve kana/Hangul aranır
+                cjk = True
+                pattern = _PATTERN_WITH_KANA
+            elif group == "kana":
+                # Kana/Hangul varsa sayfa Çince değildir; karakter taraması biter
+                cjk = False
+                pattern = _PATTERN
+            else:
+                weak.add(group[2:])
+                if group == "w_" + PLATFORMS[0]:
+                    # En öncelikli platform bulundu, devam etmeye gerek yok
+                    return PLATFORMS[0], weak, cjk
+            match = pattern.search(chunk, match.end())
+
+    return None, weak, cjk
+
+
+def fingerprint_site(content, url, encoding=None, use_cache=True):
+    """Sayfa baytlarından site türünü tespit eder; sonucu domain başına önbelleğe alır."""
+    parsed = urlparse(url)
+    domain = parsed.netloc
+    if use_cache:
+        cached = get_cached_site_type(domain)
+        if cached:
+            return cached
+
+    if not content:
+        return "generic"
+
+    platform, weak, cjk = scan_signatures(content, encoding)
+    if not platform:
+        platform = next((p for p in PLATFORMS if p in weak), None)
+    if not platform:
+        # Port içeren adreslerde de doğru sonuç için netloc yerine hostname kullanılır
+        hostname = parsed.hostname or ""
+        platform = "chinese" if cjk or hostname.endswith(".cn") else "generic"
+
+    remember_site_type(domain, platform)
+    return platform
+
+
+def get_cached_site_type(domain):
+    """Domain için önbellekteki site türünü döndürür."""
+    with _cache_lock:
+        return _cache.get(domain)
+
+
+def remember_site_type(domain, site_type):
+    """Domain için site türünü önbelleğe alır."""
+    if domain and site_type:
+        with _cache_lock:
+            _cache[domain] = site_type
+
+
+def clear_cache():
+    """Site türü önbelleğini temizler."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,100 @@
+import re
+
+_NETLOC_RE = re.compile(r'^[a-z][a-z0-9+.-]*://([^/?#]*)', re.I)
+
+# Şema ve host kısmı (protokolden bağımsız "//host" dahil)
+_ORIGIN_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:)?//[^/?#]*', re.I)
+
+# Kategori belirten sorgu parametreleri (?category=, ?cat=, ?c=)
+_CATEGORY_QUERY_RE = re.compile(r'[?&](?:category|cat|c)=[^&#]')
+
+# Çince siteler için ek kategori belirteçleri
+CHINESE_CATEGORY_TOKENS = ['c=', 'cid=', 'category_id=']
+
+# Alt yolları çoğu platformda ürün sayfası olan liste kökleri; yalnızca son yol parçasıyken kategori sayılır
+LISTING_ROOT_TOKENS = ('shop', 'store', 'products', 'items')
+
+
+def url_netloc(url):
+    """Mutlak URL'nin netloc kısmını urlparse kullanmadan döndürür."""
+    match = _NETLOC_RE.match(url)
+    return match.group(1) if match else ''
+
+
+def url_path(url):
+    """URL'nin yol, sorgu ve parça kısmını döndürür; host adı desenlerle eşleşmesin diye atılır."""
+    return _ORIGIN_RE.sub('', url, count=1)
+
+
+def compile_tokens(tokens):
+    """Alt dizi listesini tek bir büyük/küçük harf duyarsız regex'e derler."""
+    tokens = sorted(set(tokens), key=len, reverse=True)
+    if not tokens:
+        return None
+    return re.compile('|'.join(re.escape(token) for token in tokens), re.I)
+
+
+def compile_segments(tokens, listing_roots=()):
+    """Belirteçleri alt dizi yerine tam yol parçası ya da sorgu parametresi adı olarak eşleyen regex'e derler.
+
+    "cat" gibi belirteçler "/catalog" ya da "/vacation" ile eşleşmez; "id=" gibi
+    belirteçler yalnızca sorgu parametresi adı olarak aranır. `listing_roots`
+    içindeki belirteçler yalnızca son yol parçasıyken eşleşir.
+    """
+    parts = []
+    for token in sorted(set(tokens), key=len, reverse=True):
+        if token.endswith('='):
+            parts.append(r'[?&]' + re.escape(token))
+        elif token in listing_roots:
+            parts.append(r'/' + re.escape(token) + r'(?:\.[a-z0-9]+)?/?(?:page/\d+/?)?(?=[?#]|$)')
+        else:
+            parts.append(r'/' + re.escape(token) + r'(?:\.[a-z0-9]+)?(?=[/?#]|$)')
+    if not parts:
+        return None
+    return re.compile('|'.join(parts), re.I)
+
+
+class UrlClassifier:
+    """Site türüne ait URL desenlerini tek regex'e derleyerek URL'leri sınıflandırır."""
+
+    def __init__(self, domain, patterns, chinese=False):
+        self.netloc = url_netloc(domain or '')
+        category_tokens = list(patterns["category_url_patterns"])
+        if chinese:
+            category_tokens += CHINESE_CATEGORY_TOKENS
+        self._category_re = compile_tokens(category_tokens)
+        self._product_re = compile_tokens(patterns["product_url_patterns"])
+        self._category_segment_re = compile_segments(category_tokens, LISTING_ROOT_TOKENS)
+        self._product_segment_re = compile_segments(patterns["product_url_patterns"])
+
+    def is_category(self, url):
+        """URL'nin bir kategori sayfası olup olmadığını kontrol eder.
+        
+        Yalnızca yol ve sorgu incelenir; "shop.example.com" gibi host adları
+        her bağlantıyı kategori saydırmaz.
+        """
+        path = url_path(url)
+        if self._category_re and self._category_re.search(path):
+            return True
+        return bool(_CATEGORY_QUERY_RE.search(path))
+
+    def is_category_link(self, url):
+        """Bağlantının taranacak bir kategori sayfası olup olmadığını yol parçalarına göre kontrol eder.
+        
+        Ürün desenleriyle eşleşen bağlantılar (ör. "/collections/x/products/y")
+        liste sayfası olarak kuyruğa alınmaz.
+        """
+        path = url_path(url)
+        if self._product_segment_re and self._product_segment_re.search(path):
+            return False
+        if self._category_segment_re and self._category_segment_re.search(path):
+            return True
+        return bool(_CATEGORY_QUERY_RE.search(path))
+
+    def is_product_href(self, href):
+        """Bağlantının bir ürün sayfasına işaret edip etmediğini kontrol eder."""
+        return bool(self._product_re and self._product_re.search(url_path(href)))
+
+    def is_same_site(self, url):
+        """Mutlak URL'nin analiz edilen domain'e ait olup olmadığını kontrol eder."""
+        return url_netloc(url) == self.netloc
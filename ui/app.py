@@ -1,19 +1,22 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox
 import threading
-import os
-import json
-from PIL import Image, ImageTk
-from io import BytesIO
-import requests
-import webbrowser
+import queue
 
 from scrapers.product_scraper import ProductScraper
 from scrapers.site_analyzer import SiteAnalyzer
-from scrapers.selector_builder import SelectorBuilder
-from uploaders.wordpress_uploader import WordPressUploader
+from uploaders.wordpress_uploader import create_uploader
+from uploaders.upload_pipeline import UploadPipeline
+from uploaders.delta_sync import DeltaSync
+from uploaders.upload_journal import UploadJournal
+from uploaders.category_mapper import CategoryMapper
 from ui.product_preview import ProductPreviewWindow
 from ui.utils import run_with_progress, load_image_from_url
+from ui.thumbnail_cache import get_thumbnail_cache
+from ui.virtual_table import VirtualProductTable
+from ui.product_index import ProductSearchIndex, parse_price
+from ui.progress_bus import ProgressBus, format_eta
+from cancellation import CancellationToken
 
 class ProductScraperApp:
     def __init__(self, root):
@@ -24,12 +27,20 @@ class ProductScraperApp:
         # Ürün kazıyıcı ve yükleyici nesneleri
         self.scraper = ProductScraper()
         self.site_analyzer = SiteAnalyzer()
-        self.selector_builder = SelectorBuilder()
+        self.selector_builder = None  # pywebview'i yüklediği için ilk kullanımda oluşturulur
         self.uploader = None
         
         # Ürün listesi
         self.products = []
         
+        # Arama indeksi; büyük listelerde arka planda oluşturulur
+        self.search_index = ProductSearchIndex()
+        self.index_generation = 0
+        self.index_building = False
+        self.pending_index_updates = []
+        self.index_results = queue.SimpleQueue()
+        self.filter_after_id = None
+        
         # SSL doğrulama ayarı
         self.verify_ssl = tk.BooleanVar(value=True)
         
@@ -39,10 +50,22 @@ class ProductScraperApp:
         # Arayüz elemanlarını oluştur
         self.create_widgets()
         
+        # İş parçacıklarından gelen ilerleme olayları ana döngüde toplu işlenir
+        self.progress_bus = ProgressBus(self.root, self.show_progress)
+        self.progress_bus.start()
+        
         # İlerleme durumu için callback fonksiyonları ayarla
         self.scraper.set_progress_callback(self.update_progress)
         self.site_analyzer.set_progress_callback(self.update_progress)
-        self.selector_builder.set_progress_callback(self.update_progress)
+    
+    def get_selector_builder(self):
+        """Seçici oluşturucuyu ilk kullanımda oluşturur."""
+        if self.selector_builder is None:
+            from scrapers.selector_builder import SelectorBuilder
+            self.selector_builder = SelectorBuilder()
+            self.selector_builder.set_progress_callback(self.update_progress)
+            self.selector_builder.verify_ssl = self.verify_ssl.get()
+        return self.selector_builder
     
     def create_widgets(self):
         # Ana çerçeve
@@ -101,34 +124,33 @@ class ProductScraperApp:
         ttk.Button(list_toolbar, text="Yükle", command=self.load_products).pack(side=tk.LEFT, padx=2)
         ttk.Button(list_toolbar, text="İstatistikler", command=self.show_stats).pack(side=tk.LEFT, padx=2)
         
-        # Ürün listesi tablosu
-        table_frame = ttk.Frame(list_frame)
-        table_frame.pack(fill=tk.BOTH, expand=True)
+        # Arama ve fiyat filtresi
+        search_bar = ttk.Frame(list_frame)
+        search_bar.pack(fill=tk.X, pady=5)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.search_var = tk.StringVar()
+        self.min_price_var = tk.StringVar()
+        self.max_price_var = tk.StringVar()
         
-        # Treeview
-        columns = ("selected", "title", "price", "image")
-        self.product_table = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
-        self.product_table.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(search_bar, text="Ara:").pack(side=tk.LEFT, padx=2)
+        ttk.Entry(search_bar, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=2)
+        ttk.Label(search_bar, text="Fiyat:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(search_bar, textvariable=self.min_price_var, width=8).pack(side=tk.LEFT)
+        ttk.Label(search_bar, text="-").pack(side=tk.LEFT, padx=2)
+        ttk.Entry(search_bar, textvariable=self.max_price_var, width=8).pack(side=tk.LEFT)
+        ttk.Button(search_bar, text="Temizle", command=self.clear_filter).pack(side=tk.LEFT, padx=5)
+        self.filter_label = ttk.Label(search_bar, text="")
+        self.filter_label.pack(side=tk.LEFT, padx=5)
         
-        # Scrollbar bağlantısı
-        scrollbar.config(command=self.product_table.yview)
-        self.product_table.config(yscrollcommand=scrollbar.set)
+        for variable in (self.search_var, self.min_price_var, self.max_price_var):
+            variable.trace_add("write", self.schedule_filter)
         
-        # Sütun başlıkları
-        self.product_table.heading("selected", text="Seç")
-        self.product_table.heading("title", text="Başlık")
-        self.product_table.heading("price", text="Fiyat")
-        self.product_table.heading("image", text="Resim")
+        # Ürün listesi tablosu
+        table_frame = ttk.Frame(list_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Sütun genişlikleri
-        self.product_table.column("selected", width=50, anchor=tk.CENTER)
-        self.product_table.column("title", width=300)
-        self.product_table.column("price", width=100)
-        self.product_table.column("image", width=100, anchor=tk.CENTER)
+        # Yalnızca görünen satırları oluşturan sanal tablo
+        self.product_table = VirtualProductTable(table_frame)
         
         # Çift tıklama olayı
         self.product_table.bind("<Double-1>", self.on_item_double_click)
@@ -171,15 +193,32 @@ class ProductScraperApp:
         self.category_id_entry.insert(0, "9")  # Varsayılan kategori ID
         self.category_id_entry.grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
         
+        # Var olan ürünleri güncelleme (upsert) seçeneği
+        self.upsert_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(upload_frame, text="Var Olanları Güncelle", variable=self.upsert_var).grid(row=1, column=2, padx=5, pady=5, sticky=tk.W)
+        
+        # Yarıda kalan yüklemeyi günlükten devam ettirme seçeneği
+        self.resume_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(upload_frame, text="Kaldığı Yerden Devam Et", variable=self.resume_var).grid(row=1, column=3, padx=5, pady=5, sticky=tk.W)
+        
+        # Ürünleri site analizindeki kaynak kategorilerine atama seçeneği
+        self.source_categories_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(upload_frame, text="Kaynak Kategorilerini Kullan", variable=self.source_categories_var).grid(row=2, column=2, padx=5, pady=5, sticky=tk.W)
+        
         # Yükleme düğmesi
         self.upload_button = ttk.Button(upload_frame, text="Seçili Ürünleri Yükle", command=self.start_uploading)
-        self.upload_button.grid(row=1, column=2, padx=5, pady=5, sticky=tk.W)
+        self.upload_button.grid(row=1, column=4, padx=5, pady=5, sticky=tk.W)
+        
+        # Fark senkronizasyonu düğmesi
+        self.sync_button = ttk.Button(upload_frame, text="Farkları Senkronize Et", command=self.start_sync)
+        self.sync_button.grid(row=1, column=5, padx=5, pady=5, sticky=tk.W)
     
     def toggle_ssl_verification(self):
         """SSL doğrulama ayarını değiştirir."""
         self.scraper.verify_ssl = self.verify_ssl.get()
         self.site_analyzer.verify_ssl = self.verify_ssl.get()
-        self.selector_builder.verify_ssl = self.verify_ssl.get()
+        if self.selector_builder:
+            self.selector_builder.verify_ssl = self.verify_ssl.get()
     
     def start_scanning(self):
         """Ürün tarama işlemini başlatır."""
@@ -193,12 +232,14 @@ class ProductScraperApp:
         except ValueError:
             max_pages = 10
         
-        # Tarama işlemini başlat
+        # Tarama işlemini başlat; iptal edilirse o ana kadar bulunan ürünler gösterilir
+        cancel_token = CancellationToken()
         run_with_progress(
             self.root,
             self.scan_products,
-            args=(url, max_pages),
-            on_complete=lambda result: self.update_product_list(result)
+            args=(url, max_pages, cancel_token),
+            on_complete=lambda result: self.update_product_list(result),
+            cancel_token=cancel_token
         )
     
     def start_site_analysis(self):
@@ -209,11 +250,13 @@ class ProductScraperApp:
             return
         
         # Analiz işlemini başlat
+        cancel_token = CancellationToken()
         run_with_progress(
             self.root,
             self.analyze_site,
-            args=(url,),
-            on_complete=lambda result: self.show_category_tree()
+            args=(url, cancel_token),
+            on_complete=lambda result: self.show_category_tree(),
+            cancel_token=cancel_token
         )
     
     def start_selector_builder(self):
@@ -233,15 +276,15 @@ class ProductScraperApp:
     
     def build_selectors(self, url):
         """Seçici oluşturma işlemini gerçekleştirir."""
-        return self.selector_builder.load_page_preview(url)
+        return self.get_selector_builder().load_page_preview(url)
     
-    def scan_products(self, url, max_pages):
+    def scan_products(self, url, max_pages, cancel_token=None):
         """Ürün tarama işlemini gerçekleştirir."""
-        return self.scraper.scrape_products(url, max_pages)
+        return self.scraper.scrape_products(url, max_pages, cancel_token=cancel_token)
     
-    def analyze_site(self, url):
+    def analyze_site(self, url, cancel_token=None):
         """Site analiz işlemini gerçekleştirir."""
-        self.category_tree = self.site_analyzer.analyze_site(url)
+        self.category_tree = self.site_analyzer.analyze_site(url, cancel_token=cancel_token)
         return self.category_tree
     
     def show_category_tree(self):
@@ -314,17 +357,76 @@ class ProductScraperApp:
         """Ürün listesini günceller."""
         self.products = products
         
-        # Tabloyu temizle
-        for item in self.product_table.get_children():
-            self.product_table.delete(item)
+        # Yalnızca görünen satırlar oluşturulur
+        self.product_table.set_products(products)
+        self.build_search_index()
+    
+    def build_search_index(self):
+        """Arama indeksini arka planda oluşturur; hazır olunca etkin filtre uygulanır."""
+        self.index_generation += 1
+        self.index_building = True
+        self.pending_index_updates = []
+        generation = self.index_generation
+        products = list(self.products)
+        
+        def build():
+            index = ProductSearchIndex()
+            index.set_products(products)
+            self.index_results.put((generation, index))
+        
+        threading.Thread(target=build, daemon=True).start()
+        self.apply_filter()
+        self.root.after(100, self.check_search_index)
+    
+    def check_search_index(self):
+        """Oluşturulan indeksi ana iş parçacığında devreye alır."""
+        try:
+            generation, index = self.index_results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.check_search_index)
+            return
+        
+        # Daha yeni bir liste yüklendiyse eski indeks atılır
+        if generation != self.index_generation:
+            return
+        for position, product in self.pending_index_updates:
+            index.update(position, product)
+        self.pending_index_updates = []
+        self.search_index = index
+        self.index_building = False
+        self.apply_filter()
+    
+    def schedule_filter(self, *args):
+        """Yazma sırasında filtreyi kısa bir gecikmeyle uygular."""
+        if self.filter_after_id is not None:
+            self.root.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.root.after(150, self.apply_filter)
+    
+    def clear_filter(self):
+        """Arama ve fiyat filtresini temizler."""
+        self.search_var.set("")
+        self.min_price_var.set("")
+        self.max_price_var.set("")
+    
+    def apply_filter(self):
+        """Arama kutusu ve fiyat aralığına uyan ürünleri tabloda gösterir."""
+        self.filter_after_id = None
+        query = self.search_var.get()
+        min_price = parse_price(self.min_price_var.get())
+        max_price = parse_price(self.max_price_var.get())
+        
+        if not query.strip() and min_price is None and max_price is None:
+            self.product_table.set_filter(None)
+            self.filter_label.config(text="")
+            return
+        if self.index_building:
+            # İndeks hazır olduğunda filtre yeniden uygulanır
+            self.filter_label.config(text="İndeksleniyor...")
+            return
         
-        # Ürünleri tabloya ekle
-        for i, product in enumerate(products):
-            selected = "✓" if product.get("selected", False) else ""
-            title = product.get("title", "")
-            price = product.get("price", "")
-            
-            self.product_table.insert("", "end", values=(selected, title, price, "Resim"), iid=i)
+        positions = self.search_index.search(query, min_price, max_price)
+        self.product_table.set_filter(positions)
+        self.filter_label.config(text=f"{len(positions)} / {len(self.products)} ürün")
     
     def load_product_image(self, image_url, size=(50, 50)):
         """Ürün resmini yükler."""
@@ -336,31 +438,38 @@ class ProductScraperApp:
     
     def on_item_double_click(self, event):
         """Ürün tablosunda bir öğeye çift tıklandığında ürün önizleme penceresini açar."""
-        selection = self.product_table.selection()
-        if selection:
-            index = int(selection[0])
-            if 0 <= index < len(self.products):
-                self.show_product_preview(self.products[index], index)
+        key = self.product_table.selected_key()
+        product = self.product_table.product_for(key) if key else None
+        if product is not None:
+            self.show_product_preview(product, key)
     
-    def show_product_preview(self, product, index):
+    def show_product_preview(self, product, key):
         """Ürün önizleme penceresini gösterir."""
         def on_save(updated_product):
-            self.products[index] = updated_product
-            self.update_product_list(self.products)
+            # Yalnızca düzenlenen satır ve indeks girdisi güncellenir; etkin
+            # filtre, satır kullanıcının elinden kaymasın diye yeniden uygulanmaz
+            self.product_table.update_product(key, updated_product)
+            position = self.product_table.position_of(key)
+            if position is None:
+                return
+            if self.index_building:
+                self.pending_index_updates.append((position, updated_product))
+            else:
+                self.search_index.update(position, updated_product)
         
         ProductPreviewWindow(self.root, product, self.verify_ssl.get(), on_save)
     
     def select_all_products(self):
-        """Tüm ürünleri seçer."""
-        for i, product in enumerate(self.products):
+        """Tablodaki tüm ürünleri seçer; filtre etkinse yalnızca bulunan ürünler seçilir."""
+        for product in self.product_table.shown_products():
             product["selected"] = True
-            self.product_table.item(i, values=("✓", product.get("title", ""), product.get("price", ""), "Resim"))
+        self.product_table.refresh_visible()
     
     def deselect_all_products(self):
-        """Tüm ürünlerin seçimini kaldırır."""
-        for i, product in enumerate(self.products):
+        """Tablodaki tüm ürünlerin seçimini kaldırır."""
+        for product in self.product_table.shown_products():
             product["selected"] = False
-            self.product_table.item(i, values=("", product.get("title", ""), product.get("price", ""), "Resim"))
+        self.product_table.refresh_visible()
     
     def save_products(self):
         """Ürünleri JSON dosyasına kaydeder."""
@@ -382,6 +491,13 @@ class ProductScraperApp:
         """Tarama istatistiklerini gösterir."""
         stats_summary = self.scraper.get_stats_summary()
         
+        thumb_stats = get_thumbnail_cache().get_stats()
+        stats_summary += (
+            f"\n\nKüçük resim önbelleği: {thumb_stats['memory_hits']} bellek, "
+            f"{thumb_stats['disk_hits']} disk isabeti, {thumb_stats['misses']} indirme, "
+            f"{thumb_stats['memory_evictions'] + thumb_stats['disk_evictions']} çıkarma"
+        )
+        
         # İstatistik penceresini oluştur
         stats_window = tk.Toplevel(self.root)
         stats_window.title("Tarama İstatistikleri")
@@ -396,8 +512,11 @@ class ProductScraperApp:
         # Kapat düğmesi
         ttk.Button(stats_window, text="Kapat", command=stats_window.destroy).pack(pady=10)
     
-    def start_uploading(self):
-        """WordPress'e ürün yükleme işlemini başlatır."""
+    def prepare_upload(self):
+        """WordPress bilgilerini ve seçili ürünleri doğrular, yükleyiciyi hazırlar.
+        
+        (seçili ürünler, kategori ID'si) ya da eksik bilgi varsa None döndürür.
+        """
         # WordPress bilgilerini kontrol et
         wp_url = self.wp_url_entry.get().strip()
         username = self.wp_username_entry.get().strip()
@@ -405,14 +524,14 @@ class ProductScraperApp:
         
         if not wp_url or not username or not password:
             messagebox.showerror("Hata", "Lütfen WordPress bilgilerini eksiksiz girin.")
-            return
+            return None
         
         # Seçili ürünleri bul
         selected_items = [product for product in self.products if product.get("selected", False)]
         
         if not selected_items:
             messagebox.showerror("Hata", "Lütfen yüklenecek ürünleri seçin.")
-            return
+            return None
         
         # Kategori ID'yi al
         try:
@@ -420,40 +539,137 @@ class ProductScraperApp:
         except ValueError:
             category_id = 9  # Varsayılan kategori ID
         
-        # Yükleme işlemini başlat
-        self.uploader = WordPressUploader(wp_url, username, password)
+        self.uploader = create_uploader(wp_url, username, password)
         self.uploader.set_progress_callback(self.update_progress)
         
+        # Site analizi yapıldıysa ürünler kaynak kategorilerine atanır; diğerleri kategori ID'sine gider
+        if self.source_categories_var.get() and self.site_analyzer.categories:
+            self.uploader.category_mapper = CategoryMapper(self.uploader)
+        return selected_items, category_id
+    
+    def start_uploading(self):
+        """WordPress'e ürün yükleme işlemini başlatır."""
+        prepared = self.prepare_upload()
+        if not prepared:
+            return
+        selected_items, category_id = prepared
+        
+        # Yükleme işlemini başlat; iptal edilirse tamamlanan ürünler günlükte kalır
+        cancel_token = CancellationToken()
         run_with_progress(
             self.root,
             self.upload_products,
-            args=(selected_items, category_id),
-            on_complete=lambda result: messagebox.showinfo("Bilgi", f"{len(result)} ürün başarıyla yüklendi.")
+            args=(selected_items, category_id, self.upsert_var.get(), self.resume_var.get(), cancel_token),
+            on_complete=lambda result: messagebox.showinfo(
+                "Bilgi",
+                f"{len(result[0])} ürün başarıyla yüklendi."
+                + (f" {result[1]} ürün önceki çalıştırmada yüklendiği için atlandı." if result[1] else "")
+                + (" İşlem iptal edildi; kalan ürünler için 'Kaldığı Yerden Devam Et' kullanılabilir." if cancel_token.cancelled else "")
+            ),
+            cancel_token=cancel_token
         )
     
-    def upload_products(self, selected_items, category_id):
-        """Seçili ürünleri WordPress'e yükler."""
-        uploaded = []
+    def start_sync(self):
+        """Seçili ürünlerle mağaza arasındaki farkları hesaplar ve planı gösterir."""
+        prepared = self.prepare_upload()
+        if not prepared:
+            return
+        selected_items, category_id = prepared
+        
+        sync = DeltaSync(self.uploader, category_id)
+        run_with_progress(
+            self.root,
+            self.plan_sync,
+            args=(sync, selected_items),
+            on_complete=lambda plan: self.show_sync_plan(sync, plan)
+        )
+    
+    def plan_sync(self, sync, selected_items):
+        """Kategorileri eşledikten sonra senkronizasyon planını hesaplar."""
+        self.resolve_categories()
+        # Seçilmeyen ürünler kaynakta bulunmayan sayılmasın diye tüm kazınan ürünler verilir
+        return sync.plan(selected_items, catalog=self.products)
+    
+    def resolve_categories(self):
+        """Kaynak kategorilerini WooCommerce kategorilerine eşler (gerekirse oluşturur)."""
+        if self.uploader.category_mapper:
+            self.uploader.category_mapper.resolve(self.site_analyzer.categories)
+    
+    def show_sync_plan(self, sync, plan):
+        """Senkronizasyon planını (deneme çalıştırması) gösterir ve onay ister."""
+        plan_window = tk.Toplevel(self.root)
+        plan_window.title("Senkronizasyon Planı")
+        plan_window.geometry("700x500")
+        
+        text_widget = tk.Text(plan_window, wrap=tk.WORD, padx=10, pady=10)
+        text_widget.pack(fill=tk.BOTH, expand=True)
         
-        for i, product in enumerate(selected_items):
-            try:
-                self.update_progress(f"Ürün yükleniyor: {product.get('title', 'Ürün')} ({i+1}/{len(selected_items)})", i+1, len(selected_items))
-                result = self.uploader.upload_product(product, category_id)
-                if result:
-                    uploaded.append(result)
-            except Exception as e:
-                print(f"Ürün yüklenirken hata: {e}")
+        def render(*_):
+            text_widget.config(state=tk.NORMAL)
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert(tk.END, sync.report(plan, actions[vanished_var.get()]))
+            text_widget.config(state=tk.DISABLED)
         
-        return uploaded
+        button_frame = ttk.Frame(plan_window, padding="10")
+        button_frame.pack(fill=tk.X)
+        
+        # Kaynakta bulunmayan ürünler için işlem yalnızca açıkça seçilirse yapılır
+        actions = {"Dokunma": None, "Taslağa Al": "draft", "Çöpe Taşı": "delete"}
+        ttk.Label(button_frame, text="Kaynakta bulunmayanlar:").pack(side=tk.LEFT, padx=5)
+        vanished_var = tk.StringVar(value="Dokunma")
+        vanished_box = ttk.Combobox(button_frame, textvariable=vanished_var, values=list(actions), state="readonly", width=12)
+        vanished_box.pack(side=tk.LEFT, padx=5)
+        vanished_box.bind("<<ComboboxSelected>>", render)
+        
+        def apply_plan():
+            vanished_action = actions[vanished_var.get()]
+            plan_window.destroy()
+            run_with_progress(
+                self.root,
+                sync.apply,
+                args=(plan, vanished_action),
+                on_complete=lambda results: messagebox.showinfo(
+                    "Bilgi", f"{sum(1 for result in results if result['id'])}/{len(results)} işlem başarıyla uygulandı.")
+            )
+        
+        ttk.Button(button_frame, text="Uygula", command=apply_plan).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Kapat", command=plan_window.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        render()
+    
+    def upload_products(self, selected_items, category_id, upsert=False, resume=False, cancel_token=None):
+        """Seçili ürünleri indirme, medya ve ürün aşamalarından oluşan hatla yükler.
+        
+        Her işlem yükleme günlüğüne yazılır; `resume` açıksa günlükte
+        tamamlanmış görünen ürünler atlanır, başarısız olanlar yeniden denenir.
+        (bu çalıştırmada yüklenen ürün yanıtları, atlanan ürün sayısı) döndürür.
+        """
+        self.resolve_categories()
+        journal = UploadJournal(self.uploader.wp_url)
+        pipeline = UploadPipeline(self.uploader, category_id, upsert=upsert, journal=journal, resume=resume)
+        results = pipeline.run(selected_items, cancel_token)
+        
+        for result in results:
+            if result["error"]:
+                print(f"Ürün yüklenirken hata: {result['product'].get('title', 'Ürün')} - {result['error']}")
+        
+        # Günlükten atlanan ürünlerin yanıtı yoktur; ayrıca sayılırlar
+        uploaded = [result["response"] for result in results if result["response"] and not result["error"]]
+        return uploaded, pipeline.resumed
     
     def update_progress(self, message, current=0, total=0):
-        """İlerleme durumunu günceller."""
+        """İlerleme durumunu bildirir; herhangi bir iş parçacığından çağrılabilir."""
+        self.progress_bus.publish(message, current, total)
+    
+    def show_progress(self, message, current, total, rate, eta):
+        """İlerleme durumunu arayüzde gösterir (ana iş parçacığında çağrılır)."""
+        if rate:
+            message += f"  ({rate:.1f}/sn"
+            message += f", kalan ~{format_eta(eta)})" if eta is not None else ")"
         self.status_label.config(text=message)
         
         if total > 0:
             progress = (current / total) * 100
             self.progress_var.set(progress)
         else:
-            self.progress_var.set(0)
-            
-        self.root.update_idletasks()
\ No newline at end of file
+            self.progress_var.set(0)
\ No newline at end of file
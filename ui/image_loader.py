@@ -0,0 +1,97 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import DEFAULT_CONFIG
+from ui.thumbnail_cache import get_thumbnail_cache
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_image_executor():
+    """Resim yükleme için paylaşılan iş parçacığı havuzunu döndürür."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_CONFIG["image_loader_workers"], thread_name_prefix="image-loader")
+        return _executor
+
+
+class AsyncImageLoader:
+    """Resimleri Tk ana iş parçacığını bloklamadan yükler.
+
+    İndirme ve çözme işi havuzda yapılır; sonuçlar bir kuyruğa konur ve
+    `after()` ile ana iş parçacığında okunarak geri çağrılara iletilir.
+    Widget'a ait yükleyici kapatıldığında bekleyen işler iptal edilir.
+    """
+
+    def __init__(self, widget, poll_interval=50):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self.results = queue.Queue()
+        self.futures = {}  # istek numarası -> Future
+        self.callbacks = {}  # istek numarası -> geri çağrı
+        self.next_request = 0
+        self.after_id = None
+        self.closed = False
+
+    def load(self, url, size, verify_ssl, callback):
+        """Resmi arka planda yükler; `callback(pil_resmi veya None)` ana iş parçacığında çağrılır."""
+        if self.closed:
+            return None
+        self.next_request += 1
+        request_id = self.next_request
+        self.callbacks[request_id] = callback
+        future = get_image_executor().submit(get_thumbnail_cache().get, url, size, verify_ssl)
+        self.futures[request_id] = future
+        future.add_done_callback(lambda done, rid=request_id: self.results.put((rid, done)))
+        self.schedule_poll()
+        return request_id
+
+    def cancel(self, request_id):
+        """Tek bir bekleyen yüklemeyi iptal eder; sonucu gelse de geri çağrı yapılmaz."""
+        self.callbacks.pop(request_id, None)
+        future = self.futures.pop(request_id, None)
+        if future:
+            future.cancel()
+
+    def schedule_poll(self):
+        """Kuyruk okuma işini planlar (zaten planlıysa tekrar eklemez)."""
+        if self.after_id is None and not self.closed:
+            self.after_id = self.widget.after(self.poll_interval, self.poll)
+
+    def poll(self):
+        """Tamamlanan yüklemeleri ana iş parçacığında geri çağrılara iletir."""
+        self.after_id = None
+        if self.closed:
+            return
+        while True:
+            try:
+                request_id, future = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.futures.pop(request_id, None)
+            callback = self.callbacks.pop(request_id, None)
+            if callback is None or future.cancelled():
+                continue
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"Resim yüklenirken hata: {e}")
+                image = None
+            callback(image)
+        if self.futures:
+            self.schedule_poll()
+
+    def close(self):
+        """Bekleyen tüm yüklemeleri iptal eder ve okuma döngüsünü durdurur."""
+        self.closed = True
+        for request_id in list(self.futures):
+            self.cancel(request_id)
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
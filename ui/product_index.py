@@ -0,0 +1,171 @@
+import bisect
+import re
+from urllib.parse import urlparse
+
+_TOKEN_RE = re.compile(r'\w+')
+_PRICE_RE = re.compile(r'\d[\d.,]*')
+_THOUSANDS_RE = re.compile(r'^\d{1,3}([.,])\d{3}(\1\d{3})*$')
+# Türkçe karakterler aramada ASCII karşılıklarıyla eşleşir (ör. "canta" -> "çanta")
+_FOLD_TABLE = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+def tokenize(text):
+    """Metni küçük harfli, Türkçe karakterleri sadeleştirilmiş kelimelere böler."""
+    return _TOKEN_RE.findall((text or "").translate(_FOLD_TABLE).lower())
+
+
+def parse_price(value):
+    """Fiyat metnini ("1.299,90 TL", "$1,299.90" gibi) float'a çevirir; çözülemezse None döndürür."""
+    match = _PRICE_RE.search(str(value or ""))
+    if not match:
+        return None
+    number = match.group(0).rstrip(".,")
+    if "." in number and "," in number:
+        # Son görünen ayırıcı ondalık ayırıcıdır
+        decimal = "," if number.rfind(",") > number.rfind(".") else "."
+        number = number.replace("." if decimal == "," else ",", "").replace(decimal, ".")
+    elif _THOUSANDS_RE.match(number):
+        # "1.299" ya da "12,500" binlik ayırıcı olarak kabul edilir
+        number = number.replace(".", "").replace(",", "")
+    else:
+        number = number.replace(",", ".")
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+class ProductSearchIndex:
+    """Ürün listesi için bellek içi ters indeks.
+
+    Başlık, açıklama ve alan adındaki kelimeler ürünün listedeki konumuna
+    eşlenir; fiyatlar ise sıralı bir listede tutulur. Tek ürün düzenlemeleri
+    `update` ile yalnızca o ürünün girdilerini değiştirir. Arama, listedeki
+    sırayı koruyan konum listesi döndürür.
+    """
+
+    def __init__(self):
+        self.set_products([])
+
+    def set_products(self, products):
+        """İndeksi verilen ürün listesi için baştan oluşturur."""
+        self.postings = {}  # kelime -> sıralı ürün konumları
+        self.doc_tokens = []  # konum -> ürünün kelimeleri
+        self.prices = []  # konum -> fiyat (yoksa None)
+        self.price_order = []  # (fiyat, konum) sıralı
+        self.vocabulary = None  # önek araması için sıralı kelimeler; ilk aramada oluşturulur
+        self.bulk = True
+        for product in products:
+            self.add(product)
+        # Toplu yüklemede fiyatlar bir kez sıralanır
+        self.price_order.sort()
+        self.bulk = False
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def product_tokens(self, product):
+        """Ürünün indekslenecek kelimelerini döndürür."""
+        domain = urlparse(product.get("product_url") or "").netloc
+        text = " ".join((product.get("title") or "", product.get("description") or "", domain))
+        return frozenset(tokenize(text))
+
+    def add(self, product):
+        """Ürünü listenin sonuna ekler ve konumunu döndürür."""
+        position = len(self.doc_tokens)
+        self.doc_tokens.append(frozenset())
+        self.prices.append(None)
+        self.index(position, product)
+        return position
+
+    def update(self, position, product):
+        """Konumdaki ürünün kelimelerini ve fiyatını yenileriyle değiştirir."""
+        self.unindex(position)
+        self.index(position, product)
+
+    def index(self, position, product):
+        tokens = self.product_tokens(product)
+        self.doc_tokens[position] = tokens
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                self.postings[token] = posting = []
+                if self.vocabulary is not None:
+                    bisect.insort(self.vocabulary, token)
+            if self.bulk:
+                # Toplu yüklemede konumlar artan sırada gelir
+                posting.append(position)
+            else:
+                bisect.insort(posting, position)
+
+        price = parse_price(product.get("price"))
+        self.prices[position] = price
+        if price is not None:
+            if self.bulk:
+                self.price_order.append((price, position))
+            else:
+                bisect.insort(self.price_order, (price, position))
+
+    def unindex(self, position):
+        for token in self.doc_tokens[position]:
+            posting = self.postings[token]
+            del posting[bisect.bisect_left(posting, position)]
+            if not posting:
+                del self.postings[token]
+                if self.vocabulary is not None:
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+        self.doc_tokens[position] = frozenset()
+
+        price = self.prices[position]
+        if price is not None:
+            del self.price_order[bisect.bisect_left(self.price_order, (price, position))]
+            self.prices[position] = None
+
+    def match_term(self, term):
+        """Kelimeyle başlayan tüm kelimelerin ürün konumlarını döndürür.
+
+        Çok sayıda kelimeye uyacak kısa terimlerde (iki harfe kadar) tam eşleşme aranır.
+        """
+        if len(term) < 3:
+            return self.postings.get(term, [])
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + "\uffff")
+        if end - start == 1:
+            return self.postings[self.vocabulary[start]]
+        matches = set()
+        for token in self.vocabulary[start:end]:
+            matches.update(self.postings[token])
+        return matches
+
+    def match_price(self, min_price=None, max_price=None):
+        """Fiyat aralığındaki ürün konumlarını döndürür."""
+        start = 0 if min_price is None else bisect.bisect_left(self.price_order, (min_price, -1))
+        end = len(self.price_order) if max_price is None else bisect.bisect_right(self.price_order, (max_price, len(self)))
+        return {position for _, position in self.price_order[start:end]}
+
+    def search(self, query="", min_price=None, max_price=None):
+        """Tüm kelimeleri içeren ve fiyat aralığına uyan ürünlerin konumlarını sıralı döndürür.
+
+        Hiç ölçüt verilmezse None döndürür (tüm liste).
+        """
+        terms = set(tokenize(query))
+        if not terms and min_price is None and max_price is None:
+            return None
+
+        candidates = [self.match_term(term) for term in terms]
+        if min_price is not None or max_price is not None:
+            candidates.append(self.match_price(min_price, max_price))
+
+        # Kesişim en küçük kümeden başlanarak alınır
+        candidates.sort(key=len)
+        if len(candidates) == 1 and isinstance(candidates[0], list):
+            # Tek kelimenin listesi zaten sıralıdır
+            return list(candidates[0])
+        result = set(candidates[0])
+        for candidate in candidates[1:]:
+            if not result:
+                break
+            result.intersection_update(candidate)
+        return sorted(result)
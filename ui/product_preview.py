@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, simpledialog
-import requests
-from PIL import Image, ImageTk
-from io import BytesIO
+from ui.image_loader import AsyncImageLoader
 
 class ProductPreviewWindow:
     def __init__(self, parent, product, verify_ssl=True, on_save=None):
@@ -18,6 +16,11 @@ class ProductPreviewWindow:
         # Resim önbelleği
         self.photo = None
         
+        # Resimler arka planda yüklenir; pencere kapanınca bekleyenler iptal edilir
+        self.image_loader = AsyncImageLoader(self.window)
+        self.image_request = None
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
         self.create_widgets()
     
     def create_widgets(self):
@@ -41,48 +44,25 @@ class ProductPreviewWindow:
         left_frame = ttk.Frame(middle_frame)
         left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10)
         
-        # Ürün resmi
+        # Ürün resmi; yüklenirken yer tutucu gösterilir
+        self.image_label = ttk.Label(left_frame, text="Resim yükleniyor..." if self.product["image_url"] else "Resim bulunamadı")
+        self.image_label.pack(pady=10)
+        
+        # Resim URL'si
+        url_label = ttk.Label(left_frame, text="Resim URL:", font=("Arial", 10, "bold"))
+        url_label.pack(anchor=tk.W, pady=(10, 0))
+        
+        self.image_url_entry = ttk.Entry(left_frame, width=40)
+        self.image_url_entry.insert(0, self.product["image_url"])
+        self.image_url_entry.pack(fill=tk.X, pady=5)
+        
+        # Resmi değiştir / resim ekle düğmesi
+        self.image_button = ttk.Button(left_frame)
+        self.image_button.pack(pady=5)
+        self.update_image_button()
+        
         if self.product["image_url"]:
-            try:
-                response = requests.get(self.product["image_url"], verify=self.verify_ssl)
-                if response.status_code == 200:
-                    img_data = BytesIO(response.content)
-                    img = Image.open(img_data)
-                    
-                    # Resmi yeniden boyutlandır
-                    max_size = (300, 300)
-                    img.thumbnail(max_size, Image.LANCZOS)
-                    
-                    self.photo = ImageTk.PhotoImage(img)
-                    img_label = ttk.Label(left_frame, image=self.photo)
-                    img_label.pack(pady=10)
-                    
-                    # Resim URL'si
-                    url_label = ttk.Label(left_frame, text="Resim URL:", font=("Arial", 10, "bold"))
-                    url_label.pack(anchor=tk.W, pady=(10, 0))
-                    
-                    url_entry = ttk.Entry(left_frame, width=40)
-                    url_entry.insert(0, self.product["image_url"])
-                    url_entry.pack(fill=tk.X, pady=5)
-                    
-                    # Resmi değiştir düğmesi
-                    ttk.Button(left_frame, text="Resmi Değiştir", 
-                              command=lambda: self.change_image()).pack(pady=5)
-            except Exception as e:
-                ttk.Label(left_frame, text=f"Resim yüklenemedi: {e}", wraplength=300).pack(pady=10)
-        else:
-            ttk.Label(left_frame, text="Resim bulunamadı").pack(pady=10)
-            
-            # Resim URL'si ekle
-            url_label = ttk.Label(left_frame, text="Resim URL:", font=("Arial", 10, "bold"))
-            url_label.pack(anchor=tk.W, pady=(10, 0))
-            
-            self.image_url_entry = ttk.Entry(left_frame, width=40)
-            self.image_url_entry.pack(fill=tk.X, pady=5)
-            
-            # Resim ekle düğmesi
-            ttk.Button(left_frame, text="Resim Ekle", 
-                      command=lambda: self.add_image()).pack(pady=5)
+            self.load_image()
         
         # Sağ taraf - Ürün bilgileri
         right_frame = ttk.Frame(middle_frame)
@@ -123,25 +103,58 @@ class ProductPreviewWindow:
         button_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(button_frame, text="Değişiklikleri Kaydet", command=self.save_changes).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Kapat", command=self.window.destroy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Kapat", command=self.close).pack(side=tk.LEFT, padx=5)
+    
+    def update_image_button(self):
+        """Resim varsa değiştirme, yoksa ekleme düğmesini gösterir."""
+        if self.product["image_url"]:
+            self.image_button.config(text="Resmi Değiştir", command=self.change_image)
+        else:
+            self.image_button.config(text="Resim Ekle", command=self.add_image)
+    
+    def load_image(self):
+        """Ürün resmini arka planda yükler; önceki bekleyen yükleme iptal edilir."""
+        if self.image_request is not None:
+            self.image_loader.cancel(self.image_request)
+        self.image_label.config(image="", text="Resim yükleniyor...")
+        self.image_request = self.image_loader.load(
+            self.product["image_url"], (300, 300), self.verify_ssl, self.show_image)
+    
+    def show_image(self, image):
+        """Yüklenen resmi gösterir (Tk ana iş parçacığında çağrılır)."""
+        self.image_request = None
+        if image is None:
+            self.photo = None
+            self.image_label.config(image="", text="Resim yüklenemedi")
+            return
+        from PIL import ImageTk
+        self.photo = ImageTk.PhotoImage(image)
+        self.image_label.config(image=self.photo, text="")
+    
+    def set_image_url(self, new_url):
+        """Ürün resmini değiştirir ve yeni resmi yükler."""
+        self.product["image_url"] = new_url
+        self.image_url_entry.delete(0, tk.END)
+        self.image_url_entry.insert(0, new_url)
+        self.update_image_button()
+        self.load_image()
     
     def change_image(self):
         """Ürün resmini değiştir."""
         new_url = simpledialog.askstring("Resim URL", "Yeni resim URL'sini girin:", parent=self.window)
         if new_url:
-            self.product["image_url"] = new_url
-            # Pencereyi yeniden oluştur
-            self.window.destroy()
-            self.__init__(self.parent, self.product, self.verify_ssl, self.on_save)
+            self.set_image_url(new_url)
     
     def add_image(self):
         """Ürüne resim ekle."""
         new_url = self.image_url_entry.get()
         if new_url:
-            self.product["image_url"] = new_url
-            # Pencereyi yeniden oluştur
-            self.window.destroy()
-            self.__init__(self.parent, self.product, self.verify_ssl, self.on_save)
+            self.set_image_url(new_url)
+    
+    def close(self):
+        """Bekleyen resim yüklemelerini iptal eder ve pencereyi kapatır."""
+        self.image_loader.close()
+        self.window.destroy()
     
     def save_changes(self):
         """Değişiklikleri kaydeder ve pencereyi kapatır."""
@@ -154,4 +167,4 @@ class ProductPreviewWindow:
         if self.on_save:
             self.on_save(self.product)
             
-        self.window.destroy()
\ No newline at end of file
+        self.close()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import queue
+import time
+
+
+class ProgressBus:
+    """İş parçacıklarından gelen ilerleme olaylarını Tk ana döngüsüne aktarır.
+
+    `publish` herhangi bir iş parçacığından çağrılabilir ve yalnızca kuyruğa
+    ekleme yapar. Ana döngü kuyruğu sabit aralıklarla `after()` ile boşaltır;
+    aradaki tüm olaylar son duruma indirgenir ve hız ile kalan süre tahmini
+    eklenerek `on_update` bir kez çağrılır.
+    """
+
+    def __init__(self, root, on_update, interval=100, smoothing=0.3):
+        self.root = root
+        self.on_update = on_update
+        self.interval = interval
+        self.smoothing = smoothing
+        self.events = queue.SimpleQueue()
+        self.after_id = None
+        self.reset_rate()
+
+    def reset_rate(self):
+        """Hız ölçümünü yeni bir işe göre sıfırlar."""
+        self.last_total = None
+        self.last_current = 0
+        self.last_time = None
+        self.rate = 0.0
+
+    def publish(self, message, current=0, total=0):
+        """İlerleme olayını kuyruğa ekler (iş parçacığı güvenli)."""
+        self.events.put((message, current, total, time.time()))
+
+    def start(self):
+        """Kuyruğu düzenli aralıklarla boşaltmaya başlar."""
+        if self.after_id is None:
+            self.after_id = self.root.after(self.interval, self.drain)
+
+    def stop(self):
+        """Kuyruk boşaltmayı durdurur."""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def drain(self):
+        """Bekleyen olayları son duruma indirger ve arayüzü bir kez günceller."""
+        latest = None
+        while True:
+            try:
+                latest = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+        if latest is not None:
+            message, current, total, stamp = latest
+            self.update_rate(current, total, stamp)
+            eta = (total - current) / self.rate if total and self.rate > 0 else None
+            self.on_update(message, current, total, self.rate if total else None, eta)
+
+        self.after_id = self.root.after(self.interval, self.drain)
+
+    def update_rate(self, current, total, stamp):
+        """Saniye başına ilerlemeyi üstel ortalamayla günceller."""
+        if not total or total != self.last_total or current < self.last_current:
+            # Yeni bir iş ya da adım başladı
+            self.reset_rate()
+            self.last_total = total
+            self.last_current = current
+            self.last_time = stamp
+            return
+
+        elapsed = stamp - self.last_time
+        if elapsed <= 0 or current == self.last_current:
+            return
+        instant = (current - self.last_current) / elapsed
+        self.rate = instant if self.rate == 0 else self.smoothing * instant + (1 - self.smoothing) * self.rate
+        self.last_current = current
+        self.last_time = stamp
+
+
+def format_eta(seconds):
+    """Kalan süreyi s:dd:ss ya da d:ss biçiminde döndürür."""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+import requests
+from config import DEFAULT_CONFIG
+
+
+class ThumbnailCache:
+    """Küçük resimler için iki katmanlı önbellek.
+
+    Bellekte, toplam boyutu bayt olarak sınırlanan bir LRU içinde çözülmüş
+    PIL resimleri; diskte ise URL ve boyuta göre adlandırılmış, önceden
+    küçültülmüş PNG dosyaları tutulur. PhotoImage yalnızca Tk ana iş
+    parçacığında oluşturulabildiği için önbellek PIL resimlerini saklar.
+    """
+
+    def __init__(self, memory_bytes=None, cache_dir=None, disk_bytes=None):
+        self.memory_bytes = memory_bytes or DEFAULT_CONFIG["thumbnail_memory_bytes"]
+        self.cache_dir = cache_dir or DEFAULT_CONFIG["thumbnail_cache_dir"]
+        self.disk_bytes = disk_bytes or DEFAULT_CONFIG["thumbnail_disk_bytes"]
+        self.memory = OrderedDict()  # anahtar -> (resim, bayt)
+        self.memory_used = 0
+        self.disk_used = None  # ilk diske yazmada hesaplanır
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0,
+                      "memory_evictions": 0, "disk_evictions": 0, "errors": 0}
+
+    def make_key(self, url, size):
+        """URL ve boyuttan önbellek anahtarı üretir."""
+        return hashlib.sha1(f"{url}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()
+
+    def disk_path(self, key):
+        """Anahtarın disk dosyası yolunu döndürür."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def get(self, url, size=(100, 100), verify_ssl=True):
+        """Küçük resmi önce bellekten, sonra diskten, en son kaynaktan alır; hata durumunda None döndürür."""
+        key = self.make_key(url, size)
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[0]
+
+        image = self.load_from_disk(key)
+        if image is not None:
+            self.count("disk_hits")
+        else:
+            image = self.download(url, size, verify_ssl)
+            if image is None:
+                self.count("errors")
+                return None
+            self.count("misses")
+            self.save_to_disk(key, image)
+
+        self.remember(key, image)
+        return image
+
+    def count(self, key):
+        """Sayaç değerini artırır."""
+        with self.lock:
+            self.stats[key] += 1
+
+    def remember(self, key, image):
+        """Resmi bellek LRU'suna ekler ve sınır aşılırsa en eski resimleri atar."""
+        image_bytes = image.width * image.height * len(image.getbands())
+        with self.lock:
+            if key in self.memory:
+                self.memory_used -= self.memory.pop(key)[1]
+            self.memory[key] = (image, image_bytes)
+            self.memory_used += image_bytes
+            while self.memory_used > self.memory_bytes and len(self.memory) > 1:
+                _, (_, evicted_bytes) = self.memory.popitem(last=False)
+                self.memory_used -= evicted_bytes
+                self.stats["memory_evictions"] += 1
+
+    def load_from_disk(self, key):
+        """Diskteki küçük resmi açar; yoksa None döndürür."""
+        path = self.disk_path(key)
+        # Pillow ilk resim kullanımında yüklenir
+        from PIL import Image
+        try:
+            with Image.open(path) as image:
+                image.load()
+                # Son kullanım zamanı disk temizliğinde sıralama için güncellenir
+                os.utime(path)
+                return image.copy()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Önbellekteki küçük resim okunamadı: {e}")
+            return None
+
+    def download(self, url, size, verify_ssl):
+        """Resmi indirir, çözer ve küçültür."""
+        from PIL import Image
+        try:
+            response = requests.get(url, verify=verify_ssl, timeout=DEFAULT_CONFIG["request_timeout"])
+            if response.status_code != 200:
+                return None
+            with Image.open(BytesIO(response.content)) as image:
+                image.thumbnail(size, Image.LANCZOS)
+                return image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        except Exception as e:
+            print(f"Resim yüklenirken hata: {e}")
+            return None
+
+    def save_to_disk(self, key, image):
+        """Küçük resmi diske yazar ve disk sınırı aşılırsa eski dosyaları siler."""
+        path = self.disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            image.save(temp_path, "PNG")
+            os.replace(temp_path, path)
+            written = os.path.getsize(path)
+        except OSError as e:
+            print(f"Küçük resim diske yazılamadı: {e}")
+            return
+
+        with self.lock:
+            if self.disk_used is None:
+                self.disk_used = sum(size for _, size, _ in self.scan_disk())
+            else:
+                self.disk_used += written
+            trim = self.disk_used > self.disk_bytes
+        if trim:
+            self.trim_disk()
+
+    def scan_disk(self):
+        """Disk önbelleğindeki (yol, boyut, son kullanım) üçlülerini döndürür."""
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def trim_disk(self):
+        """En uzun süredir kullanılmayan dosyaları disk sınırının %90'ına inene kadar siler."""
+        files = sorted(self.scan_disk(), key=lambda item: item[2])
+        used = sum(size for _, size, _ in files)
+        target = self.disk_bytes * 0.9
+        evicted = 0
+        for path, size, _ in files:
+            if used <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            used -= size
+            evicted += 1
+        with self.lock:
+            self.disk_used = used
+            self.stats["disk_evictions"] += evicted
+
+    def get_stats(self):
+        """Sayaçları ve bellek kullanımını döndürür."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["memory_items"] = len(self.memory)
+            stats["memory_bytes"] = self.memory_used
+        return stats
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    """Uygulama genelinde paylaşılan küçük resim önbelleğini döndürür."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache()
+        return _shared_cache
@@ -1,22 +1,21 @@
-from PIL import Image, ImageTk
-from io import BytesIO
-import requests
+import queue
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import threading
+from ui.thumbnail_cache import get_thumbnail_cache
 
 def load_image_from_url(url, size=(100, 100), verify_ssl=True):
-    """URL'den resim yükler ve belirtilen boyuta getirir."""
-    try:
-        response = requests.get(url, verify=verify_ssl, timeout=5)
-        if response.status_code == 200:
-            img_data = BytesIO(response.content)
-            img = Image.open(img_data)
-            img.thumbnail(size, Image.LANCZOS)
-            return ImageTk.PhotoImage(img)
-    except Exception as e:
-        print(f"Resim yüklenirken hata: {e}")
-    return None
+    """URL'den resim yükler ve belirtilen boyuta getirir.
+    
+    Küçük resimler bellek ve disk önbelleğinden karşılanır; aynı resim
+    tekrar indirilmez.
+    """
+    image = get_thumbnail_cache().get(url, size, verify_ssl)
+    if not image:
+        return None
+    # Pillow ilk resim kullanımında yüklenir
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(image)
 
 def create_scrollable_frame(parent):
     """Kaydırılabilir bir çerçeve oluşturur."""
@@ -42,24 +41,55 @@ def create_scrollable_frame(parent):
     
     return scrollable_frame
 
-def run_with_progress(root, func, args=(), kwargs={}, on_complete=None):
-    """İşlevi ayrı bir thread'de çalıştırır ve ilerleme gösterir."""
+def run_with_progress(root, func, args=(), kwargs={}, on_complete=None, cancel_token=None):
+    """İşlevi ayrı bir thread'de çalıştırır ve ilerleme gösterir.
+    
+    `cancel_token` verilirse pencerede İptal düğmesi gösterilir; işlev
+    iptali fark ettiğinde döndürdüğü kısmi sonuç on_complete'e iletilir.
+    """
     progress_window = tk.Toplevel(root)
     progress_window.title("İşlem Sürüyor")
-    progress_window.geometry("300x100")
+    progress_window.geometry("300x130" if cancel_token else "300x100")
     progress_window.transient(root)
     progress_window.grab_set()
     
-    ttk.Label(progress_window, text="İşlem devam ediyor...").pack(pady=10)
+    status_label = ttk.Label(progress_window, text="İşlem devam ediyor...")
+    status_label.pack(pady=10)
     
     progress = ttk.Progressbar(progress_window, mode="indeterminate")
     progress.pack(fill=tk.X, padx=20, pady=10)
     progress.start()
     
+    if cancel_token:
+        def cancel():
+            cancel_token.cancel()
+            status_label.config(text="İptal ediliyor, devam eden istekler bekleniyor...")
+            cancel_button.config(state=tk.DISABLED)
+        
+        cancel_button = ttk.Button(progress_window, text="İptal", command=cancel)
+        cancel_button.pack(pady=5)
+        progress_window.protocol("WM_DELETE_WINDOW", cancel)
+    
+    # Sonuç iş parçacığından ana döngüye aktarılır; Tk yalnızca ana iş parçacığında kullanılır
+    outcome = queue.SimpleQueue()
+    
     def thread_func():
-        result = func(*args, **kwargs)
+        try:
+            outcome.put((func(*args, **kwargs), None))
+        except Exception as e:
+            outcome.put((None, e))
+    
+    def check_done():
+        try:
+            result, error = outcome.get_nowait()
+        except queue.Empty:
+            root.after(100, check_done)
+            return
         progress_window.destroy()
-        if on_complete:
+        if error:
+            messagebox.showerror("Hata", f"İşlem sırasında hata oluştu: {error}")
+        elif on_complete:
             on_complete(result)
     
-    threading.Thread(target=thread_func, daemon=True).start()
\ No newline at end of file
+    threading.Thread(target=thread_func, daemon=True).start()
+    root.after(100, check_done)
\ No newline at end of file
@@ -0,0 +1,264 @@
+import hashlib
+import tkinter as tk
+from tkinter import ttk
+
+# Sütun adı -> (başlık, genişlik, hizalama)
+PRODUCT_COLUMNS = (
+    ("selected", "Seç", 50, tk.CENTER),
+    ("title", "Başlık", 300, tk.W),
+    ("price", "Fiyat", 100, tk.W),
+    ("image", "Resim", 100, tk.CENTER),
+)
+
+
+def product_row_values(product):
+    """Ürünün tablo satırında gösterilecek değerlerini döndürür."""
+    return ("✓" if product.get("selected", False) else "", product.get("title", ""), product.get("price", ""), "Resim")
+
+
+class ProductTableModel:
+    """Tablonun arkasındaki ürün listesi ve kararlı satır anahtarları.
+
+    Anahtarlar ürün URL'sinden (yoksa başlıktan) türetilir; aynı ürün listesi
+    yeniden yüklendiğinde aynı anahtarları alır. Liste indeksleri yerine bu
+    anahtarlar Treeview iid'si olarak kullanılır. `rows` tabloda gösterilen
+    (filtrelenmiş) satırların anahtarlarıdır.
+    """
+
+    def __init__(self):
+        self.products = []
+        self.keys = []
+        self.index_by_key = {}
+        self.rows = self.keys
+
+    def set_products(self, products):
+        """Ürün listesini değiştirir ve anahtarları yeniden hesaplar; filtre kaldırılır."""
+        self.products = products
+        self.keys = []
+        self.index_by_key = {}
+        for index, product in enumerate(products):
+            key = self.make_key(product)
+            self.keys.append(key)
+            self.index_by_key[key] = index
+        self.rows = self.keys
+
+    def set_filter(self, positions):
+        """Yalnızca verilen liste konumlarındaki ürünleri gösterir; None tüm listeyi gösterir."""
+        self.rows = self.keys if positions is None else [self.keys[position] for position in positions]
+
+    def row_of(self, key):
+        """Anahtarın gösterilen satırlar içindeki sırasını döndürür; gösterilmiyorsa None."""
+        if self.rows is self.keys:
+            return self.index_by_key.get(key)
+        try:
+            return self.rows.index(key)
+        except ValueError:
+            return None
+
+    def make_key(self, product):
+        """Ürün için benzersiz ve kararlı bir anahtar üretir."""
+        base = product.get("product_url") or product.get("title") or "urun"
+        candidate = base
+        suffix = 2
+        while True:
+            key = "p" + hashlib.sha1(candidate.encode("utf-8")).hexdigest()[:16]
+            if key not in self.index_by_key:
+                return key
+            # Aynı URL'ye sahip ürünler sırayla numaralandırılır
+            candidate = f"{base}#{suffix}"
+            suffix += 1
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, key):
+        """Anahtara karşılık gelen ürünü döndürür."""
+        index = self.index_by_key.get(key)
+        return self.products[index] if index is not None else None
+
+    def replace(self, key, product):
+        """Anahtardaki ürünü yenisiyle değiştirir; anahtar değişmez."""
+        index = self.index_by_key.get(key)
+        if index is not None:
+            self.products[index] = product
+
+
+class VirtualProductTable:
+    """Yalnızca görünen satırları oluşturan sanal ürün tablosu.
+
+    Treeview'a her zaman yalnızca ekranda görünen birkaç satır eklenir;
+    kaydırma çubuğu modeldeki toplam satır sayısına göre elle yönetilir.
+    Tek satır düzenlemeleri ve toplu seçimler yalnızca değişen görünür
+    satırları günceller.
+    """
+
+    def __init__(self, parent, columns=PRODUCT_COLUMNS, row_values=product_row_values):
+        self.model = ProductTableModel()
+        self.row_values = row_values
+        self.offset = 0
+        self.visible_rows = 20
+        self.rendered = {}  # anahtar -> son gösterilen değerler
+        self.selected = None
+
+        self.scrollbar = ttk.Scrollbar(parent, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(parent, columns=[column[0] for column in columns], show="headings", selectmode="browse")
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        for name, heading, width, anchor in columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor=anchor)
+
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self.move_selection(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.move_selection(self.visible_rows))
+
+    def bind(self, sequence, func):
+        """Treeview olayına bağlanır."""
+        self.tree.bind(sequence, func, add="+")
+
+    def set_products(self, products):
+        """Tüm ürün listesini değiştirir; yalnızca görünen satırlar yeniden çizilir."""
+        self.model.set_products(products)
+        if self.selected not in self.model.index_by_key:
+            self.selected = None
+        self.offset = min(self.offset, self.max_offset())
+        self.render()
+
+    def set_filter(self, positions):
+        """Tabloyu verilen liste konumlarındaki ürünlerle sınırlar ve başa kaydırır."""
+        self.model.set_filter(positions)
+        self.offset = 0
+        self.render()
+
+    def shown_products(self):
+        """Tabloda gösterilen (filtrelenmiş) ürünleri döndürür."""
+        return [self.model.get(key) for key in self.model.rows]
+
+    def position_of(self, key):
+        """Anahtarın tüm ürün listesindeki konumunu döndürür."""
+        return self.model.index_by_key.get(key)
+
+    def update_product(self, key, product):
+        """Tek bir ürünü değiştirir ve yalnızca o satırı günceller."""
+        self.model.replace(key, product)
+        self.refresh_row(key)
+
+    def refresh_row(self, key):
+        """Satır görünürse değerlerini günceller."""
+        if key in self.rendered:
+            values = self.row_values(self.model.get(key))
+            if values != self.rendered[key]:
+                self.tree.item(key, values=values)
+                self.rendered[key] = values
+
+    def refresh_visible(self):
+        """Görünen satırların değerlerini günceller (toplu seçim sonrası)."""
+        for key in list(self.rendered):
+            self.refresh_row(key)
+
+    def selected_key(self):
+        """Seçili satırın ürün anahtarını döndürür."""
+        return self.selected
+
+    def product_for(self, key):
+        """Anahtara karşılık gelen ürünü döndürür."""
+        return self.model.get(key)
+
+    def max_offset(self):
+        return max(0, len(self.model) - self.visible_rows)
+
+    def render(self):
+        """Görünür penceredeki satırları Treeview'a yansıtır; yalnızca farkları uygular."""
+        wanted = self.model.rows[self.offset:self.offset + self.visible_rows + 1]
+        wanted_set = set(wanted)
+
+        for key in list(self.rendered):
+            if key not in wanted_set:
+                self.tree.delete(key)
+                del self.rendered[key]
+
+        for position, key in enumerate(wanted):
+            values = self.row_values(self.model.get(key))
+            if key not in self.rendered:
+                self.tree.insert("", position, iid=key, values=values)
+                self.rendered[key] = values
+            else:
+                if self.tree.index(key) != position:
+                    self.tree.move(key, "", position)
+                if values != self.rendered[key]:
+                    self.tree.item(key, values=values)
+                    self.rendered[key] = values
+
+        if self.selected in self.rendered:
+            if self.tree.selection() != (self.selected,):
+                self.tree.selection_set(self.selected)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        """Kaydırma çubuğunu modeldeki toplam satır sayısına göre ayarlar."""
+        total = len(self.model)
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+
+    def scroll_to(self, offset):
+        """Görünür pencereyi verilen satırdan başlatır."""
+        offset = max(0, min(int(offset), self.max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def on_scroll(self, action, value, unit=None):
+        """Kaydırma çubuğu komutlarını (moveto / scroll) işler."""
+        if action == "moveto":
+            self.scroll_to(float(value) * len(self.model))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_by(int(value) * step)
+
+    def on_mouse_wheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        """Pencere boyutu değişince görünür satır sayısını yeniden hesaplar."""
+        # Başlık satırı da yaklaşık bir satır yüksekliğindedir
+        rows = max(1, event.height // self.row_height - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.offset = min(self.offset, self.max_offset())
+            self.render()
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = selection[0]
+
+    def move_selection(self, delta):
+        """Seçimi klavyeyle taşır; görünür pencerenin dışına çıkılırsa kaydırır."""
+        if not len(self.model):
+            return "break"
+        current = self.model.row_of(self.selected) if self.selected else None
+        if current is None:
+            current = self.offset - 1 if delta > 0 else self.offset
+        index = max(0, min(current + delta, len(self.model) - 1))
+        self.selected = self.model.rows[index]
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.visible_rows:
+            self.scroll_to(index - self.visible_rows + 1)
+        self.render()
+        self.tree.see(self.selected)
+        return "break"
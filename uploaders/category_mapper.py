@@ -0,0 +1,163 @@
+import html
+import json
+import os
+import re
+import requests
+from urllib.parse import urlparse
+from config import DEFAULT_CONFIG
+from uploaders.wordpress_uploader import canonical_product_url
+
+
+def normalize_name(name):
+    """Kategori adını karşılaştırma için sadeleştirir (WooCommerce adları HTML kodlu döner)."""
+    return re.sub(r'\s+', ' ', html.unescape(name or '')).strip().lower()
+
+
+class CategoryMapper:
+    """SiteAnalyzer kategori ağacını WooCommerce kategorilerine eşler.
+
+    Var olan kategoriler tek bir sayfalı istekle alınır, eksikler üst
+    kategori bağlantılarıyla birlikte seviye seviye toplu olarak oluşturulur.
+    Kaynak kategori URL'si -> WooCommerce kategori ID'si eşlemesi her site
+    için diskte saklanır.
+    """
+
+    def __init__(self, uploader, cache_dir=None):
+        self.uploader = uploader
+        self.cache_dir = cache_dir or DEFAULT_CONFIG["category_cache_dir"]
+        safe_name = re.sub(r'[^\w.-]', '_', urlparse(uploader.wp_url).netloc) or "_"
+        self.path = os.path.join(self.cache_dir, f"{safe_name}.json")
+        self.mapping = {}  # standart kategori URL'si -> WooCommerce kategori ID'si
+        self.load()
+
+    def load(self):
+        """Kayıtlı eşlemeyi diskten yükler."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.mapping = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Kategori eşlemesi okunamadı: {e}")
+
+    def save(self):
+        """Eşlemeyi atomik olarak diske yazar."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.mapping, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Kategori eşlemesi yazılamadı: {e}")
+
+    def get_levels(self, categories):
+        """Kategorileri kökten başlayarak seviyelere ayırır; (URL, üst URL) listeleri döndürür."""
+        referenced = {
+            sub_url for url, info in categories.items()
+            for sub_url in info.get("subcategories", []) if sub_url != url
+        }
+        levels = []
+        placed = set()
+
+        def walk(roots):
+            level = roots
+            depth = 0
+            placed.update(url for url, _ in roots)
+            while level:
+                if depth == len(levels):
+                    levels.append([])
+                levels[depth].extend(level)
+                next_level = []
+                for url, _ in level:
+                    for sub_url in categories[url].get("subcategories", []):
+                        if sub_url in categories and sub_url not in placed:
+                            placed.add(sub_url)
+                            next_level.append((sub_url, url))
+                level = next_level
+                depth += 1
+
+        walk([(url, None) for url in categories if url not in referenced])
+        # Döngü içinde kalan kategoriler tarama sırasındaki ilk üyelerinden başlatılır
+        for url in categories:
+            if url not in placed:
+                walk([(url, None)])
+        return levels
+
+    def resolve(self, categories):
+        """Kategori ağacını çözer, eksik kategorileri oluşturur ve eşlemeyi döndürür."""
+        if not categories:
+            return self.mapping
+
+        keys = {url: canonical_product_url(url) for url in categories}
+        if all(key in self.mapping for key in keys.values()):
+            self.uploader.update_progress(f"Kategori eşlemesi önbellekten alındı: {len(keys)} kategori")
+            return self.mapping
+
+        existing = self.uploader.fetch_collection(
+            "products/categories", "id,name,parent", label="Mağazadaki kategoriler alınıyor")
+        known_ids = {item["id"] for item in existing}
+        by_name = {(normalize_name(item["name"]), item["parent"]): item["id"] for item in existing}
+
+        # Mağazada silinmiş kategorilere ait eski eşlemeler kullanılmaz
+        self.mapping = {key: cat_id for key, cat_id in self.mapping.items() if cat_id in known_ids}
+
+        created = 0
+        for level in self.get_levels(categories):
+            missing = []
+            for url, parent_url in level:
+                key = keys[url]
+                if key in self.mapping:
+                    continue
+                parent_id = self.mapping.get(keys[parent_url], 0) if parent_url else 0
+                name = categories[url].get("name") or key
+                cat_id = by_name.get((normalize_name(name), parent_id))
+                if cat_id:
+                    self.mapping[key] = cat_id
+                else:
+                    missing.append((key, {"name": name, "parent": parent_id}))
+
+            for start in range(0, len(missing), self.uploader.batch_size):
+                chunk = missing[start:start + self.uploader.batch_size]
+                created += self.create_batch(chunk)
+
+        self.save()
+        self.uploader.update_progress(
+            f"Kategori eşlemesi hazır: {len(keys)} kategori, {created} yeni kategori oluşturuldu")
+        return self.mapping
+
+    def create_batch(self, items):
+        """(anahtar, kategori verisi) öğelerini tek bir toplu istekle oluşturur."""
+        try:
+            response = requests.post(
+                f"{self.uploader.wc_api_url}/products/categories/batch",
+                json={"create": [data for _, data in items]},
+                auth=(self.uploader.username, self.uploader.password),
+                verify=self.uploader.verify_ssl,
+                timeout=self.uploader.batch_timeout
+            )
+            if response.status_code not in [200, 201]:
+                print(f"Kategoriler oluşturulurken hata: {response.status_code} - {response.text[:200]}")
+                return 0
+            returned = response.json().get("create") or []
+        except Exception as e:
+            print(f"Kategoriler oluşturulurken hata: {e}")
+            return 0
+
+        created = 0
+        for (key, data), item in zip(items, returned):
+            error = item.get("error")
+            if not error:
+                self.mapping[key] = item["id"]
+                created += 1
+            elif error.get("code") == "term_exists" and (error.get("data") or {}).get("resource_id"):
+                # Aynı adlı kategori başka bir yoldan oluşmuş
+                self.mapping[key] = error["data"]["resource_id"]
+            else:
+                print(f"Kategori oluşturulamadı: {data['name']} - {error.get('message')}")
+        return created
+
+    def category_for(self, product, default_id=9):
+        """Ürünün kaynak kategorisine karşılık gelen WooCommerce kategori ID'sini döndürür."""
+        key = canonical_product_url(product.get("category_url"))
+        return self.mapping.get(key, default_id) if key else default_id
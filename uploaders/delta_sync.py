@@ -0,0 +1,268 @@
+import html
+import json
+import os
+import re
+import time
+from urllib.parse import urlparse
+from config import DEFAULT_CONFIG
+from uploaders.wordpress_uploader import canonical_product_url
+
+# Karşılaştırılan ürün alanları
+SYNC_FIELDS = ("name", "regular_price", "description", "images", "categories")
+SNAPSHOT_FIELDS = "id,sku,name,status,regular_price,description,images,categories,meta_data"
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(value):
+    """HTML etiketlerini ve fazla boşlukları atarak metni karşılaştırılabilir yapar."""
+    text = html.unescape(_TAG_RE.sub(' ', value or ''))
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def normalize_price(value):
+    """Fiyatı sayısal karşılaştırma için float'a çevirir."""
+    try:
+        return round(float(value or 0), 2)
+    except ValueError:
+        return value
+
+
+class StoreSnapshot:
+    """Mağazadaki ürünlerin yerel anlık görüntüsü; süre sınırıyla diskte saklanır."""
+
+    def __init__(self, uploader, cache_dir=None, ttl=None):
+        self.uploader = uploader
+        self.cache_dir = cache_dir or DEFAULT_CONFIG["store_snapshot_dir"]
+        self.ttl = DEFAULT_CONFIG["store_snapshot_ttl"] if ttl is None else ttl
+        safe_name = re.sub(r'[^\w.-]', '_', urlparse(uploader.wp_url).netloc) or "_"
+        self.path = os.path.join(self.cache_dir, f"{safe_name}.json")
+        self.products = {}  # ürün ID'si -> ürün
+        self.saved_at = 0
+
+    def load(self, refresh=False):
+        """Anlık görüntüyü diskten yükler; yoksa veya süresi dolmuşsa mağazadan çeker."""
+        if not refresh and self.load_saved() is not None:
+            return self.products
+
+        existing = self.uploader.fetch_existing_products(fields=SNAPSHOT_FIELDS)
+        self.products = {item["id"]: item for item in existing}
+        self.save()
+        return self.products
+
+    def load_saved(self):
+        """Süresi dolmamış kayıtlı görüntüyü yükler; yoksa None döndürür."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if time.time() - data.get("saved_at", 0) > self.ttl:
+                return None
+            self.products = {int(pid): item for pid, item in data["products"].items()}
+            self.saved_at = data["saved_at"]
+            return self.products
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Mağaza görüntüsü okunamadı: {e}")
+            return None
+
+    def save(self, saved_at=None):
+        """Anlık görüntüyü atomik olarak diske yazar."""
+        self.saved_at = saved_at or time.time()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"saved_at": self.saved_at, "products": self.products}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Mağaza görüntüsü yazılamadı: {e}")
+
+    def apply_results(self, results):
+        """Toplu istek yanıtlarındaki güncel ürünleri görüntüye işler.
+
+        Yanıtlar kayıtlı ürünün üzerine birleştirilir (XML-RPC yanıtları
+        yalnızca gönderilen alanları içerir). Görüntünün yaşı değişmez;
+        dokunulmayan ürünler hâlâ ilk çekildikleri andaki haliyle durur.
+        """
+        for result in results:
+            response = result.get("response")
+            if not response or "id" not in response:
+                continue
+            if result.get("action") == "delete":
+                self.products.pop(response["id"], None)
+            else:
+                self.products[response["id"]] = dict(self.products.get(response["id"]) or {}, **response)
+        self.save(self.saved_at)
+
+
+def record_store_uploads(uploader, results):
+    """Başka bir yoldan yapılan yüklemeleri kayıtlı mağaza görüntüsüne işler.
+
+    Böylece görüntü süresi dolmadan yapılan planlar yeni ürünleri görür ve
+    onları yeniden oluşturulacak saymaz. Kayıtlı görüntü yoksa bir şey yapılmaz.
+    """
+    snapshot = StoreSnapshot(uploader)
+    if snapshot.load_saved() is not None:
+        snapshot.apply_results(results)
+
+
+class DeltaSync:
+    """Kazınan ürünleri mağaza görüntüsüyle karşılaştırıp yalnızca farkları gönderir."""
+
+    def __init__(self, uploader, category_id=9, snapshot=None):
+        self.uploader = uploader
+        self.category_id = category_id
+        self.snapshot = snapshot or StoreSnapshot(uploader)
+
+    def plan(self, products, refresh_snapshot=False, catalog=None):
+        """Yapılacak işlemleri hesaplar; mağazaya hiçbir şey yazmaz.
+
+        Dönen plan: create (yeni ürünler), update (yalnızca değişen alanlar),
+        unchanged (aynı kalanlar) ve vanished (kaynakta artık bulunmayan,
+        bu araçla oluşturulmuş ürünler). `products` kataloğun yalnızca bir
+        kısmıysa (ör. seçili ürünler) kaybolan ürünler tüm kazınan ürünleri
+        içeren `catalog` ile belirlenir; böylece seçilmeyen ürünler kaybolmuş
+        sayılmaz.
+        """
+        store = self.snapshot.load(refresh=refresh_snapshot)
+        self.uploader.load_product_index(list(store.values()))
+
+        plan = {"create": [], "update": [], "unchanged": [], "vanished": []}
+
+        for product in products:
+            product_id = self.uploader.find_existing_product_id(product)
+            if not product_id or product_id not in store:
+                plan["create"].append(product)
+                continue
+
+            changes = self.diff(product, store[product_id])
+            if changes:
+                plan["update"].append((product, product_id, changes))
+            else:
+                plan["unchanged"].append(product)
+
+        seen_ids = set()
+        source_hosts = set()
+        for product in products if catalog is None else catalog:
+            source_url = canonical_product_url(product.get("product_url"))
+            if source_url:
+                source_hosts.add(urlparse(source_url).netloc)
+            product_id = self.uploader.find_existing_product_id(product)
+            if product_id:
+                seen_ids.add(product_id)
+
+        # Yalnızca aynı kaynak siteden bu araçla aktarılmış ürünler kaybolmuş sayılır
+        meta_key = self.uploader.source_url_meta_key
+        for product_id, item in store.items():
+            if product_id in seen_ids or item.get("status") == "trash":
+                continue
+            for meta in item.get("meta_data") or []:
+                if meta.get("key") == meta_key and urlparse(meta.get("value") or "").netloc in source_hosts:
+                    plan["vanished"].append(item)
+                    break
+
+        return plan
+
+    def diff(self, product, current):
+        """Ürün ile mağazadaki karşılığı arasında değişen alanları döndürür."""
+        desired = self.uploader.build_product_data(product, self.category_id)
+        changes = {}
+
+        if normalize_text(desired["name"]) != normalize_text(current.get("name")):
+            changes["name"] = desired["name"]
+        if normalize_price(desired["regular_price"]) != normalize_price(current.get("regular_price")):
+            changes["regular_price"] = desired["regular_price"]
+        if normalize_text(desired["description"]) != normalize_text(current.get("description")):
+            changes["description"] = desired["description"]
+            changes["short_description"] = desired["short_description"]
+
+        current_categories = {category["id"] for category in current.get("categories") or []}
+        if {category["id"] for category in desired["categories"]} != current_categories:
+            changes["categories"] = desired["categories"]
+
+        if product.get("image_url"):
+            # Önbellekte bilinen medya ID'si mağazadakiyle aynıysa resim değişmemiştir
+            current_images = {image.get("id") for image in current.get("images") or []}
+            cached = self.uploader.media_cache.lookup_url(product["image_url"]) if self.uploader.media_cache else None
+            if cached:
+                if cached[0] not in current_images:
+                    changes["images"] = True
+            elif not current_images:
+                # Önbellek kanıtı yoksa resim yalnızca resmi olmayan ürünlere eklenir
+                changes["images"] = True
+
+        return changes
+
+    def report(self, plan, vanished_action=None, limit=20):
+        """Planlanan işlemleri okunabilir bir metin olarak döndürür."""
+        lines = [
+            "Senkronizasyon Planı (deneme)",
+            "-----------------------------",
+            f"Oluşturulacak: {len(plan['create'])}",
+            f"Güncellenecek: {len(plan['update'])}",
+            f"Değişmeyen: {len(plan['unchanged'])}",
+            f"Kaynakta bulunmayan: {len(plan['vanished'])} "
+            f"({self.vanished_label(vanished_action)})",
+            ""
+        ]
+
+        for product in plan["create"][:limit]:
+            lines.append(f"+ {product.get('title') or product.get('product_url')}")
+        for product, product_id, changes in plan["update"][:limit]:
+            lines.append(f"~ #{product_id} {product.get('title') or ''}: {', '.join(sorted(changes))}")
+        for item in plan["vanished"][:limit]:
+            lines.append(f"- #{item['id']} {item.get('name', '')}")
+
+        hidden = sum(max(0, len(plan[key]) - limit) for key in ("create", "update", "vanished"))
+        if hidden:
+            lines.append(f"... ve {hidden} işlem daha")
+        return "\n".join(lines)
+
+    def vanished_label(self, vanished_action):
+        """Kaybolan ürünler için seçilen işlemin açıklamasını döndürür."""
+        return {"draft": "taslağa alınacak", "delete": "çöpe taşınacak"}.get(vanished_action, "dokunulmayacak")
+
+    def apply(self, plan, vanished_action=None):
+        """Planı toplu isteklerle uygular; `vanished_action` "draft" veya "delete" olabilir."""
+        items = []
+        results = []
+
+        def add(action, data, product=None):
+            results.append({"product": product, "action": action, "id": None, "response": None, "error": None})
+            items.append((len(results) - 1, action, data))
+
+        try:
+            if plan["create"]:
+                # Plandan sonra başka bir yoldan yüklenen ürünler görüntüye işlenmiştir;
+                # dizin güncel görüntüden yeniden kurulur, böylece kopyalanmaz, güncellenir
+                self.uploader.load_product_index(list(self.snapshot.load().values()))
+            for product in plan["create"]:
+                data = self.uploader.prepare_product(product, self.category_id)
+                action, data = self.uploader.route_product(product, data)
+                add(action, data, product)
+
+            for product, product_id, changes in plan["update"]:
+                data = {key: value for key, value in changes.items() if key != "images"}
+                if changes.get("images"):
+                    image_id = self.uploader.upload_image(product["image_url"], product.get("title"))
+                    if image_id:
+                        data["images"] = [{"id": image_id}]
+                data["id"] = product_id
+                add("update", data, product)
+        finally:
+            self.uploader.shutdown_image_processor()
+
+        if vanished_action == "draft":
+            for item in plan["vanished"]:
+                if item.get("status") != "draft":
+                    add("update", {"id": item["id"], "status": "draft"})
+        elif vanished_action == "delete":
+            for item in plan["vanished"]:
+                add("delete", item["id"])
+
+        self.uploader.send_batches(items, results)
+        self.uploader.save_media_cache()
+        self.snapshot.apply_results(results)
+        return results
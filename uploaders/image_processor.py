@@ -0,0 +1,148 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from config import DEFAULT_CONFIG
+
+# Pillow biçim adı -> içerik türü
+OUTPUT_FORMATS = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+
+def process_image_file(source_path, output_path, max_dimension, output_format, quality):
+    """Resmi boyut sınırına küçültür, meta verileri atar ve istenen biçimde kodlar.
+
+    Süreç havuzunda çalıştığı için modül düzeyindedir. Kaynak dosyadan okur,
+    sonucu `output_path` dosyasına yazar; baytlar süreçler arasında taşınmaz.
+    İçerik türünü ya da işlemin faydası yoksa (ör. animasyonlu resim) None
+    döndürür.
+    """
+    # Pillow yalnızca resim işlenirken yüklenir; uygulama açılışını yavaşlatmaz
+    from PIL import Image, ImageOps
+    with Image.open(source_path) as image:
+        if getattr(image, "n_frames", 1) > 1:
+            return None
+
+        source_format = image.format
+        target = output_format.upper() if output_format and output_format != "keep" else source_format
+        if target not in OUTPUT_FORMATS:
+            target = "JPEG"
+
+        # EXIF yönlendirmesi meta veri atılmadan önce piksellere uygulanır
+        image = ImageOps.exif_transpose(image)
+        resized = max(image.size) > max_dimension
+        if resized:
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        if target == "JPEG" and image.mode != "RGB":
+            if "A" in image.getbands() or "transparency" in image.info:
+                # JPEG saydamlık desteklemez; saydam alanlar beyaz zemine oturtulur
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+        elif target == "WEBP" and image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        if target == "JPEG":
+            image.save(output_path, "JPEG", quality=quality, optimize=True, progressive=True)
+        elif target == "WEBP":
+            image.save(output_path, "WEBP", quality=quality, method=4)
+        else:
+            image.save(output_path, "PNG", optimize=True)
+
+    # Küçültme yapılmadıysa ve biçim aynı kaldıysa daha büyük sonuç işe yaramaz
+    if not resized and target == source_format and os.path.getsize(output_path) >= os.path.getsize(source_path):
+        return None
+    return OUTPUT_FORMATS[target]
+
+
+class ImageProcessor:
+    """Resimleri yüklemeden önce süreç havuzunda küçültür ve yeniden kodlar.
+
+    WordPress her küçük resim boyutunu sunucuda yeniden ürettiğinden kaynak
+    resmi önceden sınırlamak hem aktarımı hem de sunucu işini azaltır.
+    """
+
+    def __init__(self, max_dimension=None, output_format=None, quality=None, workers=None):
+        self.max_dimension = max_dimension or DEFAULT_CONFIG["image_max_dimension"]
+        self.output_format = output_format or DEFAULT_CONFIG["image_output_format"]
+        self.quality = quality or DEFAULT_CONFIG["image_quality"]
+        self.workers = workers or DEFAULT_CONFIG["image_process_workers"]
+        self.executor = None
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Çalıştırma başına tutulan bayt tasarrufu sayaçlarını sıfırlar."""
+        self.stats = {"processed": 0, "skipped": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def get_executor(self):
+        """Süreç havuzunu ilk kullanımda oluşturur.
+
+        Havuz çok iş parçacıklı (Tk) bir süreçte iş parçacıklarından
+        oluşturulduğu için fork yerine spawn kullanılır.
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+            return self.executor
+
+    def process(self, image):
+        """ImageStream içeriğini işler ve akışı yeni içerikle günceller.
+
+        İçerik işleme sürecine dosya yoluyla verilir ve sonuç geçici dosyaya
+        yazılır; resim belleğe alınmaz. Hata durumunda resim olduğu gibi
+        bırakılır; yükleme engellenmez.
+        """
+        size = len(image)
+        fd, output_path = tempfile.mkstemp(suffix=".img")
+        os.close(fd)
+        try:
+            source_path = image.spill()
+            future = self.get_executor().submit(
+                process_image_file, source_path, output_path, self.max_dimension, self.output_format, self.quality)
+            content_type = future.result()
+        except Exception as e:
+            print(f"Resim işlenirken hata: {e}")
+            os.remove(output_path)
+            self.count("failed", size, size)
+            return image
+
+        if content_type is None:
+            os.remove(output_path)
+            self.count("skipped", size, size)
+            return image
+
+        image.replace_file(output_path, content_type)
+        self.count("processed", size, len(image))
+        return image
+
+    def count(self, key, bytes_in, bytes_out):
+        """İşlem sonucunu sayaçlara ekler."""
+        with self.lock:
+            self.stats[key] += 1
+            self.stats["bytes_in"] += bytes_in
+            self.stats["bytes_out"] += bytes_out
+
+    def get_summary(self):
+        """Bayt tasarrufunu okunabilir bir metin olarak döndürür."""
+        with self.lock:
+            stats = dict(self.stats)
+        saved = stats["bytes_in"] - stats["bytes_out"]
+        ratio = saved / stats["bytes_in"] * 100 if stats["bytes_in"] else 0
+        return (f"Resim: {stats['processed']} işlendi, {stats['skipped']} atlandı, "
+                f"{saved / 1024 / 1024:.1f} MB tasarruf (%{ratio:.0f})")
+
+    def shutdown(self):
+        """Süreç havuzunu kapatır; sonraki kullanımda yeniden oluşturulur."""
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown()
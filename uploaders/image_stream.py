@@ -0,0 +1,179 @@
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+from urllib.parse import urlparse
+from config import DEFAULT_CONFIG
+
+
+class ImageTooLargeError(Exception):
+    """Kaynak resim izin verilen boyut sınırını aştığında fırlatılır."""
+
+
+class ImageStream:
+    """Kaynak resmi belleğe tamamen almadan medya isteğine aktaran gövde nesnesi.
+
+    requests, `__iter__` ve `__len__` tanımlı nesneleri gerçek bir
+    Content-Length başlığıyla parça parça gönderir. Kaynak Content-Length
+    bildirmiyorsa (veya içerik sıkıştırılmışsa), `buffer` istenmişse ya da
+    boyut `buffer_above` değerini aşıyorsa resim önce boyutu sınırlı bir
+    geçici dosyaya alınır; bu durumda içerik özeti (sha256) gönderimden önce
+    bilinir, akışla gönderimde ise gönderim bitince hesaplanmış olur.
+    """
+
+    def __init__(self, response, url, max_bytes=None, chunk_size=None, spool_bytes=None, buffer=False,
+                 buffer_above=None):
+        self.response = response
+        self.url = url
+        self.max_bytes = max_bytes or DEFAULT_CONFIG["max_image_bytes"]
+        self.chunk_size = chunk_size or DEFAULT_CONFIG["image_chunk_size"]
+        self.content_type = self.detect_content_type()
+        self._spool = None
+        self._path = None  # İçerik adlandırılmış geçici dosyadaysa yolu; kapatılınca silinir
+        self._hasher = hashlib.sha256()
+        self._hashed = False
+
+        declared = self.declared_length()
+        if declared is not None and declared > self.max_bytes:
+            self.close()
+            raise ImageTooLargeError(f"Resim çok büyük ({declared} bayt): {url}")
+
+        if declared is None or buffer or (buffer_above is not None and declared > buffer_above):
+            self.length = self.spool(spool_bytes or DEFAULT_CONFIG["image_spool_bytes"])
+        else:
+            self.length = declared
+
+    def detect_content_type(self):
+        """Yanıt başlığından, yoksa URL uzantısından resim türünü belirler."""
+        content_type = (self.response.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type.startswith("image/"):
+            return content_type
+        guessed, _ = mimetypes.guess_type(urlparse(self.url).path)
+        return guessed if guessed and guessed.startswith("image/") else "image/jpeg"
+
+    def declared_length(self):
+        """Aktarılacak bayt sayısı önceden biliniyorsa döndürür."""
+        encoding = (self.response.headers.get("Content-Encoding") or "identity").lower()
+        length = self.response.headers.get("Content-Length")
+        if encoding != "identity" or not length or not length.isdigit():
+            return None
+        return int(length)
+
+    def spool(self, spool_bytes):
+        """Resmi boyut sınırıyla geçici dosyaya alır ve içerik özetini hesaplar."""
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        size = 0
+        try:
+            for chunk in self.response.iter_content(self.chunk_size):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise ImageTooLargeError(f"Resim {self.max_bytes} bayt sınırını aşıyor: {self.url}")
+                self._hasher.update(chunk)
+                self._spool.write(chunk)
+        except Exception:
+            self.close()
+            raise
+        finally:
+            self.response.close()
+        self._spool.seek(0)
+        self._hashed = True
+        return size
+
+    def read_all(self):
+        """Geçici dosyaya alınmış içeriğin tamamını döndürür."""
+        self._spool.seek(0)
+        data = self._spool.read()
+        self._spool.seek(0)
+        return data
+
+    def spill(self):
+        """Geçici dosyaya alınmış içeriği adlandırılmış bir dosyaya taşır ve yolunu döndürür.
+
+        Resim işleme süreci içeriği bu yoldan okur; baytlar süreçler arasında
+        kopyalanmaz ve belleğe alınmaz.
+        """
+        if self._path:
+            return self._path
+        fd, path = tempfile.mkstemp(suffix=self.extension)
+        try:
+            with os.fdopen(fd, "wb") as target:
+                self._spool.seek(0)
+                shutil.copyfileobj(self._spool, target, self.chunk_size)
+        except Exception:
+            os.remove(path)
+            raise
+        self._spool.close()
+        self._open_file(path)
+        return path
+
+    def replace_file(self, path, content_type):
+        """Gönderilecek içeriği işlenmiş resmin dosyasıyla değiştirir; dosya kapatılınca silinir.
+
+        İçerik özeti kaynak resme ait kalır; böylece medya önbelleği aynı
+        kaynağı yeniden işlemeden tanır.
+        """
+        self.close_spool()
+        self._open_file(path)
+        self.length = os.path.getsize(path)
+        self.content_type = content_type
+
+    def _open_file(self, path):
+        self._spool = open(path, "rb")
+        self._path = path
+
+    @property
+    def buffered(self):
+        """İçeriğin geçici dosyaya alınıp alınmadığını döndürür."""
+        return self._spool is not None
+
+    @property
+    def sha256(self):
+        """İçerik özetini döndürür; akış henüz tamamlanmadıysa None döndürür."""
+        return self._hasher.hexdigest() if self._hashed else None
+
+    @property
+    def extension(self):
+        """Resim türüne uygun dosya uzantısını döndürür."""
+        # Eski Python sürümleri image/webp için uzantı bilmez
+        extension = mimetypes.guess_extension(self.content_type) or "." + self.content_type.split("/")[-1]
+        return ".jpg" if extension in (".jpe", ".jpeg") else extension
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        try:
+            if self._spool is not None:
+                while True:
+                    chunk = self._spool.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            else:
+                sent = 0
+                for chunk in self.response.iter_content(self.chunk_size):
+                    sent += len(chunk)
+                    if sent > self.length:
+                        raise ImageTooLargeError(f"Kaynak bildirdiğinden fazla veri gönderdi: {self.url}")
+                    self._hasher.update(chunk)
+                    yield chunk
+                self._hashed = sent == self.length
+        finally:
+            self.close()
+
+    def close(self):
+        """Kaynak bağlantısını ve geçici dosyayı kapatır."""
+        self.response.close()
+        self.close_spool()
+
+    def close_spool(self):
+        """Geçici dosyayı kapatır; adlandırılmış dosyaysa siler."""
+        if self._spool is not None:
+            self._spool.close()
+        if self._path:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
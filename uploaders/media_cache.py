@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import threading
+import time
+from config import DEFAULT_CONFIG
+
+
+class MediaCache:
+    """Kaynak resim URL'si -> içerik özeti -> WordPress medya ID'si eşlemesini diskte saklar.
+
+    Medya ID'leri siteye özel olduğundan her WordPress sitesi için ayrı bir
+    dosya tutulur. `verify_after` saniyeden eski kayıtlar kullanılmadan önce
+    sunucuda hâlâ var olup olmadıklarının kontrol edilmesi için işaretlenir.
+    """
+
+    def __init__(self, site, cache_dir=None, verify_after=None, autosave_every=50):
+        self.cache_dir = cache_dir or DEFAULT_CONFIG["media_cache_dir"]
+        self.verify_after = DEFAULT_CONFIG["media_cache_verify_after"] if verify_after is None else verify_after
+        self.autosave_every = autosave_every
+        safe_name = re.sub(r'[^\w.-]', '_', site) or "_"
+        self.path = os.path.join(self.cache_dir, f"{safe_name}.json")
+        self.urls = {}  # kaynak URL -> içerik özeti
+        self.hashes = {}  # içerik özeti -> {"media_id", "checked_at"}
+        self.lock = threading.Lock()
+        self._dirty = 0
+        self.load()
+
+    def load(self):
+        """Kayıtlı eşlemeyi diskten yükler."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Medya önbelleği okunamadı: {e}")
+            return
+        self.urls = data.get("urls", {})
+        self.hashes = data.get("hashes", {})
+
+    def save(self):
+        """Eşlemeyi atomik olarak diske yazar."""
+        with self.lock:
+            if not self._dirty:
+                return
+            data = {"urls": dict(self.urls), "hashes": dict(self.hashes)}
+            self._dirty = 0
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Medya önbelleği yazılamadı: {e}")
+
+    def lookup_url(self, url):
+        """URL için bilinen (medya ID'si, içerik özeti, doğrulama gerekli mi) üçlüsünü döndürür."""
+        with self.lock:
+            content_hash = self.urls.get(url)
+        return self.lookup_hash(content_hash) if content_hash else None
+
+    def lookup_hash(self, content_hash):
+        """İçerik özeti için bilinen (medya ID'si, içerik özeti, doğrulama gerekli mi) üçlüsünü döndürür."""
+        with self.lock:
+            entry = self.hashes.get(content_hash)
+        if not entry:
+            return None
+        stale = time.time() - entry.get("checked_at", 0) > self.verify_after
+        return entry["media_id"], content_hash, stale
+
+    def record(self, url, content_hash, media_id):
+        """Yeni bir URL/özet/medya ID'si eşlemesi ekler."""
+        with self.lock:
+            if url:
+                self.urls[url] = content_hash
+            entry = self.hashes.get(content_hash)
+            if not entry or entry["media_id"] != media_id:
+                self.hashes[content_hash] = {"media_id": media_id, "checked_at": time.time()}
+            self._dirty += 1
+            autosave = self._dirty >= self.autosave_every
+        if autosave:
+            self.save()
+
+    def touch(self, content_hash):
+        """Kaydın sunucuda doğrulandığını işaretler."""
+        with self.lock:
+            if content_hash in self.hashes:
+                self.hashes[content_hash]["checked_at"] = time.time()
+                self._dirty += 1
+
+    def forget_media(self, media_id):
+        """Sunucuda artık bulunmayan medya ID'sine ait kayıtları siler."""
+        with self.lock:
+            stale_hashes = {h for h, entry in self.hashes.items() if entry["media_id"] == media_id}
+            for content_hash in stale_hashes:
+                del self.hashes[content_hash]
+            self.urls = {url: h for url, h in self.urls.items() if h not in stale_hashes}
+            self._dirty += 1
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from config import DEFAULT_CONFIG
+from uploaders.wordpress_uploader import canonical_product_url
+
+# Yazıcı iş parçacığına kapanışı bildiren işaret
+_CLOSE = object()
+
+
+def product_key(product):
+    """Ürünü çalıştırmalar arasında tanımlayan kararlı anahtarı döndürür."""
+    if product.get("sku"):
+        return f"sku:{product['sku']}"
+    source_url = canonical_product_url(product.get("product_url"))
+    if source_url:
+        return f"url:{source_url}"
+    title = (product.get("title") or "").encode("utf-8")
+    return f"title:{hashlib.sha1(title).hexdigest()}"
+
+
+class UploadJournal:
+    """Yükleme işlemlerini yalnızca ekleme yapılan bir JSONL dosyasına yazar.
+
+    Kayıtlar kuyruğa alınır ve tek bir yazıcı iş parçacığı tarafından
+    yazılır; fsync her kayıtta değil, `fsync_every` kayıtta ya da
+    `fsync_interval` saniyede bir toplu olarak yapılır. Böylece günlük toplu
+    API hızında yazarken yükleme hattını yavaşlatmaz.
+    """
+
+    def __init__(self, site, journal_dir=None, fsync_every=None, fsync_interval=None):
+        self.journal_dir = journal_dir or DEFAULT_CONFIG["upload_journal_dir"]
+        self.fsync_every = fsync_every or DEFAULT_CONFIG["journal_fsync_every"]
+        self.fsync_interval = fsync_interval or DEFAULT_CONFIG["journal_fsync_interval"]
+        safe_name = re.sub(r'[^\w.-]', '_', urlparse(site).netloc or site) or "_"
+        self.path = os.path.join(self.journal_dir, f"{safe_name}.jsonl")
+        self.queue = queue.Queue()
+        self.writer = None
+        self.error = None  # Yazıcıyı durduran dosya hatası
+
+    def load(self):
+        """Günlüğü okuyup ürün anahtarı -> son durum sözlüğünü döndürür.
+
+        Devam modunda başlatılmayan her çalıştırma durumu sıfırlar; yarıda
+        kalan bir devam çalıştırması da önceki ilerlemeyi korur.
+        """
+        state = {}
+        if not os.path.exists(self.path):
+            return state
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Çökme sırasında yarım kalan son satır
+                    continue
+                if entry.get("event") == "start":
+                    if not entry.get("resume"):
+                        state = {}
+                    continue
+                key = entry.get("key")
+                if not key:
+                    continue
+                current = state.setdefault(key, {"status": None, "media_id": None, "wc_id": None, "error": None})
+                current["status"] = entry["status"]
+                current["error"] = entry.get("error")
+                for field in ("media_id", "wc_id"):
+                    if entry.get(field) is not None:
+                        current[field] = entry[field]
+        return state
+
+    def start(self, resume=False):
+        """Yazıcı iş parçacığını başlatır ve çalıştırma başlangıcını kaydeder."""
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self.error = None
+        self.writer = threading.Thread(target=self.write_loop, name="journal-writer", daemon=True)
+        self.writer.start()
+        self.queue.put({"event": "start", "resume": resume, "ts": time.time()})
+
+    def record(self, key, status, media_id=None, wc_id=None, error=None):
+        """Bir işlem kaydını yazılmak üzere kuyruğa ekler; beklemez.
+
+        Yazıcı bir dosya hatasıyla durduysa kayıt kaybolmasın diye OSError fırlatır.
+        """
+        if self.error:
+            raise OSError(f"Yükleme günlüğü yazılamıyor: {self.error}")
+        entry = {"key": key, "status": status, "ts": time.time()}
+        if media_id is not None:
+            entry["media_id"] = media_id
+        if wc_id is not None:
+            entry["wc_id"] = wc_id
+        if error:
+            entry["error"] = error[:200]
+        self.queue.put(entry)
+
+    def write_loop(self):
+        """Kuyruktaki kayıtları yazar; dosya hatası (disk dolu, izin) kaydedilip bildirilir."""
+        try:
+            self.write_entries()
+        except OSError as e:
+            self.error = e
+
+    def write_entries(self):
+        """Kuyruktaki kayıtları dosyaya yazar ve fsync'i toplu yapar."""
+        with open(self.path, 'a+b') as f:
+            # Çökmede yarım kalan satır sonraki kayıtla birleşmesin
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            pending = 0
+            last_sync = time.time()
+            while True:
+                try:
+                    entry = self.queue.get(timeout=self.fsync_interval)
+                except queue.Empty:
+                    entry = None
+
+                if entry is _CLOSE:
+                    break
+                if entry is not None:
+                    f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                    pending += 1
+                    # Kuyrukta bekleyen kayıtlar aynı fsync'e dahil edilir
+                    if not self.queue.empty() and pending < self.fsync_every:
+                        continue
+
+                if pending and (pending >= self.fsync_every or time.time() - last_sync >= self.fsync_interval):
+                    f.flush()
+                    os.fsync(f.fileno())
+                    pending = 0
+                    last_sync = time.time()
+
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self):
+        """Bekleyen kayıtları yazar, diske işler ve yazıcıyı durdurur."""
+        if self.writer is None:
+            return
+        self.queue.put(_CLOSE)
+        self.writer.join()
+        self.writer = None
+        if self.error:
+            print(f"Yükleme günlüğü eksik kaldı ({self.error}); devam modu bu çalıştırmanın "
+                  f"ilerlemesini tam göremeyebilir")
@@ -0,0 +1,491 @@
+import queue
+import threading
+import time
+from config import DEFAULT_CONFIG
+from uploaders.upload_journal import product_key
+from uploaders.delta_sync import record_store_uploads
+from cancellation import is_cancelled
+
+# Aşama iş parçacıklarına işin bittiğini bildiren işaret
+_STOP = object()
+
+
+class PipelineStage:
+    """Kendi iş parçacığı havuzu ve sınırlı kuyruğu olan bir yükleme aşaması."""
+
+    def __init__(self, name, label, workers, queue_size):
+        self.name = name
+        self.label = label
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.done = 0
+        self.started_at = None
+        self.lock = threading.Lock()
+
+    def start(self, target):
+        """Aşamanın iş parçacıklarını başlatır."""
+        self.started_at = time.time()
+        for i in range(self.workers):
+            thread = threading.Thread(target=target, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Kuyruğa durdurma işaretlerini ekler ve iş parçacıklarının bitmesini bekler."""
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+
+    def mark_done(self, count=1):
+        """Tamamlanan iş sayısını artırır."""
+        with self.lock:
+            self.done += count
+
+    def rate(self):
+        """Saniye başına tamamlanan iş sayısını döndürür."""
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+class UploadPipeline:
+    """Resim indirme, medya yükleme ve ürün oluşturmayı ayrı aşamalarda eşzamanlı yürütür.
+
+    Her aşamanın kendi iş parçacığı havuzu ve sınırlı kuyruğu vardır; medya
+    ID'si çözülen ürünler hemen ürün aşamasına geçer ve toplu istekler
+    halinde oluşturulur. `journal` verilirse her medya ve ürün sonucu
+    günlüğe yazılır; `resume` açıksa tamamlanmış ürünler atlanır.
+    """
+
+    def __init__(self, uploader, category_id=9, download_workers=None, media_workers=None,
+                 product_workers=None, queue_size=None, flush_interval=None, upsert=False,
+                 journal=None, resume=False):
+        self.uploader = uploader
+        self.category_id = category_id
+        # Çökme anında yanıtı alınamamış ürünler mağazada oluşmuş olabilir;
+        # devam modunda bunların kopyası yerine güncellemesi yapılır
+        self.upsert = upsert or resume
+        self.journal = journal
+        self.resume = resume
+        queue_size = queue_size or DEFAULT_CONFIG["upload_queue_size"]
+        self.flush_interval = flush_interval or DEFAULT_CONFIG["upload_flush_interval"]
+        self.report_interval = 1.0
+
+        self.download_stage = PipelineStage(
+            "download", "İndirme", download_workers or DEFAULT_CONFIG["upload_download_workers"], queue_size)
+        self.media_stage = PipelineStage(
+            "media", "Medya", media_workers or uploader.media_workers, queue_size)
+        self.product_stage = PipelineStage(
+            "product", "Ürün", product_workers or DEFAULT_CONFIG["upload_product_workers"], queue_size)
+        self.stages = [self.download_stage, self.media_stage, self.product_stage]
+
+        self.results = []
+        self.keys = []
+        self.total = 0
+        self.resumed = 0  # Günlüğe göre daha önce tamamlanmış ürün sayısı
+        self.cancel_token = None
+        self.cache_hits = 0  # Medya önbelleğinden ya da çalıştırma içinde karşılanan resim sayısı
+        # Resim URL'si / içerik özeti -> bu çalıştırmadaki yükleme kaydı; aynı
+        # resmi paylaşan ürünler ilk yüklemenin medya ID'sini bekler
+        self.inflight = {}
+        self.inflight_lock = threading.Lock()
+        # Kaynak anahtarı -> oluşturma isteği henüz yanıtlanmamış ürünün bekleme olayı
+        self.creating = {}
+        self.creating_lock = threading.Lock()
+
+    def run(self, products, cancel_token=None):
+        """Ürünleri yükler; upload_products_batch ile aynı biçimde sonuç listesi döndürür.
+        
+        `cancel_token` iptal edilirse yeni iş başlatılmaz, sıradaki ürünler
+        atlanır ve o ana kadarki sonuçlar döndürülür.
+        """
+        self.cancel_token = cancel_token
+        self.results = [
+            {"product": product, "id": None, "media_id": None, "response": None, "error": None}
+            for product in products
+        ]
+        self.keys = [product_key(product) for product in products]
+        self.inflight = {}
+        self.creating = {}
+        
+        state = {}
+        if self.journal and self.resume:
+            state = self.journal.load()
+        
+        # Tamamlanan ürünler atlanır; medyası yüklenmiş olanlar indirilmez
+        pending = []
+        for index, key in enumerate(self.keys):
+            entry = state.get(key)
+            if entry and entry["status"] == "done":
+                self.results[index]["id"] = entry["wc_id"]
+                self.results[index]["media_id"] = entry["media_id"]
+                self.resumed += 1
+            else:
+                pending.append((index, entry["media_id"] if entry else None))
+        self.total = len(pending)
+        
+        processor = self.uploader.image_processor
+        if processor:
+            processor.reset_stats()
+
+        reporting = threading.Event()
+        reporter = threading.Thread(target=self.report_loop, args=(reporting,), daemon=True)
+        reporter.start()
+
+        try:
+            # Mağaza dizini alınamazsa da günlük kapatılır ve medya önbelleği kaydedilir
+            if self.journal:
+                self.journal.start(self.resume)
+            if self.upsert:
+                # Var olan ürünler tek seferde çekilir; her ürün için ayrı sorgu yapılmaz
+                self.uploader.load_product_index()
+
+            self.download_stage.start(self.download_worker)
+            self.media_stage.start(self.media_worker)
+            self.product_stage.start(self.product_worker)
+
+            for index, media_id in pending:
+                if is_cancelled(self.cancel_token):
+                    self.results[index]["error"] = "İptal edildi"
+                    continue
+                product = products[index]
+                if media_id:
+                    self.product_stage.queue.put((index, media_id))
+                elif product.get("image_url"):
+                    self.download_stage.queue.put((index, product))
+                else:
+                    self.product_stage.queue.put((index, None))
+
+            # Aşamaları sırayla kapat; her aşama önceki aşamanın çıktısını tüketir
+            for stage in self.stages:
+                stage.stop()
+        finally:
+            reporting.set()
+            reporter.join()
+            self.uploader.save_media_cache()
+            # Senkronizasyon planı yeni ürünleri eski görüntüde bulamayıp kopyalamasın
+            record_store_uploads(self.uploader, self.results)
+            if processor:
+                processor.shutdown()
+            if self.journal:
+                self.journal.close()
+
+        self.report()
+        return self.results
+
+    def download_worker(self):
+        """Kaynak resimleri indirir ve medya aşamasına aktarır."""
+        while True:
+            item = self.download_stage.queue.get()
+            if item is _STOP:
+                return
+            index, product = item
+            if self.skip_if_cancelled(index):
+                continue
+            try:
+                self.download_item(index, product["image_url"])
+            except Exception as e:
+                # İş parçacığı ölürse kuyruklar tıkanır; hatayı ürüne yaz ve devam et
+                self.fail_item(self.download_stage, index, e)
+
+    def download_item(self, index, image_url):
+        """Tek bir ürünün resmini indirir; medya ID'si biliniyorsa doğrudan ürün aşamasına geçer."""
+        # Daha önce yüklenmiş URL'ler indirilmez
+        media_id = self.uploader.find_cached_media(image_url)
+        if media_id:
+            self.count_cache_hit()
+            self.download_stage.mark_done()
+            self.product_stage.queue.put((index, media_id))
+            return
+        
+        # Aynı resim bu çalıştırmada başka bir ürün için yükleniyorsa onun sonucu beklenir
+        entry, media_id = self.claim_media(image_url, index)
+        if entry is None:
+            self.count_cache_hit()
+            self.download_stage.mark_done()
+            if media_id:
+                self.product_stage.queue.put((index, media_id))
+            return
+        
+        try:
+            image = self.uploader.download_image(image_url)
+            if image is None:
+                # Resim indirilemezse ürün resimsiz oluşturulur
+                self.download_stage.mark_done()
+                self.release_media(entry, None)
+                self.product_stage.queue.put((index, None))
+                return
+            
+            # Aynı içerik başka bir URL'den yüklenmiş olabilir
+            try:
+                media_id = self.uploader.find_cached_media(image_url, image)
+                if not media_id and image.sha256 and not self.link_media(entry, image.sha256, index):
+                    # Aynı içerik başka bir URL'den şu anda yükleniyor
+                    image.close()
+                    self.count_cache_hit()
+                    self.download_stage.mark_done()
+                    return
+            except Exception:
+                image.close()
+                raise
+        except Exception:
+            self.release_media(entry, None)
+            raise
+        
+        self.download_stage.mark_done()
+        if media_id:
+            image.close()
+            self.count_cache_hit()
+            self.release_media(entry, media_id)
+            self.product_stage.queue.put((index, media_id))
+        else:
+            self.media_stage.queue.put((index, image, entry))
+
+    def claim_media(self, image_url, index):
+        """Resmin bu çalıştırmadaki yüklemesini üstlenir.
+        
+        Resim başka bir ürün için yükleniyorsa ürün bekleyenlere eklenir ve
+        (None, None), daha önce yüklendiyse (None, medya ID'si), yüklemeyi bu
+        ürün üstlenirse (kayıt, None) döndürülür.
+        """
+        with self.inflight_lock:
+            entry = self.inflight.get(image_url)
+            if entry is None:
+                entry = {"keys": [image_url], "waiters": [], "media_id": None}
+                self.inflight[image_url] = entry
+                return entry, None
+            if entry["media_id"]:
+                return None, entry["media_id"]
+            entry["waiters"].append(index)
+            return None, None
+
+    def link_media(self, entry, content_hash, index):
+        """İndirilen içeriğin özetini kayda bağlar.
+        
+        Aynı içerik başka bir URL'den yükleniyorsa bu kaydı bekleyenler ona
+        aktarılır ve False döndürülür; ürün de bekleyenlere eklenir.
+        """
+        with self.inflight_lock:
+            other = self.inflight.get(content_hash)
+            if other is None:
+                entry["keys"].append(content_hash)
+                self.inflight[content_hash] = entry
+                return True
+            if other["media_id"]:
+                # Çalıştırma içinde yüklenmiş içerik; bekleyenlerle birlikte hemen çözülür
+                waiters = [index] + entry["waiters"]
+                media_id = other["media_id"]
+            else:
+                other["waiters"].append(index)
+                other["waiters"].extend(entry["waiters"])
+                waiters, media_id = [], None
+            for key in entry["keys"]:
+                self.inflight[key] = other
+            other["keys"].extend(entry["keys"])
+        for waiter in waiters:
+            self.product_stage.queue.put((waiter, media_id))
+        return False
+
+    def release_media(self, entry, media_id):
+        """Yükleme sonucunu kayda yazar ve bekleyen ürünleri ürün aşamasına aktarır.
+        
+        Yükleme başarısızsa kayıt silinir; sonraki ürünler yeniden dener.
+        """
+        with self.inflight_lock:
+            waiters, entry["waiters"] = entry["waiters"], []
+            if media_id:
+                entry["media_id"] = media_id
+            else:
+                for key in entry["keys"]:
+                    if self.inflight.get(key) is entry:
+                        del self.inflight[key]
+        for index in waiters:
+            if self.journal and media_id:
+                try:
+                    self.journal.record(self.keys[index], "media", media_id=media_id)
+                except Exception as e:
+                    print(f"Yükleme günlüğüne yazılamadı: {e}")
+            self.product_stage.queue.put((index, media_id))
+
+    def skip_if_cancelled(self, index):
+        """İş iptal edildiyse ürünü atlanmış olarak işaretler ve True döndürür."""
+        if not is_cancelled(self.cancel_token):
+            return False
+        self.results[index]["error"] = "İptal edildi"
+        return True
+    
+    def fail_item(self, stage, index, error):
+        """Aşamada hata veren ürünü hatalı olarak işaretler; ürün sonraki aşamalara geçmez."""
+        print(f"Yükleme hattında hata ({stage.label}): {error}")
+        self.results[index]["error"] = str(error)
+        stage.mark_done()
+        self.record_result(index)
+
+    def record_result(self, index):
+        """Ürünün son durumunu günlüğe yazar; günlük hatası hattı durdurmaz."""
+        if not self.journal:
+            return
+        result = self.results[index]
+        # Ürün oluşup bir kısmı yazılamadıysa (ör. fiyat) devam edildiğinde yeniden denenir
+        status = "done" if result["id"] and not result["error"] else "failed"
+        try:
+            self.journal.record(self.keys[index], status, result["media_id"], result["id"], result["error"])
+        except Exception as e:
+            print(f"Yükleme günlüğüne yazılamadı: {e}")
+
+    def count_cache_hit(self):
+        """Medya önbelleğinden karşılanan resim sayısını artırır."""
+        with self.download_stage.lock:
+            self.cache_hits += 1
+
+    def media_worker(self):
+        """İndirilen resimleri medya kütüphanesine yükler ve ürün aşamasına aktarır."""
+        while True:
+            item = self.media_stage.queue.get()
+            if item is _STOP:
+                return
+            index, image, entry = item
+            if self.skip_if_cancelled(index):
+                image.close()
+                self.release_media(entry, None)
+                continue
+            try:
+                product = self.results[index]["product"]
+                media_id = self.uploader.upload_media(image, product.get("title"), product["image_url"])
+            except Exception as e:
+                image.close()
+                self.release_media(entry, None)
+                self.fail_item(self.media_stage, index, e)
+                continue
+            self.media_stage.mark_done()
+            self.release_media(entry, media_id)
+            if self.journal and media_id:
+                try:
+                    self.journal.record(self.keys[index], "media", media_id=media_id)
+                except Exception as e:
+                    print(f"Yükleme günlüğüne yazılamadı: {e}")
+            self.product_stage.queue.put((index, media_id))
+
+    def product_worker(self):
+        """Medya ID'si çözülen ürünleri toplayıp toplu istekler halinde oluşturur."""
+        batch = []
+        while True:
+            try:
+                item = self.product_stage.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Kuyruk boşaldı; bekleyen ürünleri gecikmeden gönder
+                self.flush(batch)
+                batch = []
+                continue
+
+            if item is _STOP:
+                self.flush(batch)
+                return
+
+            index, media_id = item
+            if self.skip_if_cancelled(index):
+                continue
+            self.results[index]["media_id"] = media_id
+            product = self.results[index]["product"]
+            claimed = False
+            try:
+                product_data = self.uploader.build_product_data(product, self.category_id, media_id)
+                if self.upsert:
+                    batch = self.wait_for_pending_create(index, batch)
+                    claimed = True
+                    action, product_data = self.uploader.route_product(product, product_data)
+                    if action != "create":
+                        self.release_create(index)
+                else:
+                    action = "create"
+            except Exception as e:
+                if claimed:
+                    self.release_create(index)
+                self.fail_item(self.product_stage, index, e)
+                continue
+            batch.append((index, action, product_data))
+            if len(batch) >= self.uploader.batch_size:
+                self.flush(batch)
+                batch = []
+
+    def wait_for_pending_create(self, index, batch):
+        """Aynı ürün bu çalıştırmada oluşturulmak üzereyse oluşturulmasını bekler.
+        
+        Ürünün kaynak anahtarını oluşturma için ayırır; ayrılan anahtar ürün
+        gönderildiğinde ya da güncelleme olarak yönlendirildiğinde serbest
+        bırakılır. Beklemeden önce biriken ürünler gönderilir; böylece iki iş
+        parçacığı birbirini beklemez. Gönderilmemiş ürün listesini döndürür.
+        """
+        key = self.keys[index]
+        if not key.startswith(("sku:", "url:")):
+            # SKU'su ya da URL'si olmayan ürünler mağazada eşleştirilemez
+            return batch
+        while True:
+            with self.creating_lock:
+                pending = self.creating.get(key)
+                if pending is None:
+                    self.creating[key] = threading.Event()
+                    return batch
+            self.flush(batch)
+            batch = []
+            pending.wait()
+
+    def release_create(self, index):
+        """Ürünün kaynak anahtarı için bekleyenleri serbest bırakır."""
+        with self.creating_lock:
+            pending = self.creating.pop(self.keys[index], None)
+        if pending:
+            pending.set()
+
+    def flush(self, batch):
+        """Biriken ürünleri tek bir toplu istekle gönderir."""
+        if not batch:
+            return
+        try:
+            self.uploader.send_batch(batch, self.results)
+        except Exception as e:
+            # İş parçacığı ölürse kuyruk tıkanır; hatayı ürünlere yaz ve devam et
+            for index, _, _ in batch:
+                self.results[index]["error"] = str(e)
+        self.product_stage.mark_done(len(batch))
+        
+        for index, action, _ in batch:
+            result = self.results[index]
+            if action == "create":
+                if result["id"]:
+                    # Aynı kaynak URL'si çalıştırmada tekrar gelirse güncellenir, yeniden oluşturulmaz
+                    self.uploader.remember_product(result["product"], result["id"])
+                self.release_create(index)
+            self.record_result(index)
+
+    def report_loop(self, stopped):
+        """Aşama hızlarını düzenli aralıklarla bildirir."""
+        while not stopped.wait(self.report_interval):
+            self.report()
+
+    def report(self):
+        """Aşama başına ilerleme ve hız bilgisini set_progress_callback üzerinden bildirir."""
+        parts = [
+            f"{stage.label}: {stage.done} ({stage.rate():.1f}/sn)"
+            for stage in self.stages
+        ]
+        if self.cache_hits:
+            parts.append(f"Önbellek: {self.cache_hits}")
+        if self.resumed:
+            parts.append(f"Atlanan: {self.resumed}")
+        if self.uploader.image_processor:
+            parts.append(self.uploader.image_processor.get_summary())
+        self.uploader.update_progress(" | ".join(parts), self.product_stage.done, self.total)
+
+    def get_stage_stats(self):
+        """Aşama başına tamamlanan iş sayısı ve hızını döndürür."""
+        stats = {
+            stage.name: {"done": stage.done, "rate": round(stage.rate(), 2), "workers": stage.workers}
+            for stage in self.stages
+        }
+        stats["media_cache_hits"] = self.cache_hits
+        stats["resumed"] = self.resumed
+        if self.uploader.image_processor:
+            stats["image_processing"] = dict(self.uploader.image_processor.stats)
+        return stats
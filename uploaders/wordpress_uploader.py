@@ -1,7 +1,27 @@
 import requests
 import re
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from config import DEFAULT_CONFIG, SSL_DISABLED_DOMAINS
+from uploaders.image_stream import ImageStream, ImageTooLargeError
+from uploaders.image_processor import ImageProcessor
+from uploaders.media_cache import MediaCache
+
+def canonical_product_url(url):
+    """Ürün URL'sini karşılaştırma için standart biçime getirir.
+    
+    Şema ve host küçük harfe çevrilir, parça (#) ve izleme parametreleri
+    atılır, sorgu parametreleri sıralanır ve sondaki eğik çizgi kaldırılır.
+    """
+    if not url:
+        return ""
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    )
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, '', urlencode(query), ''))
 
 class WordPressUploader:
     def __init__(self, wp_url, username, password):
@@ -9,9 +29,35 @@ class WordPressUploader:
         self.username = username
         self.password = password
         self.api_url = f"{self.wp_url}/wp-json/wp/v2"
+        self.wc_api_url = f"{self.wp_url}/wp-json/wc/v3"
+        self.batch_size = DEFAULT_CONFIG["wc_batch_size"]
+        self.batch_timeout = DEFAULT_CONFIG["wc_batch_timeout"]
+        # Yükleme hattının medya aşamasındaki iş parçacığı sayısı
+        self.media_workers = DEFAULT_CONFIG["upload_media_workers"]
+        # (bağlantı, okuma) zaman aşımı; takılan sunucu medya iş parçacığını ve kaynak bağlantısını tutmasın
+        self.media_timeout = (DEFAULT_CONFIG["request_timeout"], DEFAULT_CONFIG["media_upload_timeout"])
         self.verify_ssl = DEFAULT_CONFIG["verify_ssl"]
+        self.max_image_bytes = DEFAULT_CONFIG["max_image_bytes"]
         self.progress_callback = None
         
+        # Var olan ürünlerin SKU ve kaynak URL dizini (upsert modu için)
+        self.product_index = None
+        self.source_url_meta_key = DEFAULT_CONFIG["source_url_meta_key"]
+        
+        # Aynı resmin tekrar yüklenmesini önleyen kalıcı medya dizini
+        self.media_cache = MediaCache(urlparse(self.wp_url).netloc) if DEFAULT_CONFIG["media_cache_enabled"] else None
+        
+        # Ürünleri kaynak kategorilerine atayan eşleme (CategoryMapper)
+        self.category_mapper = None
+        
+        # Resimleri yüklemeden önce küçülten ve yeniden kodlayan süreç havuzu
+        self.image_processor = ImageProcessor() if DEFAULT_CONFIG["image_processing_enabled"] else None
+        
+        # Resim işleme tüm içeriği gerektirir; biçim dönüştürülmüyorsa boyutu bilinen küçük
+        # resimler işlenmeden akışla yüklenir. İçerik özeti akış sırasında hesaplanır.
+        self.buffer_images = self.image_processor is not None and self.image_processor.output_format != "keep"
+        self.buffer_images_above = DEFAULT_CONFIG["image_process_min_bytes"] if self.image_processor else None
+        
         # WordPress sitesi için SSL doğrulamasını kontrol et
         domain = urlparse(wp_url).netloc
         for disabled_domain in SSL_DISABLED_DOMAINS:
@@ -23,38 +69,33 @@ class WordPressUploader:
         """İlerleme durumunu bildirmek için callback fonksiyonu ayarlar."""
         self.progress_callback = callback
     
-    def update_progress(self, message):
+    def update_progress(self, message, current=0, total=0):
         """İlerleme durumunu günceller."""
         if self.progress_callback:
-            self.progress_callback(message)
+            self.progress_callback(message, current, total)
         else:
             print(message)
     
-    def upload_product(self, product, category_id=9):
-        """Ürünü WordPress'e yükler."""
-        # WooCommerce API kullanılacak
-        wc_api_url = f"{self.wp_url}/wp-json/wc/v3/products"
-        
-        # Temel kimlik doğrulama
-        auth = (self.username, self.password)
-        
-        # Fiyatı temizle ve sayısal formata dönüştür
-        price = product["price"]
-        if price:
-            # Fiyattan para birimi sembollerini ve boşlukları temizle
-            price = re.sub(r'[^\d.,]', '', price)
-            # Virgülü noktaya çevir (gerekirse)
-            price = price.replace(',', '.')
-        else:
-            price = "0"
-        
-        # Ürün verilerini hazırla
+    def clean_price(self, price):
+        """Fiyatı temizler ve sayısal formata dönüştürür."""
+        if not price:
+            return "0"
+        # Fiyattan para birimi sembollerini ve boşlukları temizle
+        price = re.sub(r'[^\d.,]', '', price)
+        # Virgülü noktaya çevir (gerekirse)
+        return price.replace(',', '.')
+    
+    def build_product_data(self, product, category_id=9, image_id=None):
+        """WooCommerce API'sine gönderilecek ürün verisini hazırlar."""
+        if self.category_mapper:
+            category_id = self.category_mapper.category_for(product, category_id)
+        description = product.get("description") or ""
         product_data = {
-            "name": product["title"] or "Ürün Adı Bulunamadı",
+            "name": product.get("title") or "Ürün Adı Bulunamadı",
             "type": "simple",
-            "regular_price": price,
-            "description": product["description"] or "",
-            "short_description": (product["description"] or "")[:100] + "..." if len(product["description"] or "") > 100 else (product["description"] or ""),
+            "regular_price": self.clean_price(product.get("price")),
+            "description": description,
+            "short_description": description[:100] + "..." if len(description) > 100 else description,
             "categories": [
                 {
                     "id": int(category_id)
@@ -63,12 +104,41 @@ class WordPressUploader:
             "images": []
         }
         
-        # Eğer ürün resmi varsa, önce resmi yükle
-        if product["image_url"]:
+        if image_id:
+            product_data["images"].append({"id": image_id})
+        
+        if product.get("sku"):
+            product_data["sku"] = product["sku"]
+        
+        # Sonraki çalıştırmalarda ürünü bulabilmek için kaynak URL'yi sakla
+        source_url = canonical_product_url(product.get("product_url"))
+        if source_url:
+            product_data["meta_data"] = [{"key": self.source_url_meta_key, "value": source_url}]
+        
+        return product_data
+    
+    def prepare_product(self, product, category_id=9):
+        """Ürün resmini yükler ve ürün verisini hazırlar."""
+        image_id = None
+        if product.get("image_url"):
             self.update_progress(f"Resim yükleniyor: {product['image_url']}")
-            image_id = self.upload_image(product["image_url"], product["title"])
-            if image_id:
-                product_data["images"].append({"id": image_id})
+            image_id = self.upload_image(product["image_url"], product.get("title"))
+        return self.build_product_data(product, category_id, image_id)
+    
+    def upload_product(self, product, category_id=9):
+        """Ürünü WordPress'e yükler.
+        
+        Resim işleme havuzu çağrılar arasında açık kalır; ürünleri tek tek
+        yükleyen çağıran çalıştırma sonunda shutdown_image_processor() çağırır.
+        """
+        # WooCommerce API kullanılacak
+        wc_api_url = f"{self.wc_api_url}/products"
+        
+        # Temel kimlik doğrulama
+        auth = (self.username, self.password)
+        
+        # Ürün verilerini hazırla (varsa önce resmi yükle)
+        product_data = self.prepare_product(product, category_id)
         
         # Ürünü WooCommerce'e ekle
         self.update_progress(f"Ürün yükleniyor: {product['title']}")
@@ -91,23 +161,378 @@ class WordPressUploader:
             self.update_progress(f"Ürün yüklenirken hata: {e}")
             return None
     
+    def upload_products_batch(self, products, category_id=9, upsert=False):
+        """Ürünleri /wc/v3/products/batch uç noktasıyla toplu olarak yükler.
+        
+        `upsert` açıksa mağazada SKU'su veya kaynak URL'si eşleşen ürünler
+        yeniden oluşturulmaz, güncellenir. Her ürün için {"product", "id",
+        "response", "error"} sözlüğü içeren, girdiyle aynı sıradaki sonuç
+        listesini döndürür.
+        """
+        results = [{"product": product, "id": None, "response": None, "error": None} for product in products]
+        total = len(products)
+        
+        if upsert:
+            self.load_product_index()
+        if self.image_processor:
+            self.image_processor.reset_stats()
+        
+        # Resimleri yükle ve ürün verilerini hazırla
+        prepared = []
+        try:
+            for i, product in enumerate(products):
+                self.update_progress(f"Ürün hazırlanıyor: {product.get('title') or 'Ürün'} ({i+1}/{total})", i + 1, total)
+                prepared.append((i, self.prepare_product(product, category_id)))
+        finally:
+            self.shutdown_image_processor()
+        
+        if upsert:
+            self.send_upserts(products, prepared, results)
+        else:
+            self.send_batches([(i, "create", product_data) for i, product_data in prepared], results)
+        self.save_media_cache()
+        # Senkronizasyon planı yeni ürünleri eski görüntüde bulamayıp kopyalamasın
+        from uploaders.delta_sync import record_store_uploads
+        record_store_uploads(self, results)
+        
+        uploaded = sum(1 for result in results if result["id"])
+        message = f"Toplu yükleme tamamlandı: {uploaded}/{total} ürün yüklendi."
+        if self.image_processor:
+            message += f" {self.image_processor.get_summary()}"
+        self.update_progress(message, total, total)
+        return results
+    
+    def send_upserts(self, products, prepared, results):
+        """Ürünleri mağaza dizinine göre oluşturur ya da günceller.
+        
+        Aynı SKU'ya veya kaynak URL'ye sahip ürünlerden yalnızca ilki
+        oluşturulur; diğerleri oluşturma tamamlandıktan sonraki turda
+        güncelleme olarak gönderilir, böylece mağazada kopya oluşmaz.
+        """
+        from uploaders.upload_journal import product_key
+        
+        queue = prepared
+        while queue:
+            items = []
+            deferred = []
+            planned = set()
+            for i, product_data in queue:
+                action, data = self.route_product(products[i], product_data)
+                key = product_key(products[i])
+                if action == "create" and key.startswith(("sku:", "url:")):
+                    if key in planned:
+                        deferred.append((i, product_data))
+                        continue
+                    planned.add(key)
+                items.append((i, action, data))
+            
+            self.send_batches(items, results)
+            for i, action, _ in items:
+                if action == "create" and results[i]["id"]:
+                    self.remember_product(products[i], results[i]["id"])
+            queue = deferred
+    
+    def fetch_existing_products(self, fields="id,sku,meta_data"):
+        """Mağazadaki tüm ürünleri sayfa başına 100 ürünle çeker."""
+        return self.fetch_collection("products", fields, {"status": "any"}, "Mağazadaki ürünler alınıyor")
+    
+    def fetch_collection(self, endpoint, fields, params=None, label="Kayıtlar alınıyor"):
+        """Bir WooCommerce koleksiyonunun tüm sayfalarını çeker.
+        
+        İlk sayfadan toplam sayfa sayısı öğrenildikten sonra kalan sayfalar
+        paralel olarak istenir.
+        """
+        def fetch_page(page):
+            response = requests.get(
+                f"{self.wc_api_url}/{endpoint}",
+                params=dict(params or {}, per_page=100, page=page, orderby="id", order="asc", _fields=fields),
+                auth=(self.username, self.password),
+                verify=self.verify_ssl,
+                timeout=self.batch_timeout
+            )
+            response.raise_for_status()
+            return response
+        
+        first = fetch_page(1)
+        items = first.json()
+        total_pages = int(first.headers.get("X-WP-TotalPages", 1) or 1)
+        self.update_progress(f"{label}: 1/{total_pages} sayfa", 1, total_pages)
+        
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=DEFAULT_CONFIG["per_host_connections"]) as executor:
+                for page, response in enumerate(executor.map(fetch_page, range(2, total_pages + 1)), start=2):
+                    items.extend(response.json())
+                    self.update_progress(f"{label}: {page}/{total_pages} sayfa", page, total_pages)
+        
+        return items
+    
+    def load_product_index(self, existing=None):
+        """Var olan ürünlerden SKU ve kaynak URL -> ürün ID'si dizinini oluşturur."""
+        if existing is None:
+            existing = self.fetch_existing_products()
+        
+        # "meta": ürün ID'si -> kaynak URL meta kaydının ID'si (XML-RPC düzenlemelerinde gerekir)
+        index = {"sku": {}, "url": {}, "meta": {}}
+        for item in existing:
+            if item.get("sku"):
+                index["sku"][item["sku"]] = item["id"]
+            for meta in item.get("meta_data") or []:
+                if meta.get("key") == self.source_url_meta_key and meta.get("value"):
+                    index["url"][canonical_product_url(meta["value"])] = item["id"]
+                    if meta.get("id"):
+                        index["meta"][item["id"]] = meta["id"]
+        
+        self.product_index = index
+        self.update_progress(f"Mağaza dizini hazır: {len(existing)} ürün")
+        return index
+    
+    def find_existing_product_id(self, product):
+        """Ürünün mağazadaki karşılığının ID'sini SKU'ya, yoksa kaynak URL'ye göre bulur."""
+        if not self.product_index:
+            return None
+        if product.get("sku") and product["sku"] in self.product_index["sku"]:
+            return self.product_index["sku"][product["sku"]]
+        return self.product_index["url"].get(canonical_product_url(product.get("product_url")))
+    
+    def remember_product(self, product, product_id):
+        """Bu çalıştırmada oluşturulan ürünü mağaza dizinine ekler."""
+        if not self.product_index or not product_id:
+            return
+        if product.get("sku"):
+            self.product_index["sku"][product["sku"]] = product_id
+        if product.get("product_url"):
+            self.product_index["url"][canonical_product_url(product["product_url"])] = product_id
+    
+    def route_product(self, product, product_data):
+        """Ürün mağazada varsa güncelleme, yoksa oluşturma işlemi döndürür."""
+        product_id = self.find_existing_product_id(product)
+        if product_id:
+            return "update", dict(product_data, id=product_id)
+        return "create", product_data
+    
+    def send_batches(self, items, results):
+        """(sonuç indeksi, işlem, veri) öğelerini batch_size'lık gruplar halinde gönderir."""
+        done = 0
+        while done < len(items):
+            chunk = items[done:done + self.batch_size]
+            self.send_batch(chunk, results)
+            done += len(chunk)
+            self.update_progress(f"Toplu istek gönderildi: {done}/{len(items)}", done, len(items))
+    
+    def send_batch(self, items, results):
+        """Tek bir toplu isteği gönderir; sunucu boyutu reddederse ikiye bölerek yeniden dener.
+        
+        Zaman aşımı ve 502/504 yanıtlarında istek yeniden gönderilmez: sunucu
+        yazmaları çoğu zaman tamamlamıştır ve oluşturma işlemleri tekrarlanırsa
+        ürünler çoğalır. Bu öğeler sonucu bilinmeyen hata olarak işaretlenir;
+        kurtarma yükleme günlüğü ve sonraki güncelleme eşleştirmesine bırakılır.
+        """
+        payload = {}
+        for _, action, data in items:
+            payload.setdefault(action, []).append(data)
+        
+        try:
+            response = requests.post(
+                f"{self.wc_api_url}/products/batch",
+                json=payload,
+                auth=(self.username, self.password),
+                verify=self.verify_ssl,
+                timeout=self.batch_timeout
+            )
+        except requests.Timeout as e:
+            self.mark_outcome_unknown(items, results, f"Zaman aşımı: {e}")
+            return
+        except Exception as e:
+            for index, _, _ in items:
+                results[index]["error"] = str(e)
+            return
+        
+        if response.status_code not in [200, 201]:
+            if len(items) > 1 and self.is_batch_too_large(response):
+                return self.split_batch(items, results)
+            if response.status_code in [502, 504]:
+                self.mark_outcome_unknown(items, results, f"{response.status_code} - ağ geçidi yanıt vermedi")
+                return
+            for index, _, _ in items:
+                results[index]["error"] = f"{response.status_code} - {response.text[:200]}"
+            return
+        
+        try:
+            body = response.json()
+        except ValueError:
+            for index, _, _ in items:
+                results[index]["error"] = f"Geçersiz yanıt: {response.text[:200]}"
+            return
+        
+        # Yanıttaki öğeler her işlem için gönderim sırasıyla döner
+        positions = {}
+        for index, action, _ in items:
+            position = positions.get(action, 0)
+            positions[action] = position + 1
+            
+            returned = body.get(action) or []
+            item = returned[position] if position < len(returned) else None
+            if not item:
+                results[index]["error"] = "Sunucu bu öğe için yanıt döndürmedi"
+            elif item.get("error"):
+                error = item["error"]
+                results[index]["error"] = f"{error.get('code', '')}: {error.get('message', '')}"
+            else:
+                results[index]["id"] = item.get("id")
+                results[index]["response"] = item
+    
+    def is_batch_too_large(self, response):
+        """Yanıtın toplu istek boyutunun reddedildiğini belirtip belirtmediğini kontrol eder."""
+        if response.status_code == 413:
+            return True
+        if response.status_code == 400:
+            try:
+                code = response.json().get("code", "")
+            except ValueError:
+                return False
+            return "too_large" in code
+        return False
+    
+    def mark_outcome_unknown(self, items, results, reason):
+        """Sunucuda uygulanıp uygulanmadığı bilinmeyen öğeleri hatalı olarak işaretler."""
+        self.update_progress(f"Toplu isteğin sonucu bilinmiyor, yeniden gönderilmeyecek: {reason}")
+        for index, _, _ in items:
+            results[index]["error"] = f"Sonuç bilinmiyor ({reason}); ürünler yeniden yüklenirken mağazada eşleştirilir"
+    
+    def split_batch(self, items, results):
+        """Toplu isteği ikiye böler ve sonraki isteklerin boyutunu da küçültür."""
+        half = len(items) // 2
+        self.batch_size = max(1, min(self.batch_size, half))
+        self.update_progress(f"Toplu istek çok büyük, {half} öğelik gruplara bölünüyor")
+        self.send_batch(items[:half], results)
+        self.send_batch(items[half:], results)
+    
     def upload_image(self, image_url, title):
-        """Ürün resmini WordPress'e yükler ve medya ID'sini döndürür."""
+        """Ürün resmini WordPress'e yükler ve medya ID'sini döndürür.
+        
+        Daha önce yüklenmiş resimler (aynı URL ya da aynı içerik) yeniden
+        yüklenmez; medya önbelleğindeki ID kullanılır.
+        """
+        media_id = self.find_cached_media(image_url)
+        if media_id:
+            return media_id
+        
+        image = self.download_image(image_url)
+        if image is None:
+            return None
+        
+        media_id = self.find_cached_media(image_url, image)
+        if media_id:
+            image.close()
+            return media_id
+        
+        return self.upload_media(image, title, image_url)
+    
+    def find_cached_media(self, image_url, image=None):
+        """Resim için önbellekte bilinen ve sunucuda hâlâ var olan medya ID'sini döndürür.
+        
+        `image` verilmezse URL'ye, verilirse indirilen içeriğin özetine göre arar.
+        """
+        if not self.media_cache:
+            return None
+        
+        if image is None:
+            entry = self.media_cache.lookup_url(image_url)
+        elif image.sha256:
+            entry = self.media_cache.lookup_hash(image.sha256)
+        else:
+            return None
+        
+        if not entry:
+            return None
+        
+        media_id, content_hash, stale = entry
+        if stale:
+            # Eski kayıtlar yalnızca kullanılacakları zaman doğrulanır
+            if not self.media_exists(media_id):
+                self.media_cache.forget_media(media_id)
+                return None
+            self.media_cache.touch(content_hash)
+        
+        if image is not None:
+            # Aynı içerik farklı bir URL'den geldi; URL'yi de eşle
+            self.media_cache.record(image_url, content_hash, media_id)
+        return media_id
+    
+    def media_exists(self, media_id):
+        """Medya öğesinin WordPress'te hâlâ var olup olmadığını kontrol eder."""
+        try:
+            response = requests.get(
+                f"{self.api_url}/media/{media_id}",
+                params={"_fields": "id"},
+                auth=(self.username, self.password),
+                verify=self.verify_ssl,
+                timeout=DEFAULT_CONFIG["request_timeout"]
+            )
+        except Exception:
+            # Geçici hatalarda kaydı koru
+            return True
+        return response.status_code not in [404, 410]
+    
+    def shutdown_image_processor(self):
+        """Resim işleme süreç havuzunu kapatır; sonraki kullanımda yeniden oluşturulur."""
+        if self.image_processor:
+            self.image_processor.shutdown()
+    
+    def save_media_cache(self):
+        """Medya önbelleğini diske yazar."""
+        if self.media_cache:
+            self.media_cache.save()
+    
+    def download_image(self, image_url):
+        """Kaynak resme akış bağlantısı açar; hata durumunda None döndürür.
+        
+        Dönen ImageStream yalnızca başlıkları okunmuş bir yanıttır; gövde
+        upload_media sırasında parça parça aktarılır.
+        """
         try:
-            # Resmi indir
-            image_response = requests.get(image_url, verify=self.verify_ssl)
+            image_response = requests.get(
+                image_url,
+                verify=self.verify_ssl,
+                timeout=DEFAULT_CONFIG["request_timeout"],
+                stream=True
+            )
             if image_response.status_code != 200:
+                image_response.close()
                 return None
-                
-            # Resim dosyasının adını oluştur
-            image_name = f"{title.lower().replace(' ', '-')[:50]}.jpg" if title else "product-image.jpg"
+            return ImageStream(
+                image_response, image_url,
+                max_bytes=self.max_image_bytes,
+                buffer=self.buffer_images,
+                buffer_above=self.buffer_images_above
+            )
+        except ImageTooLargeError as e:
+            print(f"Resim atlandı: {e}")
+            return None
+        except Exception as e:
+            print(f"Resim indirilirken hata: {e}")
+            return None
+    
+    def media_file_name(self, image, title):
+        """Ürün başlığından medya dosyasının adını oluşturur."""
+        image_name = f"{title.lower().replace(' ', '-')[:50]}" if title else "product-image"
+        return image_name + image.extension
+    
+    def upload_media(self, image, title, image_url=None):
+        """Resim akışını WordPress medya kütüphanesine yükler ve medya ID'sini döndürür."""
+        try:
+            if self.image_processor and image.buffered:
+                image = self.image_processor.process(image)
+            
+            image_name = self.media_file_name(image, title)
             
             # WordPress Media API'sine yükle
             media_endpoint = f"{self.api_url}/media"
             
+            # Content-Length, requests tarafından len(image) ile belirlenir
             headers = {
                 'Content-Disposition': f'attachment; filename="{image_name}"',
-                'Content-Type': 'image/jpeg',
+                'Content-Type': image.content_type,
             }
             
             auth = (self.username, self.password)
@@ -116,16 +541,30 @@ class WordPressUploader:
                 media_endpoint,
                 auth=auth,
                 headers=headers,
-                data=image_response.content,
-                verify=self.verify_ssl
+                data=image,
+                verify=self.verify_ssl,
+                timeout=self.media_timeout
             )
             
             if upload_response.status_code in [200, 201]:
-                return upload_response.json()['id']
+                media_id = upload_response.json()['id']
+                if self.media_cache and image.sha256:
+                    self.media_cache.record(image_url, image.sha256, media_id)
+                return media_id
             else:
                 print(f"Resim yüklenirken hata: {upload_response.status_code} - {upload_response.text}")
                 return None
                 
         except Exception as e:
             print(f"Resim yüklenirken hata: {e}")
-            return None
\ No newline at end of file
+            return None
+        finally:
+            image.close()
+
+def create_uploader(wp_url, username, password, backend=None):
+    """Yapılandırmada seçilen yükleme arka ucuna (REST veya XML-RPC) göre yükleyici oluşturur."""
+    backend = backend or DEFAULT_CONFIG["upload_backend"]
+    if backend == "xmlrpc":
+        from uploaders.xmlrpc_uploader import XmlRpcUploader
+        return XmlRpcUploader(wp_url, username, password)
+    return WordPressUploader(wp_url, username, password)
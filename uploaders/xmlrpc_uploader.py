@@ -0,0 +1,242 @@
+import ssl
+import threading
+import time
+import xmlrpc.client
+from config import DEFAULT_CONFIG
+from uploaders.wordpress_uploader import WordPressUploader, canonical_product_url
+
+
+class TimeoutTransport(xmlrpc.client.SafeTransport):
+    """Zaman aşımı ve SSL doğrulama ayarı destekleyen XML-RPC taşıyıcısı."""
+
+    def __init__(self, timeout, verify_ssl=True, secure=True):
+        context = None if verify_ssl else ssl._create_unverified_context()
+        super().__init__(context=context)
+        self.timeout = timeout
+        self.secure = secure
+
+    def make_connection(self, host):
+        if self.secure:
+            connection = super().make_connection(host)
+        else:
+            connection = xmlrpc.client.Transport.make_connection(self, host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class MulticallBatcher:
+    """Farklı iş parçacıklarından gelen çağrıları tek bir system.multicall isteğinde toplar.
+
+    İlk gelen çağrı `window` saniye boyunca (ya da `max_calls` dolana kadar)
+    diğerlerini bekler, ardından hepsini tek istekte gönderir; her çağıran
+    kendi sonucunu ya da Fault hatasını alır.
+    """
+
+    def __init__(self, server_factory, max_calls, window):
+        self.server_factory = server_factory
+        self.max_calls = max_calls
+        self.window = window
+        self.condition = threading.Condition()
+        self.pending = []
+
+    def call(self, method, *params):
+        """Çağrıyı sıraya ekler ve sonucunu bekler."""
+        slot = {"method": method, "params": params, "done": False, "result": None, "error": None}
+        batch = None
+        with self.condition:
+            self.pending.append(slot)
+            self.condition.notify_all()
+            while not slot["done"]:
+                if self.pending and self.pending[0] is slot:
+                    # Kuyruğun başındaki çağrı lider olur ve diğerlerini bekler
+                    deadline = time.time() + self.window
+                    while len(self.pending) < self.max_calls and time.time() < deadline:
+                        self.condition.wait(deadline - time.time())
+                    batch = self.pending[:self.max_calls]
+                    del self.pending[:len(batch)]
+                    # Sığmayan çağrılardan ilki bir sonraki lider olur
+                    self.condition.notify_all()
+                    break
+                self.condition.wait()
+
+        if batch:
+            self.send(batch)
+        if slot["error"]:
+            raise slot["error"]
+        return slot["result"]
+
+    def send(self, batch):
+        """Toplanan çağrıları tek bir multicall isteğiyle gönderir ve sonuçları dağıtır."""
+        try:
+            multicall = xmlrpc.client.MultiCall(self.server_factory())
+            for slot in batch:
+                getattr(multicall, slot["method"])(*slot["params"])
+            results = multicall()
+            for i, slot in enumerate(batch):
+                try:
+                    slot["result"] = results[i]
+                except xmlrpc.client.Fault as e:
+                    slot["error"] = e
+        except Exception as e:
+            for slot in batch:
+                slot["error"] = e
+
+        with self.condition:
+            for slot in batch:
+                slot["done"] = True
+            self.condition.notify_all()
+
+
+# Fiyat ve SKU'yu sunucudaki eklentiye taşıyan korumasız özel alanlar
+PRODUCT_FIELDS = {"regular_price": "wpf_regular_price", "sku": "wpf_sku"}
+
+
+class XmlRpcUploader(WordPressUploader):
+    """Ürün ve medya yazma işlemlerini XML-RPC system.multicall ile yapan yükleyici.
+
+    WooCommerce REST API'sinin kısıtlandığı sunucularda kullanılır; tek bir
+    istekle birden fazla ürün veya medya gönderilir. Okuma işlemleri (var olan
+    ürünler, kategoriler) REST arayüzü üzerinden yapılmaya devam eder.
+
+    WordPress "_" ile başlayan korumalı meta alanlarını (_price, _sku) XML-RPC
+    ile yazdırmaz. Fiyat ve SKU yalnızca sunucuda
+    wordpress/wpf-xmlrpc-product-fields.php eklentisi kuruluysa
+    (`xmlrpc_product_fields`) gönderilir; eklenti bunları WooCommerce ürün
+    nesnesine işler. Aksi halde ürünler fiyatsız ve SKU'suz oluşturulur.
+    """
+
+    def __init__(self, wp_url, username, password):
+        super().__init__(wp_url, username, password)
+        self.xmlrpc_url = f"{self.wp_url}/xmlrpc.php"
+        self.batch_size = DEFAULT_CONFIG["xmlrpc_batch_size"]
+        self.product_fields = DEFAULT_CONFIG["xmlrpc_product_fields"]
+        # Çağrılar multicall'da birleşir; biri gönderilirken bir sonraki grup dolabilsin
+        self.media_workers = max(self.media_workers, 2 * DEFAULT_CONFIG["xmlrpc_media_batch"])
+        # wp.uploadFile içeriği bellekte bekler
+        self.buffer_images = True
+        self.media_batcher = MulticallBatcher(
+            self.get_server, DEFAULT_CONFIG["xmlrpc_media_batch"], DEFAULT_CONFIG["xmlrpc_batch_window"])
+
+    def get_server(self):
+        """Yeni bir XML-RPC vekili döndürür (vekiller iş parçacıkları arasında paylaşılmaz)."""
+        transport = TimeoutTransport(
+            self.batch_timeout, self.verify_ssl, secure=self.xmlrpc_url.startswith("https://"))
+        return xmlrpc.client.ServerProxy(self.xmlrpc_url, transport=transport, allow_none=True)
+
+    def build_post_content(self, data):
+        """WooCommerce ürün verisini wp.newPost/wp.editPost içeriğine çevirir."""
+        content = {"post_type": "product"}
+        if "status" in data:
+            content["post_status"] = data["status"]
+        elif "id" not in data:
+            content["post_status"] = "publish"
+        if "name" in data:
+            content["post_title"] = data["name"]
+        if "description" in data:
+            content["post_content"] = data["description"]
+        if "short_description" in data:
+            content["post_excerpt"] = data["short_description"]
+        if "categories" in data:
+            content["terms"] = {"product_cat": [category["id"] for category in data["categories"]]}
+        if data.get("images"):
+            content["post_thumbnail"] = data["images"][0]["id"]
+
+        custom_fields = []
+        if self.product_fields:
+            # Eklenti bu alanları ürüne işleyip siler; korumalı _price/_sku doğrudan yazılamaz
+            for key, field in PRODUCT_FIELDS.items():
+                if data.get(key):
+                    custom_fields.append({"key": field, "value": data[key]})
+        for meta in data.get("meta_data") or []:
+            field = self.build_custom_field(data.get("id"), meta)
+            if field:
+                custom_fields.append(field)
+        if custom_fields:
+            content["custom_fields"] = custom_fields
+        return content
+
+    def build_custom_field(self, product_id, meta):
+        """Meta kaydını custom_fields öğesine çevirir; eklenmemesi gerekiyorsa None döndürür.
+
+        wp.editPost kimliksiz alanları yeni satır olarak ekler; var olan kaynak URL
+        kaydı kimliğiyle güncellenir, kimliği bilinmeyen mevcut kayıt tekrar eklenmez.
+        """
+        field = {"key": meta["key"], "value": meta["value"]}
+        if not product_id or meta["key"] != self.source_url_meta_key or not self.product_index:
+            return field
+        meta_id = self.product_index["meta"].get(product_id)
+        if meta_id:
+            return dict(field, id=meta_id)
+        if self.product_index["url"].get(canonical_product_url(meta["value"])) == product_id:
+            return None
+        return field
+
+    def send_batch(self, items, results):
+        """(sonuç indeksi, işlem, veri) öğelerini tek bir system.multicall isteğiyle gönderir."""
+        multicall = xmlrpc.client.MultiCall(self.get_server())
+        for _, action, data in items:
+            if action == "create":
+                multicall.wp.newPost(0, self.username, self.password, self.build_post_content(data))
+            elif action == "update":
+                multicall.wp.editPost(0, self.username, self.password, data["id"], self.build_post_content(data))
+            else:
+                multicall.wp.deletePost(0, self.username, self.password, data)
+
+        try:
+            returned = multicall()
+        except Exception as e:
+            for index, _, _ in items:
+                results[index]["error"] = str(e)
+            return
+
+        for position, (index, action, data) in enumerate(items):
+            try:
+                value = returned[position]
+            except xmlrpc.client.Fault as e:
+                results[index]["error"] = f"{e.faultCode} - {e.faultString}"
+                continue
+            if action == "create":
+                product_id = int(value)
+                results[index]["response"] = dict(data, id=product_id)
+            elif action == "update":
+                product_id = data["id"]
+                results[index]["response"] = dict(data)
+            else:
+                product_id = data
+                results[index]["response"] = {"id": data}
+            results[index]["id"] = product_id
+
+    def upload_media(self, image, title, image_url=None):
+        """Resmi wp.uploadFile ile yükler; eşzamanlı yüklemeler tek multicall'da birleştirilir."""
+        try:
+            if self.image_processor:
+                image = self.image_processor.process(image)
+
+            media = {
+                "name": self.media_file_name(image, title),
+                "type": image.content_type,
+                "bits": xmlrpc.client.Binary(image.read_all()),
+                "overwrite": False
+            }
+            result = self.media_batcher.call("wp.uploadFile", 0, self.username, self.password, media)
+            media_id = int(result.get("attachment_id") or result["id"])
+            if self.media_cache and image.sha256:
+                self.media_cache.record(image_url, image.sha256, media_id)
+            return media_id
+        except Exception as e:
+            print(f"Resim yüklenirken hata: {e}")
+            return None
+        finally:
+            image.close()
+
+    def media_exists(self, media_id):
+        """Medya öğesinin WordPress'te hâlâ var olup olmadığını kontrol eder."""
+        try:
+            self.get_server().wp.getMediaItem(0, self.username, self.password, media_id)
+            return True
+        except xmlrpc.client.Fault:
+            return False
+        except Exception as e:
+            # Sunucuya ulaşılamıyorsa kayıt silinmez
+            print(f"Medya kontrol edilirken hata: {e}")
+            return True
@@ -0,0 +1,65 @@
+<?php
+/**
+ * Plugin Name: WP Product Feed - XML-RPC ürün alanları
+ * Description: XML-RPC yükleyicisinin gönderdiği fiyat ve SKU alanlarını WooCommerce ürününe işler.
+ *
+ * WordPress "_" ile başlayan korumalı meta alanlarını (_price, _sku) XML-RPC
+ * ile yazdırmaz. Yükleyici bu değerleri korumasız wpf_regular_price ve
+ * wpf_sku alanlarıyla gönderir; bu eklenti wp.newPost/wp.editPost başarıyla
+ * tamamlandığında değerleri WooCommerce ürün nesnesine işler ve geçici
+ * alanları siler. Ürün WooCommerce üzerinden kaydedildiği için _price ve
+ * arama tabloları da güncellenir.
+ *
+ * Değerler yazı ve özel alanlar kaydedildikten sonra (wp_after_insert_post)
+ * işlenir; özel alanları kayıttan sonra yazan sürümler için XML-RPC başarı
+ * kancaları da dinlenir. Alanlar işlenince silindiğinden ikinci çağrı bir şey
+ * yapmaz.
+ *
+ * Kurulum: dosyayı wp-content/mu-plugins/ dizinine kopyalayın ve uygulamada
+ * "xmlrpc_product_fields" ayarını açın.
+ */
+
+if ( ! defined( 'ABSPATH' ) ) {
+	exit;
+}
+
+function wpf_xmlrpc_apply_product_fields( $post_id ) {
+	if ( ! function_exists( 'wc_get_product' ) ) {
+		return;
+	}
+	$product = wc_get_product( $post_id );
+	if ( ! $product ) {
+		return;
+	}
+
+	$price = get_post_meta( $post_id, 'wpf_regular_price', true );
+	$sku   = get_post_meta( $post_id, 'wpf_sku', true );
+	if ( '' === $price && '' === $sku ) {
+		return;
+	}
+	delete_post_meta( $post_id, 'wpf_regular_price' );
+	delete_post_meta( $post_id, 'wpf_sku' );
+
+	if ( '' !== $price ) {
+		$product->set_regular_price( wc_format_decimal( $price ) );
+	}
+	if ( '' !== $sku ) {
+		try {
+			$product->set_sku( $sku );
+		} catch ( WC_Data_Exception $e ) {
+			// Başka bir üründe kullanılan SKU atlanır; fiyat yine kaydedilir
+			error_log( 'wpf-xmlrpc-product-fields: ' . $e->getMessage() );
+		}
+	}
+	$product->save();
+}
+
+function wpf_xmlrpc_after_insert_post( $post_id, $post ) {
+	if ( defined( 'XMLRPC_REQUEST' ) && XMLRPC_REQUEST && 'product' === $post->post_type ) {
+		wpf_xmlrpc_apply_product_fields( $post_id );
+	}
+}
+
+add_action( 'wp_after_insert_post', 'wpf_xmlrpc_after_insert_post', 10, 2 );
+add_action( 'xmlrpc_call_success_wp_newPost', 'wpf_xmlrpc_apply_product_fields' );
+add_action( 'xmlrpc_call_success_wp_editPost', 'wpf_xmlrpc_apply_product_fields' );